@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Modules import each other the way they are run: packages from the repository root, and the
+# yfinance_processing scripts by their flat module names.
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for path in (ROOT, os.path.join(ROOT, "yfinance_processing")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -1,14 +1,143 @@
+import asyncio
+import random
 import httpx
+import settings
+from data_fetchers.rate_limiter import TokenBucket
+from data_fetchers.response_cache import ResponseCache
 
 
 
 class FMPFetcher:
-    def __init__(self, api_key: str):
+    """
+    Async client for the Financial Modeling Prep API.
+
+    One fetcher is meant to be shared by every workflow in a run: it keeps a single pooled
+    httpx.AsyncClient with keep-alive connections, and identical requests are made only once.
+    Concurrent callers of a request already in flight wait for the same response, and later
+    callers get the stored response, for as long as the fetcher lives.
+
+    With a rate limiter, every request (retries included) first takes a token from it, and
+    responses with status 429 are retried with exponential backoff.
+
+    With a response cache, responses are also kept on disk for a TTL that depends on the
+    endpoint, so they survive across runs.
+    """
+
+    def __init__(
+            self,
+            api_key: str,
+            client: httpx.AsyncClient | None = None,
+            http2: bool = False,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            timeout: float = 10.0,
+            rate_limiter: TokenBucket | None = None,
+            max_retries: int = 5,
+            backoff: float = 1.0,
+            cache: ResponseCache | None = None
+    ):
+        """
+        Args:
+            api_key (str): FMP API key.
+            client (httpx.AsyncClient | None): Client to reuse. It is not closed by close().
+            http2 (bool): Negotiate HTTP/2 on the fetcher's own client (requires httpx[http2]).
+            max_connections (int): Maximum number of pooled connections.
+            max_keepalive_connections (int): Maximum number of idle connections kept alive.
+            timeout (float): Request timeout in seconds.
+            rate_limiter (TokenBucket | None): Limiter shared by every request, e.g. TokenBucket.for_plan("starter").
+            max_retries (int): Maximum number of retries of a request answered with 429.
+            backoff (float): Delay in seconds before the first retry, doubled on every further retry.
+            cache (ResponseCache | None): Disk cache consulted before sending a request.
+        """
         if not api_key:
             raise ValueError("FMP_API_KEY not set in environment")
         self.BASE_URL = "https://financialmodelingprep.com/api/v3"
         self.api_key = api_key
-        self.client = httpx.AsyncClient(timeout=10.0)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            )
+        )
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = cache
+        # Request key -> task of its response, shared by every caller of the same request
+        self._responses = {}
+        self.request_count = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _request(self, url: str, params: dict):
+        """Sends one GET request, retrying on 429, and returns the decoded JSON."""
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            self.request_count += 1
+            response = await self.client.get(url, params={**params, "apikey": self.api_key})
+            if response.status_code != 429 or attempt == self.max_retries:
+                break
+
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None and retry_after.isdigit():
+                delay = float(retry_after)
+            else:
+                # Jitter keeps the requests that were throttled together from retrying together
+                delay = self.backoff * 2 ** attempt * (1 + random.random())
+            settings.logger.warning(f"Rate limited by FMP on {url}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _cache_key(path: str, params: dict) -> str:
+        return f"{path}?{'&'.join(f'{name}={value}' for name, value in sorted(params.items()))}"
+
+    async def _cached_request(self, path: str, params: dict, use_cache: bool = True):
+        """Returns the response from the disk cache if it is fresh, otherwise requests and caches it."""
+        if self.cache is None or not use_cache:
+            return await self._request(f"{self.BASE_URL}/{path}", params)
+
+        endpoint = path.split("/")[0]
+        key = self._cache_key(path, params)
+        data = await self.cache.get(endpoint, key)
+        if data is None:
+            data = await self._request(f"{self.BASE_URL}/{path}", params)
+            await self.cache.put(endpoint, key, data)
+        return data
+
+    def _store(self, path: str, data, **params):
+        """Stores a response for a request that was not sent, so later calls of it are served from memory."""
+        key = (path, tuple(sorted(params.items())))
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(data)
+        self._responses.setdefault(key, future)
+
+    async def _get_json(self, path: str, use_cache: bool = True, **params):
+        """
+        Returns the JSON of GET {BASE_URL}/{path}, requesting it at most once per fetcher.
+
+        Failed requests are forgotten, so they are sent again on the next call.
+        """
+        key = (path, tuple(sorted(params.items())))
+        task = self._responses.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._cached_request(path, params, use_cache))
+            self._responses[key] = task
+            task.add_done_callback(
+                lambda t: self._responses.pop(key, None) if t.cancelled() or t.exception() else None
+            )
+        # Shield the shared request, so a cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
 
     async def fetch_income_statement(self, symbol: str, limit: int = 1):
         """
@@ -24,12 +153,7 @@ class FMPFetcher:
         Raises:
             httpx.HTTPStatusError: if API call fails
         """
-        url = f"{self.BASE_URL}/income-statement/{symbol}"
-        params = {"limit": limit, "apikey": self.api_key}
-
-        response = await self.client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = await self._get_json(f"income-statement/{symbol}", limit=limit)
 
         if not data:
             raise ValueError(f"No income statement data found for symbol {symbol}")
@@ -37,20 +161,90 @@ class FMPFetcher:
         return data[0]  # Return latest income statement dict
 
     async def fetch_company_profile(self, symbol: str) -> dict:
-        url = f"{self.BASE_URL}/profile/{symbol}"
-        params = {"apikey": self.api_key}
-
-        response = await self.client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = await self._get_json(f"profile/{symbol}")
 
         if not data:
             raise ValueError(f"No profile data found for symbol {symbol}")
 
         return data[0]
 
-    async def close(self):
-        await self.client.aclose()
+    async def fetch_quote(self, symbol: str) -> dict:
+        data = await self._get_json(f"quote/{symbol}")
+
+        if not data:
+            raise ValueError(f"No quote data found for symbol {symbol}")
+
+        return data[0]
+
+    async def _fetch_batch(self, endpoint: str, symbols: list[str], chunk_size: int) -> dict[str, dict]:
+        """
+        Fetches an endpoint that accepts comma-separated symbols, one request per chunk of symbols.
+
+        Every symbol's entry is also stored as the response of its single-symbol request, with an
+        empty response for symbols missing from their chunk, so per-symbol fetches send nothing.
+        With a disk cache, only symbols without a fresh cached entry are requested.
+        Symbols of a chunk whose request fails are left out and fetched one by one later on.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        entries = {}
+
+        # Symbols cached on disk on their own need no batch request
+        if self.cache is not None:
+            cached = await asyncio.gather(
+                *[self.cache.get(endpoint, self._cache_key(f"{endpoint}/{symbol}", {})) for symbol in symbols]
+            )
+            for symbol, data in zip(symbols, cached):
+                if data is not None:
+                    self._store(f"{endpoint}/{symbol}", data)
+                    entries[symbol] = data[0]
+            symbols = [symbol for symbol in symbols if symbol not in entries]
+
+        chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+        # Chunks are cached per symbol below, since the same chunk is unlikely to be requested again
+        responses = await asyncio.gather(
+            *[self._get_json(f"{endpoint}/{','.join(chunk)}", use_cache=False) for chunk in chunks],
+            return_exceptions=True
+        )
+
+        for chunk, data in zip(chunks, responses):
+            if isinstance(data, Exception):
+                settings.logger.error(f"Failed to fetch {endpoint} for {len(chunk)} symbols: {data}")
+                continue
+            by_symbol = {entry.get("symbol"): entry for entry in data or []}
+            for symbol in chunk:
+                entry = by_symbol.get(symbol)
+                self._store(f"{endpoint}/{symbol}", [entry] if entry is not None else [])
+                if entry is not None:
+                    entries[symbol] = entry
+                    if self.cache is not None:
+                        await self.cache.put(endpoint, self._cache_key(f"{endpoint}/{symbol}", {}), [entry])
+        return entries
+
+    async def fetch_company_profiles(self, symbols: list[str], chunk_size: int = 100) -> dict[str, dict]:
+        """
+        Fetch the company profiles of many symbols, chunk_size symbols per request.
+
+        Args:
+            symbols (list[str]): Ticker symbols.
+            chunk_size (int): Number of symbols per request.
+
+        Returns:
+            dict: Profile dict keyed by symbol. Symbols without a profile are left out.
+        """
+        return await self._fetch_batch("profile", symbols, chunk_size)
+
+    async def fetch_quotes(self, symbols: list[str], chunk_size: int = 100) -> dict[str, dict]:
+        """
+        Fetch the latest quotes (price, market cap, volume...) of many symbols, chunk_size symbols per request.
+
+        Args:
+            symbols (list[str]): Ticker symbols.
+            chunk_size (int): Number of symbols per request.
+
+        Returns:
+            dict: Quote dict keyed by symbol. Symbols without a quote are left out.
+        """
+        return await self._fetch_batch("quote", symbols, chunk_size)
 
     async def fetch_cash_flow_statement(self, symbol: str, limit: int = 5):
         """
@@ -66,14 +260,13 @@ class FMPFetcher:
         Raises:
             httpx.HTTPStatusError: if API call fails
         """
-        url = f"{self.BASE_URL}/cash-flow-statement/{symbol}"
-        params = {"limit": limit, "apikey": self.api_key}
-        response = await self.client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = await self._get_json(f"cash-flow-statement/{symbol}", limit=limit)
         if not data:
             raise ValueError(f"No cash flow statement data found for symbol {symbol}")
         return data
 
     async def close(self):
-        await self.client.aclose()
+        """Closes the HTTP client, unless it was passed in, and drops the stored responses."""
+        self._responses.clear()
+        if self._owns_client:
+            await self.client.aclose()
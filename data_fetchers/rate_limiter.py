@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+# Request allowance of each FMP plan: (calls, period in seconds)
+FMP_PLAN_LIMITS = {
+    "free": (250, 86400),
+    "starter": (300, 60),
+    "premium": (750, 60),
+    "ultimate": (3000, 60),
+}
+
+
+class TokenBucket:
+    """
+    Async token bucket: allows `calls` acquisitions per `period` seconds, refilled continuously.
+
+    Waiters are served one at a time in arrival order, so a burst of callers is spread evenly
+    over time instead of retrying in lockstep.
+    """
+
+    def __init__(self, calls: int, period: float = 60.0, burst: int | None = None):
+        """
+        Args:
+            calls (int): Number of acquisitions allowed per period.
+            period (float): Length of the period in seconds.
+            burst (int | None): Maximum number of tokens that can pile up while idle
+                                (default: one second's worth, at least 1).
+        """
+        if calls <= 0 or period <= 0:
+            raise ValueError("calls and period must be positive")
+        self.rate = calls / period
+        self.capacity = burst if burst is not None else max(1, int(self.rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def for_plan(cls, plan: str) -> "TokenBucket":
+        """Returns a bucket for the rate limit of an FMP plan."""
+        if plan not in FMP_PLAN_LIMITS:
+            raise ValueError(f"Unknown FMP plan '{plan}'. Choose from {', '.join(FMP_PLAN_LIMITS)}.")
+        return cls(*FMP_PLAN_LIMITS[plan])
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Waits until a token is available and takes it."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
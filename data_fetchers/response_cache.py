@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+
+CACHE_DIR = "fmp_cache"
+
+# Seconds a response stays fresh, by endpoint. Endpoints not listed are never cached.
+FMP_CACHE_TTLS = {
+    "income-statement": 3 * 24 * 3600,
+    "cash-flow-statement": 3 * 24 * 3600,
+    "balance-sheet-statement": 3 * 24 * 3600,
+    "profile": 15 * 60,
+    "quote": 60,
+}
+
+
+class ResponseCache:
+    """
+    Disk cache of JSON responses with a TTL per endpoint and a size cap.
+
+    Every entry is a JSON file named after the hash of its key. Files are read and written in
+    worker threads and replaced atomically, so concurrent requests never see a partial entry.
+    When the cache grows past max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = 200_000_000, ttls: dict | None = None):
+        """
+        Args:
+            cache_dir (str): Directory of the cache files.
+            max_bytes (int): Maximum total size of the cache files.
+            ttls (dict | None): Seconds an entry stays fresh, by endpoint (default: FMP_CACHE_TTLS).
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = FMP_CACHE_TTLS if ttls is None else ttls
+        os.makedirs(cache_dir, exist_ok=True)
+        self.sizes = {
+            entry.path: entry.stat().st_size
+            for entry in os.scandir(cache_dir) if entry.name.endswith(".json")
+        }
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = asyncio.Lock()
+
+    def ttl(self, endpoint: str) -> float:
+        """Seconds a response of this endpoint stays fresh, 0 if it is not cached."""
+        return self.ttls.get(endpoint, 0)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}.json")
+
+    def _read(self, path: str, ttl: float):
+        """Returns the data of a fresh entry, or None. Marks the entry as recently used."""
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["stored_at"] > ttl:
+            return None
+        os.utime(path)
+        return entry["data"]
+
+    def _write(self, path: str, data) -> int:
+        """Writes an entry atomically and returns its size."""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"stored_at": time.time(), "data": data}, f)
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def _evict(self) -> int:
+        """Deletes least recently used entries until the cache fits in max_bytes; returns how many."""
+        total = sum(self.sizes.values())
+        if total <= self.max_bytes:
+            return 0
+        by_last_use = sorted(
+            self.sizes,
+            key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0
+        )
+        evicted = 0
+        for path in by_last_use:
+            if total <= self.max_bytes:
+                break
+            total -= self.sizes.pop(path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            evicted += 1
+        return evicted
+
+    async def get(self, endpoint: str, key: str):
+        """
+        Returns the cached response for key if it is younger than the endpoint's TTL, else None.
+
+        Args:
+            endpoint (str): Endpoint of the request, e.g. "profile".
+            key (str): Key of the request, e.g. "profile/AAPL?limit=1".
+        """
+        ttl = self.ttl(endpoint)
+        data = await asyncio.to_thread(self._read, self._path(key), ttl) if ttl > 0 else None
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    async def put(self, endpoint: str, key: str, data):
+        """Stores a response, unless its endpoint is not cached or it is empty."""
+        if self.ttl(endpoint) <= 0 or not data:
+            return
+        path = self._path(key)
+        size = await asyncio.to_thread(self._write, path, data)
+        async with self._lock:
+            self.sizes[path] = size
+            self.evictions += await asyncio.to_thread(self._evict)
+
+    def stats(self) -> dict:
+        """Returns hit, miss and eviction counts, the hit rate and the current size of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.sizes),
+            "bytes": sum(self.sizes.values())
+        }
@@ -38,13 +38,13 @@ class BalanceSheet(BaseModel):
         """
         Convert balance sheet data into a dictionary.
         """
-        return self.dict()
+        return self.model_dump()
 
     def to_json(self):
         """
         Return a JSON-compatible dict with company and balance sheet data.
         """
         return {
-            "company": self.company.dict(),
-            "balance_sheet": self.dict(exclude={"company"})
+            "company": self.company.model_dump(),
+            "balance_sheet": self.model_dump(exclude={"company"})
         }
@@ -0,0 +1,196 @@
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Iterable, List, get_args, get_origin
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for a list of model, built once per model."""
+    return TypeAdapter(List[model])
+
+
+def validate_many(model: type[BaseModel], records: list[dict]) -> list[BaseModel]:
+    """
+    Validates many records at once into models.
+
+    Args:
+        model (type[BaseModel]): Model class, e.g. BalanceSheet.
+        records (list[dict]): Raw records, e.g. from an API.
+
+    Returns:
+        list[BaseModel]: Validated models.
+
+    Raises:
+        pydantic.ValidationError: If any record is invalid, listing every failing record by index.
+    """
+    return list_adapter(model).validate_python(records)
+
+
+def _nested_model(annotation):
+    """Returns (model, is_list) if the annotation is a model or a list of models, else None."""
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate, False
+        if get_origin(candidate) in (list, List):
+            args = get_args(candidate)
+            if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+                return args[0], True
+    return None
+
+
+@lru_cache(maxsize=None)
+def _nested_fields(model: type[BaseModel]) -> tuple:
+    """(field name, nested model, is_list) of every field of model holding models, found once per model."""
+    return tuple(
+        (name, *nested)
+        for name, field in model.model_fields.items()
+        if (nested := _nested_model(field.annotation)) is not None
+    )
+
+
+def construct(model: type[BaseModel], record: dict) -> BaseModel:
+    """
+    Builds a model from a trusted record with model_construct, nested models included.
+
+    Only for records that were produced by the models themselves (e.g. read back from our own
+    stores): values are neither coerced nor checked.
+    """
+    nested_fields = _nested_fields(model)
+    if nested_fields:
+        record = dict(record)
+        for name, nested_model, is_list in nested_fields:
+            value = record.get(name)
+            if value is None:
+                continue
+            if is_list:
+                record[name] = [construct(nested_model, item) if isinstance(item, dict) else item for item in value]
+            elif isinstance(value, dict):
+                record[name] = construct(nested_model, value)
+    return model.model_construct(**record)
+
+
+def construct_many(model: type[BaseModel], records: Iterable[dict]) -> list[BaseModel]:
+    """
+    Builds many models from trusted records without validating them. See construct.
+    """
+    return [construct(model, record) for record in records]
+
+
+def write_ndjson(models: Iterable[BaseModel], path: str, chunk_size: int = 10_000) -> int:
+    """
+    Writes models to a newline-delimited JSON file, one model per line.
+
+    Models are serialized by pydantic's compiled JSON serializer and written in chunks,
+    so the export is bounded by I/O rather than by per-object Python work.
+
+    Args:
+        models (Iterable[BaseModel]): Models to write, of the same class.
+        path (str): Output file.
+        chunk_size (int): Number of lines written at once.
+
+    Returns:
+        int: Number of models written.
+    """
+    count = 0
+    with open(path, "wb") as f:
+        chunk = []
+        for model in models:
+            chunk.append(model.__pydantic_serializer__.to_json(model))
+            if len(chunk) == chunk_size:
+                f.write(b"\n".join(chunk) + b"\n")
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            f.write(b"\n".join(chunk) + b"\n")
+            count += len(chunk)
+    return count
+
+
+def read_ndjson(model: type[BaseModel], path: str) -> list[BaseModel]:
+    """
+    Reads models from a newline-delimited JSON file.
+
+    The lines are joined into one JSON array that is parsed and validated in a single call.
+
+    Args:
+        model (type[BaseModel]): Model class of every line.
+        path (str): Input file.
+
+    Returns:
+        list[BaseModel]: Models, in file order.
+    """
+    with open(path, "rb") as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    return list_adapter(model).validate_json(b"[" + b",".join(lines) + b"]")
+
+
+def _arrow_type(pa, annotation):
+    """Arrow type of a field annotation, matching the values of model_dump(mode='json')."""
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if get_origin(annotation) in (list, List):
+        return pa.list_(_arrow_type(pa, args[0]))
+    if args and get_origin(annotation) is not None:
+        # Optional[X] and other unions of a single type
+        if len(args) == 1:
+            return _arrow_type(pa, args[0])
+        raise TypeError(f"Unsupported union annotation for Arrow: {annotation}")
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return pa.struct(list(arrow_schema(annotation)))
+        if issubclass(annotation, (Enum, str, date, datetime)):
+            return pa.string()
+        if issubclass(annotation, bool):
+            return pa.bool_()
+        if issubclass(annotation, int):
+            return pa.int64()
+        if issubclass(annotation, float):
+            return pa.float64()
+    raise TypeError(f"Unsupported annotation for Arrow: {annotation}")
+
+
+def arrow_schema(model: type[BaseModel]):
+    """
+    Arrow schema of a model, built from its field annotations, nested models as struct columns.
+
+    Requires pyarrow.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("arrow_schema requires pyarrow: pip install pyarrow") from e
+    return pa.schema([pa.field(name, _arrow_type(pa, field.annotation)) for name, field in model.model_fields.items()])
+
+
+def write_arrow(models: list[BaseModel], path: str, chunk_size: int = 10_000) -> int:
+    """
+    Writes models to an Arrow IPC file, nested models as struct columns.
+
+    Requires pyarrow.
+
+    Args:
+        models (list[BaseModel]): Models to write, of the same class.
+        path (str): Output file.
+        chunk_size (int): Number of models per record batch.
+
+    Returns:
+        int: Number of models written.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("write_arrow requires pyarrow: pip install pyarrow") from e
+
+    if not models:
+        raise ValueError("No models to write.")
+    model = type(models[0])
+    adapter = list_adapter(model)
+
+    # The schema comes from the model, so a column that is all null in one batch keeps its type
+    schema = arrow_schema(model)
+    with pa.ipc.new_file(path, schema) as writer:
+        for start in range(0, len(models), chunk_size):
+            records = adapter.dump_python(models[start:start + chunk_size], mode="json")
+            writer.write_batch(pa.RecordBatch.from_pylist(records, schema=schema))
+    return len(models)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from enum import Enum
 
@@ -22,13 +22,12 @@ class Company(BaseModel):
     stock_market: StockMarket = Field(StockMarket.NYSE,
                                       description="Stock market where the company is listed (default NYSE)")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "name": "Apple Inc.",
-                "is_public": True,
-                "industry": "334111",
-                "symbol": "AAPL",
-                "stock_market": "NASDAQ"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "name": "Apple Inc.",
+            "is_public": True,
+            "industry": "334111",
+            "symbol": "AAPL",
+            "stock_market": "NASDAQ"
         }
+    })
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
+import numpy as np
 
 
 class CashFlowEntry(BaseModel):
@@ -56,10 +57,157 @@ class DiscountedCashFlow(BaseModel):
         """
         Convert DCF model data into a dictionary.
         """
-        return self.dict()
+        return self.model_dump()
 
     def to_json(self):
         """
         Return a JSON-compatible dict for output or logging.
         """
-        return self.dict()
+        return self.model_dump()
+
+
+class ColumnarDiscountedCashFlow:
+    """
+    DCF valuation model holding the projections as NumPy arrays of years and free cash flows.
+
+    Inputs are validated once at construction and every calculation is vectorized, so building
+    and valuing many models costs a few array operations each instead of one pydantic object
+    and one Python loop iteration per projected year. Use from_arrays to skip validation for
+    arrays that are already known to be valid.
+    """
+
+    __slots__ = ("company_symbol", "company_name", "discount_rate", "terminal_growth_rate",
+                 "years", "free_cash_flows", "terminal_value", "enterprise_value")
+
+    def __init__(
+            self,
+            company_symbol: Optional[str],
+            discount_rate: float,
+            terminal_growth_rate: float,
+            years,
+            free_cash_flows,
+            company_name: Optional[str] = None
+    ):
+        """
+        Args:
+            company_symbol (str | None): Symbol of the company.
+            discount_rate (float): Discount rate used for DCF (e.g. WACC).
+            terminal_growth_rate (float): Terminal growth rate after projection period.
+            years (array-like): Projected years, strictly increasing.
+            free_cash_flows (array-like): Projected free cash flow of each year.
+            company_name (str | None): Name of the company.
+
+        Raises:
+            ValueError: If the projections are empty, of different lengths, not finite or not in year order.
+        """
+        years = np.asarray(years, dtype=np.int64)
+        free_cash_flows = np.asarray(free_cash_flows, dtype=float)
+        if years.ndim != 1 or years.shape != free_cash_flows.shape:
+            raise ValueError("years and free_cash_flows must be 1-D arrays of the same length.")
+        if not len(years):
+            raise ValueError("No cash flow projections provided.")
+        if not np.isfinite(free_cash_flows).all():
+            raise ValueError("Free cash flows must be finite.")
+        if (np.diff(years) <= 0).any():
+            raise ValueError("Projection years must be strictly increasing.")
+
+        self._set(company_symbol, company_name, float(discount_rate), float(terminal_growth_rate),
+                  years, free_cash_flows)
+
+    def _set(self, company_symbol, company_name, discount_rate, terminal_growth_rate, years, free_cash_flows):
+        self.company_symbol = company_symbol
+        self.company_name = company_name
+        self.discount_rate = discount_rate
+        self.terminal_growth_rate = terminal_growth_rate
+        self.years = years
+        self.free_cash_flows = free_cash_flows
+        self.terminal_value = None
+        self.enterprise_value = None
+
+    @classmethod
+    def from_arrays(
+            cls,
+            company_symbol: Optional[str],
+            discount_rate: float,
+            terminal_growth_rate: float,
+            years: np.ndarray,
+            free_cash_flows: np.ndarray,
+            company_name: Optional[str] = None
+    ) -> "ColumnarDiscountedCashFlow":
+        """
+        Builds a model from arrays without validating or copying them.
+
+        The arrays must be 1-D, non-empty, of the same length and in year order.
+        """
+        dcf = cls.__new__(cls)
+        dcf._set(company_symbol, company_name, discount_rate, terminal_growth_rate, years, free_cash_flows)
+        return dcf
+
+    @classmethod
+    def from_model(cls, dcf: DiscountedCashFlow) -> "ColumnarDiscountedCashFlow":
+        """Converts a DiscountedCashFlow; the projections are sorted by year."""
+        projections = sorted(dcf.projections, key=lambda p: p.year)
+        return cls(
+            company_symbol=dcf.company_symbol,
+            company_name=dcf.company_name,
+            discount_rate=dcf.discount_rate,
+            terminal_growth_rate=dcf.terminal_growth_rate,
+            years=[p.year for p in projections],
+            free_cash_flows=[p.free_cash_flow for p in projections]
+        )
+
+    def to_model(self) -> DiscountedCashFlow:
+        """Converts to a DiscountedCashFlow with one CashFlowEntry per projected year."""
+        return DiscountedCashFlow(
+            company_symbol=self.company_symbol,
+            company_name=self.company_name,
+            discount_rate=self.discount_rate,
+            terminal_growth_rate=self.terminal_growth_rate,
+            projections=[
+                CashFlowEntry(year=year, free_cash_flow=fcf)
+                for year, fcf in zip(self.years.tolist(), self.free_cash_flows.tolist())
+            ],
+            terminal_value=self.terminal_value,
+            enterprise_value=self.enterprise_value
+        )
+
+    def discount_factors(self) -> np.ndarray:
+        """
+        Discount factor of each projected year, 1 / (1 + r)^t for t = 1..n.
+        """
+        return (1 + self.discount_rate) ** -np.arange(1, len(self.free_cash_flows) + 1, dtype=float)
+
+    def calculate_terminal_value(self):
+        """
+        Calculate terminal value using the Gordon Growth Model.
+        """
+        # The discount rate must always be greater than the terminal growth rate.
+        if self.discount_rate < self.terminal_growth_rate:
+            raise ValueError("Discount rate must be greater than terminal growth rate.")
+        self.terminal_value = float(self.free_cash_flows[-1] * (1 + self.terminal_growth_rate) / (
+                self.discount_rate - self.terminal_growth_rate))
+
+    def calculate_enterprise_value(self):
+        """
+        Calculate total enterprise value as sum of discounted cash flows plus discounted terminal value.
+        """
+        if self.terminal_value is None:
+            self.calculate_terminal_value()
+
+        factors = self.discount_factors()
+        self.enterprise_value = float(self.free_cash_flows @ factors + self.terminal_value * factors[-1])
+
+    def to_dict(self):
+        """
+        Convert DCF model data into a dictionary, with the projections as lists.
+        """
+        return {
+            "company_symbol": self.company_symbol,
+            "company_name": self.company_name,
+            "discount_rate": self.discount_rate,
+            "terminal_growth_rate": self.terminal_growth_rate,
+            "years": self.years.tolist(),
+            "free_cash_flows": self.free_cash_flows.tolist(),
+            "terminal_value": self.terminal_value,
+            "enterprise_value": self.enterprise_value
+        }
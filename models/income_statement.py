@@ -1,7 +1,33 @@
 import json
+import numpy as np
+import pandas as pd
 import settings
 from models.company import Company
 
+# FMP income statement key of each IncomeStatement attribute
+FMP_FIELDS = {
+    "revenue": "revenue",
+    "cogs": "costOfRevenue",
+    "gross_profit": "grossProfit",
+    "operating_expenses": "operatingExpenses",
+    "ebitda": "ebitda",
+    "D_and_A": "depreciationAndAmortization",
+    "ebit": "ebit",
+    "interest_expenses": "interestExpense",
+    "ebt": "ebt",
+    "taxes": "incomeTaxExpense",
+    "net_income": "netIncome",
+}
+FIELDS = tuple(FMP_FIELDS)
+
+# Derivation chain: metric = minuend - subtrahend, in dependency order
+DERIVED_METRICS = (
+    ("gross_profit", "revenue", "cogs"),
+    ("ebitda", "gross_profit", "operating_expenses"),
+    ("ebit", "ebitda", "D_and_A"),
+    ("ebt", "ebit", "interest_expenses"),
+    ("net_income", "ebt", "taxes"),
+)
 
 
 class IncomeStatement:
@@ -175,14 +201,142 @@ class PublicIncomeStatement(IncomeStatement):
     def __init__(self, company: Company, income_data: dict):
         super().__init__(company)
         # Populate attributes from income_data dictionary
-        self.revenue = income_data.get("revenue")
-        self.cogs = income_data.get("costOfRevenue")
-        self.gross_profit = income_data.get("grossProfit")
-        self.operating_expenses = income_data.get("operatingExpenses")
-        self.ebitda = income_data.get("ebitda")
-        self.D_and_A = income_data.get("depreciationAndAmortization")
-        self.ebit = income_data.get("ebit")
-        self.interest_expenses = income_data.get("interestExpense")
-        self.ebt = income_data.get("ebt")
-        self.taxes = income_data.get("incomeTaxExpense")
-        self.net_income = income_data.get("netIncome")
+        for field, fmp_key in FMP_FIELDS.items():
+            setattr(self, field, income_data.get(fmp_key))
+
+
+class IncomeStatementFrame:
+    """
+    Columnar income statements of many companies and periods.
+
+    Every row is one (symbol, period) statement and every IncomeStatement attribute is a float
+    column, with NaN for missing values. The derivation chain runs on whole columns at once:
+    a metric whose inputs are missing stays NaN and is reported by missing() instead of raising.
+    """
+
+    def __init__(self, symbols, periods, values: np.ndarray):
+        """
+        Args:
+            symbols (array-like): Symbol of each row.
+            periods (array-like): Period of each row (e.g. fiscal date).
+            values (np.ndarray): Array of shape (rows, len(FIELDS)) with the columns in FIELDS order.
+        """
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.periods = np.asarray(periods, dtype=object)
+        self.values = np.asarray(values, dtype=float)
+        if self.values.shape != (len(self.symbols), len(FIELDS)) or len(self.periods) != len(self.symbols):
+            raise ValueError(f"Expected {len(self.symbols)} symbols and periods and values of shape "
+                             f"({len(self.symbols)}, {len(FIELDS)}), got {self.values.shape}")
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        """Column of a field, e.g. frame["ebit"]."""
+        return self.values[:, FIELDS.index(field)]
+
+    @classmethod
+    def from_fmp(cls, payloads: list[dict]) -> "IncomeStatementFrame":
+        """
+        Builds a frame from FMP income statement payloads, as returned by FMPFetcher.fetch_income_statement.
+
+        The symbol and period of each row come from the payload's 'symbol' and 'date' keys.
+        """
+        values = np.array(
+            [[payload.get(fmp_key) for fmp_key in FMP_FIELDS.values()] for payload in payloads],
+            dtype=float
+        ).reshape(len(payloads), len(FIELDS))
+        return cls(
+            [payload.get("symbol") for payload in payloads],
+            [payload.get("date") for payload in payloads],
+            values
+        )
+
+    def to_fmp(self) -> list[dict]:
+        """Returns one FMP-style payload per row, with None for missing values."""
+        keys = ["symbol", "date", *FMP_FIELDS.values()]
+        return [
+            dict(zip(keys, row))
+            for row in zip(self.symbols.tolist(), self.periods.tolist(), *self._columns_with_none())
+        ]
+
+    @classmethod
+    def from_statements(cls, statements: list[IncomeStatement], periods=None) -> "IncomeStatementFrame":
+        """
+        Builds a frame from IncomeStatement objects.
+
+        Args:
+            statements (list[IncomeStatement]): Statements, one per row.
+            periods (array-like | None): Period of each statement (default: None for every row).
+        """
+        values = np.array(
+            [[getattr(statement, field) for field in FIELDS] for statement in statements],
+            dtype=float
+        ).reshape(len(statements), len(FIELDS))
+        return cls(
+            [statement.company.symbol for statement in statements],
+            [None] * len(statements) if periods is None else periods,
+            values
+        )
+
+    def to_statements(self, companies: dict[str, Company] | None = None) -> list[PublicIncomeStatement]:
+        """
+        Returns one PublicIncomeStatement per row.
+
+        Args:
+            companies (dict[str, Company] | None): Company of each symbol (default: a public company
+                                                   named after its symbol).
+        """
+        companies = companies or {}
+        return [
+            PublicIncomeStatement(
+                companies.get(payload["symbol"]) or Company(name=payload["symbol"], is_public=True,
+                                                            symbol=payload["symbol"]),
+                payload
+            )
+            for payload in self.to_fmp()
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns a DataFrame with columns ['symbol', 'period', *FIELDS]."""
+        df = pd.DataFrame(self.values, columns=list(FIELDS))
+        df.insert(0, "period", self.periods)
+        df.insert(0, "symbol", self.symbols)
+        return df
+
+    def _columns_with_none(self) -> list[list]:
+        """Columns as lists, with None in place of NaN."""
+        return [
+            [None if np.isnan(value) else value for value in column]
+            for column in self.values.T.tolist()
+        ]
+
+    def derive(self, overwrite: bool = False) -> "IncomeStatementFrame":
+        """
+        Runs the derivation chain (gross profit, EBITDA, EBIT, EBT, net income) on every row at once.
+
+        Args:
+            overwrite (bool): Recompute metrics that are already present, like the calculate_* methods
+                              of IncomeStatement do. By default only missing metrics are filled in.
+
+        Returns:
+            IncomeStatementFrame: self, with the derived columns updated in place.
+        """
+        for metric, minuend, subtrahend in DERIVED_METRICS:
+            computed = self[minuend] - self[subtrahend]
+            column = self[metric]
+            update = ~np.isnan(computed) if overwrite else np.isnan(column)
+            column[update] = computed[update]
+        return self
+
+    def missing(self) -> pd.DataFrame:
+        """
+        Returns a boolean DataFrame (one row per statement, one column per derived metric) that is True
+        where the metric is missing, i.e. where the calculate_* method would have raised.
+        """
+        mask = pd.DataFrame(
+            {metric: np.isnan(self[metric]) for metric, _, _ in DERIVED_METRICS}
+        )
+        mask.insert(0, "period", self.periods)
+        mask.insert(0, "symbol", self.symbols)
+        return mask
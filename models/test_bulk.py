@@ -0,0 +1,42 @@
+import pytest
+from models.balance_sheet import BalanceSheet
+from models.bulk import arrow_schema, read_ndjson, validate_many, write_arrow, write_ndjson
+from models.company import Company
+from models.discounted_cash_flow import DiscountedCashFlow
+
+
+@pytest.fixture
+def company():
+    return Company(name="Apple Inc.", is_public=True, symbol="AAPL")
+
+
+def test_write_arrow_keeps_types_of_columns_null_in_the_first_batch(tmp_path, company):
+    pa = pytest.importorskip("pyarrow")
+    models = [BalanceSheet(company=company), BalanceSheet(company=company, total_assets=5.0)]
+    path = str(tmp_path / "balance_sheets.arrow")
+
+    assert write_arrow(models, path, chunk_size=1) == 2
+
+    table = pa.ipc.open_file(path).read_all()
+    assert table.schema.field("total_assets").type == pa.float64()
+    assert table.column("total_assets").to_pylist() == [None, 5.0]
+    assert table.column("company").to_pylist()[0]["symbol"] == "AAPL"
+
+
+def test_arrow_schema_of_nested_lists():
+    pa = pytest.importorskip("pyarrow")
+    schema = arrow_schema(DiscountedCashFlow)
+    assert schema.field("projections").type == pa.list_(pa.struct([
+        pa.field("year", pa.int64()), pa.field("free_cash_flow", pa.float64())
+    ]))
+
+
+def test_ndjson_round_trip(tmp_path, company):
+    models = validate_many(BalanceSheet, [
+        {"company": company, "total_assets": 10.0, "fiscal_date_ending": "2024-12-31"},
+        {"company": company, "total_liabilities": 4.0}
+    ])
+    path = str(tmp_path / "balance_sheets.ndjson")
+
+    assert write_ndjson(models, path, chunk_size=1) == 2
+    assert read_ndjson(BalanceSheet, path) == models
@@ -0,0 +1,50 @@
+import pytest
+from models.discounted_cash_flow import CashFlowEntry, DiscountedCashFlow, ColumnarDiscountedCashFlow
+
+
+def model():
+    return DiscountedCashFlow(
+        company_symbol="AAA",
+        discount_rate=0.08,
+        terminal_growth_rate=0.02,
+        projections=[CashFlowEntry(year=2025 + i, free_cash_flow=100.0 * 1.05 ** i) for i in range(5)]
+    )
+
+
+def test_columnar_values_match_the_model():
+    dcf = model()
+    dcf.calculate_enterprise_value()
+
+    columnar = ColumnarDiscountedCashFlow.from_model(dcf)
+    columnar.calculate_enterprise_value()
+
+    assert columnar.terminal_value == pytest.approx(dcf.terminal_value)
+    assert columnar.enterprise_value == pytest.approx(dcf.enterprise_value)
+
+
+def test_round_trip_through_the_model():
+    columnar = ColumnarDiscountedCashFlow.from_model(model())
+    columnar.calculate_enterprise_value()
+
+    round_trip = columnar.to_model()
+
+    assert round_trip.projections == model().projections
+    assert round_trip.enterprise_value == columnar.enterprise_value
+
+
+@pytest.mark.parametrize("years, free_cash_flows", [
+    ([], []),
+    ([2025, 2026], [1.0]),
+    ([2026, 2025], [1.0, 2.0]),
+    ([2025, 2026], [1.0, float("nan")]),
+])
+def test_invalid_projections_are_rejected(years, free_cash_flows):
+    with pytest.raises(ValueError):
+        ColumnarDiscountedCashFlow("AAA", 0.08, 0.02, years, free_cash_flows)
+
+
+def test_discount_rate_below_terminal_growth_is_rejected():
+    columnar = ColumnarDiscountedCashFlow("AAA", 0.01, 0.02, [2025], [100.0])
+
+    with pytest.raises(ValueError):
+        columnar.calculate_enterprise_value()
@@ -1,31 +1,40 @@
+import os
 import asyncio
+from contextlib import asynccontextmanager
 import settings
 from models.company import Company, StockMarket
 from data_fetchers.FMPFetcher import FMPFetcher
+from data_fetchers.rate_limiter import TokenBucket
+from data_fetchers.response_cache import ResponseCache, CACHE_DIR
 from models.income_statement import PublicIncomeStatement
 from models.discounted_cash_flow import DiscountedCashFlow, CashFlowEntry
 from utils import forecast_fcf
-import logfire
 import pandas as pd
 
 
-async def create_public_income_statement(company: Company):
+@asynccontextmanager
+async def _fetcher_or_new(fetcher: FMPFetcher | None):
+    """Yields the given fetcher, or a new one that is closed on exit."""
+    if fetcher is not None:
+        yield fetcher
+        return
+    async with FMPFetcher(api_key=settings.FMP_API) as new_fetcher:
+        yield new_fetcher
+
+
+async def create_public_income_statement(company: Company, fetcher: FMPFetcher | None = None):
     """Instantiate a PublicIncomeStatement for a given Company fetching data using specific fetcher"""
-    fetcher = FMPFetcher(api_key=settings.FMP_API)
-    try:
+    async with _fetcher_or_new(fetcher) as fetcher:
         income_data = await fetcher.fetch_income_statement(company.symbol)
         return PublicIncomeStatement(company, income_data)
-    finally:
-        await fetcher.close()
 
 
-async def enrich_company_profile(company: Company) -> Company:
+async def enrich_company_profile(company: Company, fetcher: FMPFetcher | None = None) -> Company:
     """Given a company symbol we will fetch metadata such as sector, industry and beta"""
     if not company.symbol:
         raise ValueError("Company symbol required for profile enrichment")
 
-    fetcher = FMPFetcher(api_key=settings.FMP_API)
-    try:
+    async with _fetcher_or_new(fetcher) as fetcher:
         profile_data = await fetcher.fetch_company_profile(company.symbol)
         company.industry = profile_data.get("industry")
         company.sector = profile_data.get("sector")
@@ -33,16 +42,13 @@ async def enrich_company_profile(company: Company) -> Company:
         company.beta = float(beta_value) if beta_value is not None else None
         company.name = profile_data.get("companyName", company.name)
         return company
-    finally:
-        await fetcher.close()
 
 
-async def fetch_cash_flow_projections(symbol: str, years: int = 5):
+async def fetch_cash_flow_projections(symbol: str, years: int = 5, fetcher: FMPFetcher | None = None):
     """
     Fetch historical or projected free cash flows for the company.
     """
-    fetcher = FMPFetcher(api_key=settings.FMP_API)
-    try:
+    async with _fetcher_or_new(fetcher) as fetcher:
         # Fetch historical cash flows as a proxy for projections.
         data = await fetcher.fetch_cash_flow_statement(symbol, limit=years)
         projections = []
@@ -55,11 +61,22 @@ async def fetch_cash_flow_projections(symbol: str, years: int = 5):
         forecasted_cash_flow = forecast_fcf(projections)
         # settings.logger.info(f'Projections{projections}, forecasted_cash_flow: {forecasted_cash_flow}')
         return forecasted_cash_flow
-    finally:
-        await fetcher.close()
 
 
-async def run_workflow(symbol: str):
+async def run_workflow(symbol: str, fetcher: FMPFetcher | None = None):
+    """
+    Values one symbol with a DCF and compares it with its market cap.
+
+    Costs four FMP requests: profile, income statement, cash flow statement and quote (for the market cap).
+    Pass a shared fetcher to reuse its connections and responses across workflows; profiles and quotes
+    already fetched in batch with fetcher.fetch_company_profiles and fetcher.fetch_quotes are not
+    requested again.
+    """
+    async with _fetcher_or_new(fetcher) as fetcher:
+        return await _run_workflow(symbol, fetcher)
+
+
+async def _run_workflow(symbol: str, fetcher: FMPFetcher):
     company = Company(
         name=symbol,
         is_public=True,
@@ -69,16 +86,17 @@ async def run_workflow(symbol: str):
 
     try:
         # Enrich company info
-        company = await enrich_company_profile(company)
+        company = await enrich_company_profile(company, fetcher)
 
         # Fetch income statement
-        income_statement = await create_public_income_statement(company)
+        income_statement = await create_public_income_statement(company, fetcher)
 
         # Fetch free cash flow projections (5 years)
-        projections = await fetch_cash_flow_projections(company.symbol)
+        projections = await fetch_cash_flow_projections(company.symbol, fetcher=fetcher)
 
         # Build and calculate DCF
         dcf_model = DiscountedCashFlow(
+            company_symbol=symbol,
             company_name=company.name,
             # todo update with calculated metrics
             discount_rate=0.08,  # Example WACC 8%
@@ -99,13 +117,17 @@ async def run_workflow(symbol: str):
     # settings.logger.info(f"DCF Valuation for {symbol}: {dcf_model.enterprise_value:.2f}")
 
     try:
-        fetcher = FMPFetcher(api_key=settings.FMP_API)
-        profile_data = await fetcher.fetch_company_profile(symbol)
-        market_cap = profile_data.get("mktCap")
+        # Quotes are cached for a minute, so the market cap is fresher than the profile's
+        quote_data = await fetcher.fetch_quote(symbol)
+        market_cap = quote_data.get("marketCap")
     except Exception as e:
         market_cap = 20
         settings.logger.error(f"Failed to fetch data for {symbol}: {e}")
 
+    # Logfire is imported with the logging setup, only once there is something to log
+    settings.configure_logging()
+    import logfire
+
     with logfire.span(f'Valuation info for {symbol}'):
         settings.logger.info(f"DCF Valuation for {symbol}: ${float(dcf_model.enterprise_value / 1000000):,.2f}")
         settings.logger.info(f"Current Market Cap for {symbol}: ${float(market_cap / 1000000):,.2f}")
@@ -127,9 +149,68 @@ async def run_workflow(symbol: str):
     return comparison_df
 
 
-async def run_multiple_workflows(symbols: list[str]):
-    tasks = [run_workflow(symbol) for symbol in symbols]
-    results = await asyncio.gather(*tasks)
+def append_results_csv(df: pd.DataFrame, path: str):
+    """Appends result rows to a CSV file, writing the header only when the file is new or empty."""
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    df.to_csv(path, mode="a", header=write_header, index=False)
+
+
+async def run_multiple_workflows(
+        symbols: list[str],
+        plan: str = settings.FMP_PLAN,
+        max_concurrency: int = 50,
+        profile_chunk_size: int = 100,
+        output_path: str | None = None,
+        cache_dir: str | None = CACHE_DIR
+):
+    """
+    Runs run_workflow for every symbol, within the request rate of the FMP plan.
+
+    Profiles and quotes (for the market cap) are fetched up front in batches of profile_chunk_size
+    symbols, so each workflow only requests its two statements.
+    At most max_concurrency workflows are in flight; every FMP request takes a token from a
+    bucket sized for the plan, and requests throttled with 429 are retried with backoff.
+    Results are handled as soon as each workflow finishes, and appended to output_path if given.
+    Responses are cached on disk (statements for days, profiles for minutes), so a rerun on the
+    same day sends few or no requests.
+
+    Args:
+        symbols (list[str]): Symbols to value. Repeated symbols are valued once.
+        plan (str): FMP plan, a key of FMP_PLAN_LIMITS.
+        max_concurrency (int): Maximum number of workflows running at the same time.
+        profile_chunk_size (int): Number of symbols per batch profile and quote request.
+        output_path (str | None): CSV file the result rows are appended to as they arrive.
+        cache_dir (str | None): Directory of the FMP response cache, or None to disable it.
+
+    Returns:
+        pd.DataFrame: Result rows of every symbol that was valued, in completion order.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = []
+
+    # One pooled client, response store and rate limit for the whole run
+    cache = ResponseCache(cache_dir) if cache_dir is not None else None
+    async with FMPFetcher(api_key=settings.FMP_API, rate_limiter=TokenBucket.for_plan(plan), cache=cache) as fetcher:
+        await asyncio.gather(fetcher.fetch_company_profiles(symbols, chunk_size=profile_chunk_size),
+                             fetcher.fetch_quotes(symbols, chunk_size=profile_chunk_size))
+
+        async def bounded_workflow(symbol):
+            async with semaphore:
+                return await run_workflow(symbol, fetcher)
+
+        for next_result in asyncio.as_completed([bounded_workflow(symbol) for symbol in symbols]):
+            result = await next_result
+            if result is None:
+                continue
+            results.append(result)
+            if output_path is not None:
+                append_results_csv(result, output_path)
+
+        settings.logger.info(f"Valued {len(results)} of {len(symbols)} symbols with {fetcher.request_count} FMP requests")
+        if cache is not None:
+            settings.logger.info(f"FMP response cache: {cache.stats()}")
+
     # Each result is a DataFrame (single row). Combine into one DataFrame.
     combined_df = pd.concat(results, ignore_index=True)
 
@@ -140,5 +221,6 @@ async def run_multiple_workflows(symbols: list[str]):
 
 
 if __name__ == "__main__":
+    settings.configure_logging()
     final_df = asyncio.run(run_multiple_workflows(settings.symbols))
     print(final_df)
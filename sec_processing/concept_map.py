@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+from models.balance_sheet import BalanceSheet
+from models.bulk import validate_many
+from models.company import Company
+from models.income_statement import IncomeStatementFrame, FIELDS as INCOME_STATEMENT_FIELDS
+
+# us-gaap concepts of each canonical field, in priority order: a company's value for a field and
+# period comes from the first concept of the chain it reports for that period.
+BALANCE_SHEET_CONCEPTS = {
+    "cash_and_equivalents": ["CashAndCashEquivalentsAtCarryingValue", "Cash",
+                             "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents"],
+    "short_term_investments": ["ShortTermInvestments", "MarketableSecuritiesCurrent",
+                               "AvailableForSaleSecuritiesDebtSecuritiesCurrent"],
+    "net_receivables": ["AccountsReceivableNetCurrent", "ReceivablesNetCurrent"],
+    "inventory": ["InventoryNet", "InventoryGross"],
+    "total_current_assets": ["AssetsCurrent"],
+    "property_plant_equipment": ["PropertyPlantAndEquipmentNet",
+                                 "PropertyPlantAndEquipmentAndFinanceLeaseRightOfUseAssetAfterAccumulatedDepreciationAndAmortization"],
+    "total_assets": ["Assets"],
+    "accounts_payable": ["AccountsPayableCurrent", "AccountsPayableAndAccruedLiabilitiesCurrent"],
+    "short_term_debt": ["DebtCurrent", "ShortTermBorrowings", "CommercialPaper"],
+    "total_current_liabilities": ["LiabilitiesCurrent"],
+    "long_term_debt": ["LongTermDebtNoncurrent", "LongTermDebtAndCapitalLeaseObligations", "LongTermDebt"],
+    "total_liabilities": ["Liabilities"],
+    "common_stock": ["CommonStockValue", "CommonStocksIncludingAdditionalPaidInCapital"],
+    "retained_earnings": ["RetainedEarningsAccumulatedDeficit"],
+    "total_equity": ["StockholdersEquity",
+                     "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest"],
+}
+
+INCOME_STATEMENT_CONCEPTS = {
+    "revenue": ["Revenues", "RevenueFromContractWithCustomerExcludingAssessedTax",
+                "RevenueFromContractWithCustomerIncludingAssessedTax", "SalesRevenueNet"],
+    "cogs": ["CostOfRevenue", "CostOfGoodsAndServicesSold", "CostOfGoodsSold"],
+    "gross_profit": ["GrossProfit"],
+    "operating_expenses": ["OperatingExpenses", "SellingGeneralAndAdministrativeExpense"],
+    "D_and_A": ["DepreciationDepletionAndAmortization", "DepreciationAndAmortization",
+                "DepreciationAmortizationAndAccretionNet"],
+    "ebit": ["OperatingIncomeLoss"],
+    "interest_expenses": ["InterestExpense", "InterestExpenseNonoperating", "InterestExpenseDebt"],
+    "ebt": ["IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest",
+            "IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments",
+            "IncomeLossFromContinuingOperationsBeforeIncomeTaxesDomestic"],
+    "taxes": ["IncomeTaxExpenseBenefit"],
+    "net_income": ["NetIncomeLoss", "ProfitLoss", "NetIncomeLossAvailableToCommonStockholdersBasic"],
+}
+
+CASH_FLOW_CONCEPTS = {
+    "operating_cash_flow": ["NetCashProvidedByUsedInOperatingActivities",
+                            "NetCashProvidedByUsedInOperatingActivitiesContinuingOperations"],
+    "capex": ["PaymentsToAcquirePropertyPlantAndEquipment", "PaymentsToAcquireProductiveAssets",
+              "PaymentsForCapitalImprovements"],
+}
+
+CONCEPT_MAP = {**BALANCE_SHEET_CONCEPTS, **INCOME_STATEMENT_CONCEPTS, **CASH_FLOW_CONCEPTS}
+
+# Fields that add up to total debt
+DEBT_FIELDS = ("short_term_debt", "long_term_debt")
+
+# Period lengths, in days, of annual and quarterly durations
+DURATION_DAYS = {"annual": (350, 380), "quarterly": (80, 100)}
+
+
+def compile_concept_map(concept_map: dict[str, list[str]] = CONCEPT_MAP) -> pd.DataFrame:
+    """
+    Compiles a mapping of canonical field to concept chain into a lookup table.
+
+    Returns:
+        pd.DataFrame: One row per (concept, field) with columns ['fact', 'field', 'priority'],
+                      priority 0 being the preferred concept of its field.
+    """
+    rows = [
+        (concept, field, priority)
+        for field, concepts in concept_map.items()
+        for priority, concept in enumerate(concepts)
+    ]
+    return pd.DataFrame(rows, columns=["fact", "field", "priority"])
+
+
+CONCEPT_TABLE = compile_concept_map()
+
+
+def map_facts(facts: pd.DataFrame, table: pd.DataFrame = CONCEPT_TABLE, unit: str | None = "USD") -> pd.DataFrame:
+    """
+    Maps a facts frame onto canonical fields, for every company and period at once.
+
+    Facts are joined with the concept table; for every (ticker, field, unit, start, end) the latest
+    filing of the highest-priority concept reported wins.
+
+    Args:
+        facts (pd.DataFrame): Facts frame with columns 'ticker', 'fact', 'unit', 'start', 'end', 'val' and 'filed'.
+        table (pd.DataFrame): Lookup table from compile_concept_map.
+        unit (str | None): Keep only values reported in this unit, so a value in another unit can
+                           never replace the USD one (None keeps every unit, one row per unit).
+
+    Returns:
+        pd.DataFrame: Columns ['ticker', 'field', 'unit', 'start', 'end', 'val', 'fact', 'priority'].
+    """
+    facts = facts[facts["fact"].isin(table["fact"])]
+    if unit is not None:
+        facts = facts[facts["unit"] == unit]
+    mapped = facts[["ticker", "fact", "unit", "start", "end", "val", "filed"]].astype({"fact": str}).merge(table, on="fact")
+
+    mapped = mapped.sort_values(["priority", "filed"], ascending=[True, False], kind="stable")
+    mapped = mapped.drop_duplicates(subset=["ticker", "field", "unit", "start", "end"], keep="first")
+    return mapped[["ticker", "field", "unit", "start", "end", "val", "fact", "priority"]].reset_index(drop=True)
+
+
+def _select_period(mapped: pd.DataFrame, period: str | None) -> pd.DataFrame:
+    """Keeps instant values (no start) and, if period is given, durations of that length."""
+    if period is None:
+        return mapped
+    if period not in DURATION_DAYS:
+        raise ValueError(f"Invalid period '{period}'. Choose from {', '.join(DURATION_DAYS)}.")
+    low, high = DURATION_DAYS[period]
+    days = (mapped["end"] - mapped["start"]).dt.days
+    return mapped[mapped["start"].isna() | days.between(low, high)]
+
+
+def statement_table(facts: pd.DataFrame, fields, period: str | None = None,
+                    table: pd.DataFrame = CONCEPT_TABLE) -> pd.DataFrame:
+    """
+    Builds a wide table of canonical fields for every company and period end.
+
+    Args:
+        facts (pd.DataFrame): Facts frame.
+        fields (iterable[str]): Canonical fields to include, as columns.
+        period (str | None): 'annual' or 'quarterly' to keep only durations of that length;
+                             instant (balance sheet) values are always kept.
+        table (pd.DataFrame): Lookup table from compile_concept_map.
+
+    Returns:
+        pd.DataFrame: Index ('ticker', 'end'), one column per field, NaN where nothing was reported.
+    """
+    fields = list(fields)
+    mapped = _select_period(map_facts(facts, table[table["field"].isin(fields)]), period)
+    wide = mapped.pivot_table(index=["ticker", "end"], columns="field", values="val", aggfunc="first",
+                              observed=True)
+    return wide.reindex(columns=fields)
+
+
+def balance_sheet_table(facts: pd.DataFrame) -> pd.DataFrame:
+    """BalanceSheet fields for every company and balance sheet date."""
+    return statement_table(facts, BALANCE_SHEET_CONCEPTS)
+
+
+def to_balance_sheets(table: pd.DataFrame, companies: dict[str, Company] | None = None) -> list[BalanceSheet]:
+    """
+    Builds one BalanceSheet per row of balance_sheet_table.
+
+    Args:
+        table (pd.DataFrame): Output of balance_sheet_table.
+        companies (dict[str, Company] | None): Company of each ticker (default: a public company
+                                               named after its ticker).
+    """
+    companies = companies or {}
+    records = table.astype(object).where(table.notna(), None).reset_index().to_dict("records")
+    for record in records:
+        ticker = record.pop("ticker")
+        record["fiscal_date_ending"] = record.pop("end").strftime("%Y-%m-%d")
+        record["company"] = companies.get(ticker) or Company(name=ticker, is_public=True, symbol=ticker)
+    return validate_many(BalanceSheet, records)
+
+
+def income_statement_frame(facts: pd.DataFrame, period: str = "annual") -> IncomeStatementFrame:
+    """
+    Builds an IncomeStatementFrame with one row per company and period, and derives missing metrics.
+
+    EBITDA has no us-gaap concept, so it is always derived (when gross profit and operating
+    expenses are known).
+    """
+    wide = statement_table(facts, INCOME_STATEMENT_CONCEPTS, period=period)
+    wide = wide.reindex(columns=list(INCOME_STATEMENT_FIELDS))
+    index = wide.index.to_frame(index=False)
+    frame = IncomeStatementFrame(
+        index["ticker"].astype(str).to_numpy(),
+        index["end"].dt.strftime("%Y-%m-%d").to_numpy(),
+        wide.to_numpy(dtype=float)
+    )
+    return frame.derive()
+
+
+def total_debt_table(facts: pd.DataFrame) -> pd.Series:
+    """
+    Total debt (short-term plus long-term) of every company at every balance sheet date.
+
+    Returns:
+        pd.Series: Indexed by ('ticker', 'end'); NaN where no debt concept was reported.
+    """
+    debt = statement_table(facts, DEBT_FIELDS)
+    return debt.sum(axis=1, min_count=1).rename("total_debt")
+
+
+def tax_rate_table(facts: pd.DataFrame, period: str = "annual") -> pd.Series:
+    """
+    Effective tax rate, income tax expense over pre-tax income floored at 0, of every company and period.
+
+    Returns:
+        pd.Series: Indexed by ('ticker', 'end').
+    """
+    income = statement_table(facts, ["ebt", "taxes"], period=period)
+    rate = (income["taxes"] / income["ebt"]).replace([np.inf, -np.inf], np.nan)
+    return rate.clip(lower=0).rename("tax_rate")
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from sec_processing.concept_map import DURATION_DAYS
+
+# Span, in days, of each duration class a fact can be reported over. 10-Q income and cash flow
+# values come as 3-month and/or year-to-date (6 and 9-month) durations; 10-K values are annual.
+DURATION_CLASSES = {
+    "quarter": DURATION_DAYS["quarterly"],
+    "half_year": (170, 195),
+    "nine_months": (260, 285),
+    "annual": DURATION_DAYS["annual"],
+}
+
+# Columns identifying one series of a raw facts frame
+FACT_KEYS = ("ticker", "fact", "unit")
+
+
+def classify_durations(facts: pd.DataFrame) -> pd.Series:
+    """
+    Classifies every row of a facts frame by the span between its start and end.
+
+    Returns:
+        pd.Series: Categorical aligned with facts: 'instant' for values without a start, a key
+                   of DURATION_CLASSES, or 'other' for spans matching no class.
+    """
+    days = (facts["end"] - facts["start"]).dt.days.to_numpy()
+    conditions = [facts["start"].isna().to_numpy()]
+    conditions += [(days >= low) & (days <= high) for low, high in DURATION_CLASSES.values()]
+    classes = np.select(conditions, ["instant", *DURATION_CLASSES], default="other")
+    categories = ["instant", *DURATION_CLASSES, "other"]
+    return pd.Series(pd.Categorical(classes, categories=categories), index=facts.index, name="duration")
+
+
+def latest_filings(facts: pd.DataFrame, keys=FACT_KEYS) -> pd.DataFrame:
+    """Keeps the latest filing of every value, one row per (keys, start, end)."""
+    keys = list(keys)
+    if "filed" in facts:
+        facts = facts.sort_values("filed", kind="stable")
+    return facts.drop_duplicates(subset=[*keys, "start", "end"], keep="last")
+
+
+def discrete_quarters(facts: pd.DataFrame, keys=FACT_KEYS) -> pd.DataFrame:
+    """
+    Turns the duration values of a facts frame into discrete quarters, for every series at once.
+
+    Durations sharing a start date (a fiscal year to date) are differenced in end order: Q2 is the
+    6-month minus the 3-month value, Q3 the 9-month minus the 6-month value and Q4 the annual
+    minus the 9-month value. Reported 3-month values are preferred over derived ones for the
+    same quarter. A derived value counts as filed when the later of its two inputs was filed.
+
+    Args:
+        facts (pd.DataFrame): Facts frame, or any frame with columns keys, 'start', 'end' and 'val'.
+        keys (iterable[str]): Columns identifying one series, e.g. ('ticker', 'field', 'unit') for map_facts output.
+
+    Returns:
+        pd.DataFrame: Quarter-length rows with the columns of facts plus 'derived', sorted by keys and end.
+    """
+    keys = list(keys)
+    durations = latest_filings(facts.dropna(subset=["start"]), keys)
+    durations = durations.sort_values([*keys, "start", "end"])
+
+    groups = durations.groupby([*keys, "start"], observed=True, sort=False)
+    previous_end = groups["end"].shift(1)
+    quarters = durations.assign(
+        val=durations["val"] - groups["val"].shift(1).fillna(0),
+        start=previous_end.fillna(durations["start"]),
+        derived=previous_end.notna()
+    )
+    if "filed" in quarters:
+        quarters["filed"] = quarters["filed"].where(
+            ~quarters["derived"], np.maximum(quarters["filed"], groups["filed"].shift(1))
+        )
+
+    low, high = DURATION_CLASSES["quarter"]
+    quarters = quarters[(quarters["end"] - quarters["start"]).dt.days.between(low, high)]
+    quarters = quarters.sort_values("derived", kind="stable").drop_duplicates(subset=[*keys, "end"], keep="first")
+    return quarters.sort_values([*keys, "end"]).reset_index(drop=True)
+
+
+def quarterly_frame(facts: pd.DataFrame, keys=FACT_KEYS) -> pd.DataFrame:
+    """
+    Normalizes a facts frame to quarterly values: instants as reported and durations as discrete quarters.
+
+    Args:
+        facts (pd.DataFrame): Facts frame, e.g. FactsStore().load().
+        keys (iterable[str]): Columns identifying one series.
+
+    Returns:
+        pd.DataFrame: Columns of facts plus 'derived', one row per series and quarter or balance
+                      sheet date, from its latest filing.
+    """
+    instants = latest_filings(facts[facts["start"].isna()], keys).assign(derived=False)
+    quarters = discrete_quarters(facts, keys)
+    return pd.concat([instants, quarters], ignore_index=True).sort_values([*keys, "end"]).reset_index(drop=True)
@@ -0,0 +1,162 @@
+import os
+import pandas as pd
+import requests
+import settings
+from sec_processing.sec_client import headers
+
+# Local directory holding one pickled facts frame per ticker
+STORE_DIR = os.path.join(settings.SEC_DATA_DIR, "facts")
+LABELS_FILE = "_labels.pkl"
+
+FACT_COLUMNS = ["ticker", "fact", "unit", "start", "end", "val", "accn", "fy", "fp", "form", "filed", "frame"]
+
+
+def normalize_ticker(ticker: str) -> str:
+    """Upper case, with share class separators ('.', '_') written as the SEC does ('-', e.g. BRK-B)."""
+    return ticker.upper().replace(".", "-").replace("_", "-")
+
+
+def ticker_cik_map(headers=headers) -> dict[str, str]:
+    """
+    Downloads the SEC ticker list once and returns the zero-padded CIK of every ticker.
+
+    Tickers are keyed by normalize_ticker, so 'brk.b', 'BRK_B' and 'BRK-B' find the same company.
+    """
+    ticker_json = requests.get("https://www.sec.gov/files/company_tickers.json", headers=headers).json()
+    return {normalize_ticker(company["ticker"]): str(company["cik_str"]).zfill(10) for company in ticker_json.values()}
+
+
+def get_company_facts(cik: str, headers=headers) -> dict:
+    """Downloads the companyfacts JSON of one company."""
+    url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+    return requests.get(url, headers=headers).json()
+
+
+def facts_frame_from_json(ticker: str, company_facts: dict) -> pd.DataFrame:
+    """
+    Flattens the us-gaap facts of a companyfacts JSON into a long frame.
+
+    Unlike get_facts_df, every filing of every value is kept, so restatements stay visible.
+
+    Args:
+        ticker (str): Ticker symbol, stored in the 'ticker' column.
+        company_facts (dict): companyfacts JSON of the company.
+
+    Returns:
+        pd.DataFrame: One row per reported value with columns FACT_COLUMNS.
+    """
+    frames = []
+    for fact, details in company_facts["facts"]["us-gaap"].items():
+        for unit, items in details["units"].items():
+            df = pd.DataFrame(items)
+            df["fact"] = fact
+            df["unit"] = unit
+            frames.append(df)
+
+    df = pd.concat(frames, ignore_index=True).reindex(columns=FACT_COLUMNS)
+    df["ticker"] = ticker
+    return normalize_facts(df)
+
+
+def labels_from_json(company_facts: dict) -> dict[str, str]:
+    """Label of every us-gaap concept in a companyfacts JSON."""
+    return {fact: details["label"] for fact, details in company_facts["facts"]["us-gaap"].items()}
+
+
+def company_facts_frame(ticker: str, cik: str, headers=headers) -> pd.DataFrame:
+    """
+    Downloads the us-gaap company facts of one company as a long frame. See facts_frame_from_json.
+    """
+    return facts_frame_from_json(ticker, get_company_facts(cik, headers))
+
+
+def normalize_facts(df: pd.DataFrame) -> pd.DataFrame:
+    """Casts the date columns of a facts frame and uses categoricals for its repeated strings."""
+    df = df.copy()
+    for column in ("start", "end", "filed"):
+        df[column] = pd.to_datetime(df[column])
+    for column in ("ticker", "fact", "unit", "form", "fp"):
+        df[column] = df[column].astype("category")
+    return df
+
+
+class FactsStore:
+    """
+    Local store of SEC company facts for a universe of tickers.
+
+    Every ticker's facts are downloaded once with update() and saved to disk; load() returns the
+    facts of many companies as one long frame, so universe-wide calculations need no network call.
+    The labels of every concept seen are kept in one shared file, see labels().
+    """
+
+    def __init__(self, path: str = STORE_DIR):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, ticker: str) -> str:
+        return os.path.join(self.path, f"{ticker.upper()}.pkl")
+
+    def tickers(self) -> list[str]:
+        """Tickers with facts in the store."""
+        return sorted(name[:-4] for name in os.listdir(self.path) if name.endswith(".pkl") and name != LABELS_FILE)
+
+    def update(self, tickers: list[str], headers=headers) -> list[str]:
+        """
+        Downloads and saves the facts of every ticker. Failed tickers are logged and skipped.
+
+        Returns:
+            list[str]: Tickers that were saved.
+        """
+        ciks = ticker_cik_map(headers)
+        labels = self.labels()
+        saved = []
+        for ticker in dict.fromkeys(t.upper() for t in tickers):
+            try:
+                cik = ciks.get(normalize_ticker(ticker))
+                if cik is None:
+                    raise ValueError(f"Ticker: {ticker} not found")
+                company_facts = get_company_facts(cik, headers)
+                self.save(facts_frame_from_json(ticker, company_facts))
+                labels.update(labels_from_json(company_facts))
+                saved.append(ticker)
+            except Exception as e:
+                settings.logger.error(f"Error downloading facts for {ticker}: {e}")
+        pd.to_pickle(labels, self._labels_file())
+        return saved
+
+    def _labels_file(self) -> str:
+        return os.path.join(self.path, LABELS_FILE)
+
+    def labels(self) -> dict[str, str]:
+        """Label of every us-gaap concept of the stored companies."""
+        path = self._labels_file()
+        return pd.read_pickle(path) if os.path.exists(path) else {}
+
+    def save(self, facts: pd.DataFrame):
+        """Saves a facts frame, one file per ticker, replacing the stored facts of those tickers."""
+        for ticker, df in facts.groupby("ticker", observed=True):
+            df.reset_index(drop=True).to_pickle(self._file(str(ticker)))
+
+    def load(self, tickers: list[str] | None = None, facts: list[str] | None = None, as_of=None) -> pd.DataFrame:
+        """
+        Loads the facts of many tickers as one frame with columns FACT_COLUMNS.
+
+        Args:
+            tickers (list[str] | None): Tickers to load (default: every stored ticker).
+            facts (list[str] | None): us-gaap concepts to keep (default: all).
+            as_of (date | None): Keep only filings made on or before this date, so the frame holds
+                                 what was known then (default: every filing).
+        """
+        frames = []
+        for ticker in tickers or self.tickers():
+            df = pd.read_pickle(self._file(ticker))
+            if facts is not None:
+                df = df[df["fact"].isin(facts)]
+            if as_of is not None:
+                df = df[df["filed"] <= pd.Timestamp(as_of)]
+            frames.append(df)
+        if not frames:
+            return normalize_facts(pd.DataFrame(columns=FACT_COLUMNS))
+        # Categories differ per ticker, so concatenate as plain objects and re-encode once
+        categorical = {column: object for column in ("ticker", "fact", "unit", "form", "fp")}
+        return normalize_facts(pd.concat([df.astype(categorical) for df in frames], ignore_index=True))
@@ -0,0 +1,71 @@
+import pandas as pd
+import settings
+from sec_processing.concept_map import map_facts, CONCEPT_TABLE, DURATION_DAYS
+from sec_processing.durations import discrete_quarters
+
+FCF_FIELDS = ("operating_cash_flow", "capex")
+
+
+def fcf_panel(facts: pd.DataFrame, period: str = "annual") -> pd.DataFrame:
+    """
+    Computes free cash flow (operating cash flow minus capital expenditures) of every company in a facts frame.
+
+    Each input takes the first concept of its fallback chain reported for the period. A period
+    without operating cash flow is left out. A period without capex reported is kept with a NaN
+    fcff, since a missing capex is not known to be zero; the number of such periods is logged.
+
+    Args:
+        facts (pd.DataFrame): Facts frame, e.g. FactsStore().load().
+        period (str): 'annual' for fiscal years or 'quarterly' for discrete quarters
+                      (derived from year-to-date values where needed).
+
+    Returns:
+        pd.DataFrame: Long panel with columns ['ticker', 'date', 'operating_cash_flow', 'capex', 'fcff'],
+                      sorted by ticker and date.
+    """
+    if period not in DURATION_DAYS:
+        raise ValueError(f"Invalid period '{period}'. Choose from {', '.join(DURATION_DAYS)}.")
+
+    mapped = map_facts(facts, CONCEPT_TABLE[CONCEPT_TABLE["field"].isin(FCF_FIELDS)])
+    if period == "quarterly":
+        # Cash flow statements in 10-Qs are year-to-date
+        mapped = discrete_quarters(mapped, keys=("ticker", "field", "unit")).drop(columns="derived")
+    else:
+        low, high = DURATION_DAYS["annual"]
+        mapped = mapped[(mapped["end"] - mapped["start"]).dt.days.between(low, high)]
+
+    wide = mapped.pivot_table(index=["ticker", "end"], columns="field", values="val", aggfunc="first",
+                              observed=True).reindex(columns=list(FCF_FIELDS))
+    wide = wide.dropna(subset=["operating_cash_flow"])
+    wide["fcff"] = wide["operating_cash_flow"] - wide["capex"]
+    no_capex = wide["capex"].isna()
+    if no_capex.any():
+        tickers = no_capex.groupby(level="ticker", observed=True).any()
+        settings.logger.warning(f"No capex reported for {no_capex.sum()} {period} periods of "
+                                f"{tickers.sum()} companies; their fcff is NaN")
+
+    panel = wide.rename_axis(columns=None).reset_index().rename(columns={"end": "date"})
+    panel["ticker"] = panel["ticker"].astype(str)
+    return panel.sort_values(["ticker", "date"]).reset_index(drop=True)
+
+
+class FactsFcfFetcher:
+    """
+    Drop-in replacement for fetch_fcf that reads from a facts frame instead of yfinance.
+
+    The FCF of every company is computed once at construction; calling the fetcher with a ticker
+    returns that company's history as a DataFrame with columns ['date', 'fcff'], with NaN fcff
+    for periods without capex (see fcf_panel).
+    """
+
+    def __init__(self, facts: pd.DataFrame, period: str = "annual"):
+        panel = fcf_panel(facts, period)
+        self.histories = {
+            ticker: df[["date", "fcff"]].reset_index(drop=True)
+            for ticker, df in panel.groupby("ticker")
+        }
+
+    def __call__(self, ticker: str) -> pd.DataFrame:
+        if ticker not in self.histories:
+            raise KeyError(f"No free cash flow facts found for {ticker}")
+        return self.histories[ticker].copy()
@@ -0,0 +1,163 @@
+import os
+import xml.etree.ElementTree as ET
+import pandas as pd
+import settings
+from sec_processing.facts_store import STORE_DIR, LABELS_FILE
+
+# File holding the label index, built with build_label_index(), next to the facts store
+LABEL_INDEX_PATH = os.path.join(settings.SEC_DATA_DIR, "us_gaap_labels.pkl")
+
+# Structural concepts of a statement (headings, dimensions) that carry no values and no company facts
+STRUCTURAL_SUFFIXES = ("Abstract", "Member", "Axis", "Domain", "LineItems", "Table")
+
+XLINK = "{http://www.w3.org/1999/xlink}"
+LINK = "{http://www.xbrl.org/2003/linkbase}"
+STANDARD_LABEL_ROLE = "http://www.xbrl.org/2003/role/label"
+
+
+def _concepts(names: pd.Index) -> pd.Index:
+    """Concept names without their prefix up to the first '_' (e.g. 'us-gaap_Assets' -> 'Assets')."""
+    return pd.Index(names.astype(str).str.split("_", n=1).str[-1])
+
+
+class LabelIndex:
+    """
+    In-memory mapping of us-gaap concept name to label.
+
+    Built once from the us-gaap taxonomy or from the labels of a FactsStore, so labeling a
+    statement needs no network call. Labels are held in a pandas Series indexed by concept.
+    apply() looks up a whole index at once.
+    """
+
+    def __init__(self, labels: dict[str, str] | pd.Series | None = None):
+        self.labels = pd.Series(labels if labels is not None else {}, dtype=object)
+        self.labels = self.labels[~self.labels.index.duplicated(keep="last")]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, concept: str) -> bool:
+        return concept in self.labels.index
+
+    def get(self, concept: str, default: str | None = None) -> str | None:
+        return self.labels.get(concept, default)
+
+    def update(self, other: "LabelIndex | dict[str, str]") -> "LabelIndex":
+        """Returns a new index with the labels of other added, other's label winning for shared concepts."""
+        other = other.labels if isinstance(other, LabelIndex) else pd.Series(other, dtype=object)
+        return LabelIndex(pd.concat([self.labels, other]))
+
+    def apply(self, names) -> pd.Index:
+        """
+        Labels many names at once.
+
+        Names may carry a prefix up to the first '_' (e.g. 'us-gaap_Assets'), which is dropped
+        before the lookup. Names without a label are kept as they are.
+
+        Args:
+            names (iterable): Concept names, e.g. a statement's index.
+
+        Returns:
+            pd.Index: Labels, in the order of names.
+        """
+        names = pd.Index(names)
+        labels = _concepts(names).map(self.labels)
+        return names.where(labels.isna(), labels)
+
+    def missing(self, names) -> pd.Index:
+        """
+        Names without a label, leaving out structural concepts (see STRUCTURAL_SUFFIXES).
+
+        Args:
+            names (iterable): Concept names, e.g. the rows of a statement that have values.
+        """
+        names = pd.Index(names)
+        concepts = _concepts(names)
+        missing = ~concepts.isin(self.labels.index) & ~concepts.str.endswith(STRUCTURAL_SUFFIXES)
+        return names[missing]
+
+    @classmethod
+    def from_taxonomy(cls, source: str) -> "LabelIndex":
+        """
+        Builds the index from a us-gaap label linkbase, e.g. us-gaap-lab-2024.xml of the FASB taxonomy.
+
+        Only standard labels are kept.
+
+        Args:
+            source (str): Path of the label linkbase file.
+        """
+        concepts = {}  # locator label -> concept
+        texts = {}  # resource label -> standard label text
+        arcs = []  # (locator label, resource label)
+        for _, element in ET.iterparse(source):
+            if element.tag == f"{LINK}loc":
+                href = element.get(f"{XLINK}href", "")
+                concepts[element.get(f"{XLINK}label")] = href.rsplit("#", 1)[-1].split("_", 1)[-1]
+            elif element.tag == f"{LINK}label":
+                if element.get(f"{XLINK}role") == STANDARD_LABEL_ROLE:
+                    texts[element.get(f"{XLINK}label")] = (element.text or "").strip()
+            elif element.tag == f"{LINK}labelArc":
+                arcs.append((element.get(f"{XLINK}from"), element.get(f"{XLINK}to")))
+            element.clear()
+
+        labels = {concepts[loc]: texts[resource] for loc, resource in arcs if loc in concepts and resource in texts}
+        return cls(labels)
+
+    @classmethod
+    def from_store(cls, store) -> "LabelIndex":
+        """Builds the index from the labels saved by a FactsStore."""
+        return cls(store.labels())
+
+    def save(self, path: str = LABEL_INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.labels.to_pickle(path)
+
+    @classmethod
+    def load(cls, path: str = LABEL_INDEX_PATH) -> "LabelIndex":
+        return cls(pd.read_pickle(path))
+
+
+def build_label_index(taxonomy: str | None = None, store=None, path: str = LABEL_INDEX_PATH) -> LabelIndex:
+    """
+    Builds the label index from the taxonomy and/or a FactsStore and saves it.
+
+    Company labels from the store take precedence over taxonomy labels for shared concepts.
+
+    Args:
+        taxonomy (str | None): Path of a us-gaap label linkbase file.
+        store (FactsStore | None): Store whose labels are added.
+        path (str): Output file.
+    """
+    index = LabelIndex()
+    if taxonomy is not None:
+        index = index.update(LabelIndex.from_taxonomy(taxonomy))
+    if store is not None:
+        index = index.update(LabelIndex.from_store(store))
+    index.save(path)
+    return index
+
+
+# Default label index, with the modification times of the files it was loaded from
+_default_index = {}
+
+
+def _modified(path: str) -> float | None:
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+def default_label_index() -> LabelIndex:
+    """
+    The saved label index plus the labels of the default FactsStore.
+
+    Loaded once and reloaded only when either file changes, e.g. after FactsStore.update().
+    """
+    store_labels = os.path.join(STORE_DIR, LABELS_FILE)
+    key = (_modified(LABEL_INDEX_PATH), _modified(store_labels))
+    if key not in _default_index:
+        index = LabelIndex.load(LABEL_INDEX_PATH) if key[0] is not None else LabelIndex()
+        if key[1] is not None:
+            index = index.update(pd.read_pickle(store_labels))
+        _default_index.clear()
+        _default_index[key] = index
+    return _default_index[key]
+
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from sec_processing.durations import FACT_KEYS, classify_durations, latest_filings
+
+
+def known_as_of(facts: pd.DataFrame, as_of) -> pd.DataFrame:
+    """
+    Keeps the filings of a facts frame made on or before a date. Every filing is kept, so later
+    stages (map_facts, latest_filings) still choose the latest value known at that date.
+    """
+    return facts[facts["filed"] <= pd.Timestamp(as_of)]
+
+
+class PointInTimeFacts:
+    """
+    As-of queries over a facts frame: what was known at a date, judged by the 'filed' column.
+
+    The facts are sorted by filing date once at construction, so a snapshot is a binary search
+    plus a slice, and latest() answers many as-of dates at once with one merge_asof-style
+    binary search over (series, filed).
+    """
+
+    def __init__(self, facts: pd.DataFrame, keys=FACT_KEYS):
+        self.keys = list(keys)
+        self.facts = facts.dropna(subset=["filed"]).sort_values(["filed", "end"], kind="stable").reset_index(drop=True)
+        self.filed = self.facts["filed"].to_numpy()
+        self._frontier = None
+
+    def snapshot(self, as_of) -> pd.DataFrame:
+        """
+        The facts as known at as_of: one row per (keys, start, end), from its latest filing on or
+        before that date.
+        """
+        stop = np.searchsorted(self.filed, np.datetime64(pd.Timestamp(as_of)), side="right")
+        return latest_filings(self.facts.iloc[:stop], self.keys).reset_index(drop=True)
+
+    def frontier(self) -> pd.DataFrame:
+        """
+        Filings that report the most recent period of their series at the time they were filed.
+
+        A series is keys plus the duration class of the value (see classify_durations). Comparative
+        values of older periods, filed again in later reports, are left out; restatements of the
+        most recent period are kept. Computed once.
+        """
+        if self._frontier is None:
+            facts = self.facts.assign(duration=classify_durations(self.facts))
+            facts = facts[facts["duration"] != "other"]
+            series = [*self.keys, "duration"]
+            groups = facts.groupby(series, observed=True, sort=False)
+            facts["series"] = groups.ngroup()
+            frontier = facts[facts["end"] >= groups["end"].cummax()]
+            # Filing order within every series is kept, so the last match of a search is the latest filing
+            self._frontier = frontier.sort_values("series", kind="stable").reset_index(drop=True)
+        return self._frontier
+
+    def latest(self, as_of_dates, tickers=None, facts=None) -> pd.DataFrame:
+        """
+        For every as-of date, the value of the most recent period of every series known at that date.
+
+        Args:
+            as_of_dates (iterable): As-of dates; thousands can be given at once.
+            tickers (list[str] | None): Tickers to include (default: all).
+            facts (list[str] | None): us-gaap concepts to include (default: all).
+
+        Returns:
+            pd.DataFrame: One row per as-of date and series with a value known by then, with columns
+                          ['as_of', *keys, 'duration', 'start', 'end', 'val', 'filed'].
+        """
+        frontier = self.frontier()
+        if tickers is not None:
+            frontier = frontier[frontier["ticker"].isin(tickers)]
+        if facts is not None:
+            frontier = frontier[frontier["fact"].isin(facts)]
+
+        if frontier.empty:
+            return pd.DataFrame(columns=["as_of", *self.keys, "duration", "start", "end", "val", "filed"])
+
+        # Search keys of (series, filing day) in one sorted int64 array: series * span + day offset.
+        # Offsets start at 1, so an as-of date before every filing (offset 0) matches nothing of its series.
+        days = frontier["filed"].to_numpy().astype("datetime64[D]").astype(np.int64)
+        first_day, span = days.min(), days.max() - days.min() + 2
+        series_ids = frontier["series"].to_numpy(dtype=np.int64)
+        keys = series_ids * span + (days - first_day + 1)
+
+        dates = pd.to_datetime(pd.Index(as_of_dates)).unique().sort_values()
+        date_offsets = np.clip(dates.to_numpy().astype("datetime64[D]").astype(np.int64) - first_day + 1, 0, span - 1)
+        ids = np.unique(series_ids)
+        left_ids = np.tile(ids, len(dates))
+        left_dates = np.repeat(np.arange(len(dates)), len(ids))
+
+        # Latest filing of the series on or before every as-of date
+        match = np.searchsorted(keys, left_ids * span + date_offsets[left_dates], side="right") - 1
+        found = (match >= 0) & (series_ids[np.maximum(match, 0)] == left_ids)
+
+        # Columns are taken one by one into a new frame, so only the output is copied
+        rows = match[found]
+        columns = {"as_of": dates.to_numpy()[left_dates[found]]}
+        for column in [*self.keys, "duration", "start", "end", "val", "filed"]:
+            columns[column] = frontier[column].array.take(rows)
+        return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,24 @@
+import requests
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import settings
+
+headers = {"User-Agent": settings.email_address}
+
+
+def cik_matching_ticker(ticker, headers=headers):
+    ticker = ticker.upper().replace(".", "_")
+    ticker_json = requests.get("https://www.sec.gov/files/company_tickers.json", headers=headers).json()
+    for company in ticker_json.values():
+        if company["ticker"] == ticker:
+            cik = str(company["cik_str"]).zfill(10)
+            return cik
+    raise ValueError(f'Ticker: {ticker} not found".format(ticker=ticker)')
+
+
+def get_facts(ticker, headers=headers):
+    cik = cik_matching_ticker(ticker, headers=headers)
+    url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+    company_facts = requests.get(url, headers=headers).json()
+    return company_facts
@@ -0,0 +1,59 @@
+import pandas as pd
+from sec_processing.durations import classify_durations, discrete_quarters
+
+KEYS = ("ticker", "fact", "unit")
+
+
+def fact(start, end, val, filed, ticker="AAA"):
+    return {"ticker": ticker, "fact": "NetCashProvidedByUsedInOperatingActivities", "unit": "USD",
+            "start": pd.Timestamp(start) if start else pd.NaT, "end": pd.Timestamp(end), "val": val,
+            "filed": pd.Timestamp(filed)}
+
+
+def year_to_date_facts():
+    return pd.DataFrame([
+        fact("2023-01-01", "2023-03-31", 10.0, "2023-05-01"),
+        fact("2023-01-01", "2023-06-30", 25.0, "2023-08-01"),
+        fact("2023-01-01", "2023-09-30", 45.0, "2023-11-01"),
+        fact("2023-01-01", "2023-12-31", 70.0, "2024-02-15"),
+    ])
+
+
+def test_classify_durations():
+    facts = pd.DataFrame([
+        fact("2023-01-01", "2023-03-31", 1.0, "2023-05-01"),
+        fact("2023-01-01", "2023-06-30", 1.0, "2023-08-01"),
+        fact("2023-01-01", "2023-09-30", 1.0, "2023-11-01"),
+        fact("2023-01-01", "2023-12-31", 1.0, "2024-02-15"),
+        fact(None, "2023-12-31", 1.0, "2024-02-15"),
+        fact("2023-01-01", "2023-01-31", 1.0, "2023-02-15"),
+    ])
+
+    assert classify_durations(facts).tolist() == ["quarter", "half_year", "nine_months", "annual", "instant", "other"]
+
+
+def test_year_to_date_values_are_differenced_into_quarters():
+    quarters = discrete_quarters(year_to_date_facts(), KEYS)
+
+    assert quarters["end"].dt.month.tolist() == [3, 6, 9, 12]
+    assert quarters["val"].tolist() == [10.0, 15.0, 20.0, 25.0]
+    assert quarters["derived"].tolist() == [False, True, True, True]
+    # A derived quarter is known once both of its inputs were filed
+    assert quarters["filed"].tolist() == pd.to_datetime(["2023-05-01", "2023-08-01", "2023-11-01", "2024-02-15"]).tolist()
+
+
+def test_reported_quarters_win_over_derived_ones():
+    facts = pd.concat([year_to_date_facts(), pd.DataFrame([fact("2023-04-01", "2023-06-30", 16.0, "2023-08-01")])])
+
+    quarters = discrete_quarters(facts, KEYS)
+
+    q2 = quarters[quarters["end"] == "2023-06-30"].iloc[0]
+    assert q2["val"] == 16.0 and not q2["derived"]
+
+
+def test_series_are_differenced_separately():
+    facts = pd.concat([year_to_date_facts(), year_to_date_facts().assign(ticker="BBB", val=lambda df: df["val"] * 2)])
+
+    quarters = discrete_quarters(facts, KEYS)
+
+    assert quarters.groupby("ticker")["val"].sum().to_dict() == {"AAA": 70.0, "BBB": 140.0}
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sec_processing.facts_store import FACT_COLUMNS, normalize_facts
+from sec_processing.fcf_facts import fcf_panel, FactsFcfFetcher
+
+
+def annual_fact(ticker, fact, year, val):
+    return {"ticker": ticker, "fact": fact, "unit": "USD", "start": pd.Timestamp(f"{year}-01-01"),
+            "end": pd.Timestamp(f"{year}-12-31"), "val": val, "accn": f"{ticker}-{year}", "fy": year,
+            "fp": "FY", "form": "10-K", "filed": pd.Timestamp(f"{year + 1}-02-15"), "frame": None}
+
+
+@pytest.fixture
+def facts():
+    rows = [annual_fact("AAA", "NetCashProvidedByUsedInOperatingActivities", year, 100.0 + year - 2020)
+            for year in (2020, 2021, 2022)]
+    # No capex reported for 2021
+    rows += [annual_fact("AAA", "PaymentsToAcquirePropertyPlantAndEquipment", year, 30.0) for year in (2020, 2022)]
+    return normalize_facts(pd.DataFrame(rows, columns=FACT_COLUMNS))
+
+
+def test_missing_capex_gives_nan_fcf(facts):
+    panel = fcf_panel(facts)
+
+    assert panel["date"].dt.year.tolist() == [2020, 2021, 2022]
+    np.testing.assert_array_equal(panel["fcff"], [70.0, np.nan, 72.0])
+
+
+def test_fetcher_returns_one_history_per_ticker(facts):
+    fetcher = FactsFcfFetcher(facts)
+
+    assert fetcher("AAA").columns.tolist() == ["date", "fcff"]
+    with pytest.raises(KeyError):
+        fetcher("BBB")
@@ -0,0 +1,44 @@
+import pandas as pd
+from sec_processing.label_index import LabelIndex
+from sec_processing.utils import rename_statement
+
+LINKBASE = """<?xml version="1.0"?>
+<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">
+  <link:labelLink xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">
+    <link:loc xlink:type="locator" xlink:href="../elts/us-gaap-2024.xsd#us-gaap_Assets" xlink:label="Assets"/>
+    <link:label xlink:type="resource" xlink:label="lab_Assets" xlink:role="http://www.xbrl.org/2003/role/label">Assets</link:label>
+    <link:label xlink:type="resource" xlink:label="doc_Assets" xlink:role="http://www.xbrl.org/2003/role/documentation">Sum of assets.</link:label>
+    <link:labelArc xlink:type="arc" xlink:from="Assets" xlink:to="lab_Assets"/>
+    <link:labelArc xlink:type="arc" xlink:from="Assets" xlink:to="doc_Assets"/>
+    <link:loc xlink:type="locator" xlink:href="../elts/us-gaap-2024.xsd#us-gaap_AccountsPayableCurrent" xlink:label="AP"/>
+    <link:label xlink:type="resource" xlink:label="lab_AP" xlink:role="http://www.xbrl.org/2003/role/label">Accounts Payable, Current</link:label>
+    <link:labelArc xlink:type="arc" xlink:from="AP" xlink:to="lab_AP"/>
+  </link:labelLink>
+</link:linkbase>
+"""
+
+
+def test_from_taxonomy_keeps_standard_labels(tmp_path):
+    path = tmp_path / "us-gaap-lab.xml"
+    path.write_text(LINKBASE)
+
+    index = LabelIndex.from_taxonomy(str(path))
+
+    assert index.labels.to_dict() == {"Assets": "Assets", "AccountsPayableCurrent": "Accounts Payable, Current"}
+
+
+def test_rename_statement_labels_known_concepts_and_keeps_the_rest():
+    statement = pd.DataFrame({"2024-12-31": [1.0, 2.0, None]},
+                             index=["us-gaap_Assets", "aapl_CustomConcept", "us-gaap_AssetsAbstract"])
+
+    renamed = rename_statement(statement, {"Assets": "Total assets"})
+
+    assert renamed.index.tolist() == ["Total assets", "aapl_CustomConcept", "us-gaap_AssetsAbstract"]
+
+
+def test_missing_ignores_structural_concepts():
+    index = LabelIndex({"Assets": "Assets"})
+
+    missing = index.missing(["us-gaap_Assets", "us-gaap_AssetsAbstract", "us-gaap_SegmentsMember", "us-gaap_Revenues"])
+
+    assert missing.tolist() == ["us-gaap_Revenues"]
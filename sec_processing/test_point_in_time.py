@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from sec_processing.point_in_time import PointInTimeFacts, known_as_of
+
+
+def fact(fact_name, end, val, filed, ticker="AAA", start=None):
+    return {"ticker": ticker, "fact": fact_name, "unit": "USD",
+            "start": pd.Timestamp(start) if start else pd.NaT, "end": pd.Timestamp(end), "val": val,
+            "filed": pd.Timestamp(filed)}
+
+
+@pytest.fixture
+def facts():
+    return pd.DataFrame([
+        fact("Assets", "2022-12-31", 100.0, "2023-02-15"),
+        # The 2023 10-K repeats 2022 as a comparative and restates it
+        fact("Assets", "2022-12-31", 101.0, "2024-02-15"),
+        fact("Assets", "2023-12-31", 120.0, "2024-02-15"),
+        # A restatement of the latest period
+        fact("Assets", "2023-12-31", 125.0, "2024-06-01"),
+        fact("Assets", "2023-12-31", 50.0, "2024-03-01", ticker="BBB"),
+        fact("Revenues", "2023-12-31", 80.0, "2024-02-15", start="2023-01-01"),
+    ])
+
+
+def test_known_as_of_keeps_earlier_filings(facts):
+    assert len(known_as_of(facts, "2024-02-15")) == 4
+
+
+def test_snapshot_keeps_the_latest_filing_known(facts):
+    snapshot = PointInTimeFacts(facts).snapshot("2024-03-01")
+
+    assets = snapshot[(snapshot["ticker"] == "AAA") & (snapshot["fact"] == "Assets")].set_index("end")["val"]
+    assert assets.to_dict() == {pd.Timestamp("2022-12-31"): 101.0, pd.Timestamp("2023-12-31"): 120.0}
+
+
+def test_latest_answers_many_dates_at_once(facts):
+    latest = PointInTimeFacts(facts).latest(["2023-01-01", "2023-06-30", "2024-03-01", "2024-12-31"],
+                                            tickers=["AAA"], facts=["Assets"])
+
+    assert latest["as_of"].dt.strftime("%Y-%m-%d").tolist() == ["2023-06-30", "2024-03-01", "2024-12-31"]
+    assert latest["val"].tolist() == [100.0, 120.0, 125.0]
+
+
+def test_latest_keeps_series_and_duration_classes_apart(facts):
+    latest = PointInTimeFacts(facts).latest(["2024-12-31"])
+
+    assert sorted(zip(latest["ticker"], latest["fact"], latest["duration"].astype(str), latest["val"])) == [
+        ("AAA", "Assets", "instant", 125.0), ("AAA", "Revenues", "annual", 80.0), ("BBB", "Assets", "instant", 50.0)
+    ]
@@ -5,8 +5,11 @@ import calendar
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import settings
-
-headers = {"User-Agent": settings.email_address}
+from sec_processing.sec_client import headers, cik_matching_ticker, get_facts
+from sec_processing.durations import classify_durations, latest_filings, quarterly_frame
+from sec_processing.facts_store import facts_frame_from_json, labels_from_json
+from sec_processing.label_index import LabelIndex, default_label_index
+from sec_processing.point_in_time import known_as_of
 
 statement_keys_map = {
     "balance_sheet": [
@@ -63,16 +66,6 @@ statement_keys_map = {
 }
 
 
-def cik_matching_ticker(ticker, headers=headers):
-    ticker = ticker.upper().replace(".", "_")
-    ticker_json = requests.get("https://www.sec.gov/files/company_tickers.json", headers=headers).json()
-    for company in ticker_json.values():
-        if company["ticker"] == ticker:
-            cik = str(company["cik_str"]).zfill(10)
-            return cik
-    raise ValueError(f'Ticker: {ticker} not found".format(ticker=ticker)')
-
-
 def get_submission_data_for_ticker(ticker, headers=headers, only_fillings_df=False):
     cik = cik_matching_ticker(ticker, headers=headers)
     headers = headers.copy()
@@ -97,13 +90,6 @@ def get_filtered_filings(ticker, form_type='10-K', just_accession_numbers=False,
         raise ValueError("Must provide form_type")
 
 
-def get_facts(ticker, headers=headers):
-    cik = cik_matching_ticker(ticker, headers=headers)
-    url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-    company_facts = requests.get(url, headers=headers).json()
-    return company_facts
-
-
 def get_facts_df(ticker, headers=headers):
     facts = get_facts(ticker, headers=headers)
     us_gaap_data = facts["facts"]["us-gaap"]
@@ -124,26 +110,31 @@ def get_facts_df(ticker, headers=headers):
     return df, labels_dict
 
 
-def annual_facts(ticker, headers=headers):
-    accession_nums = get_filtered_filings(ticker, form_type='10-K', just_accession_numbers=True)
-    df, label_dict = get_facts_df(ticker, headers)
-    ten_k = df[df["accn"].isin(accession_nums)]
-    ten_k = ten_k[ten_k.index.isin(accession_nums.index)]
-    pivot = ten_k.pivot_table(values="val", columns="fact", index="end")
-    pivot.rename(columns=label_dict, inplace=True)
+def annual_facts(ticker, headers=headers, as_of=None):
+    # Latest 10-K value of every fact and fiscal year end; as_of keeps only what was filed by that date
+    company_facts = get_facts(ticker, headers=headers)
+    facts = facts_frame_from_json(ticker.upper(), company_facts)
+    facts = facts[facts["form"].isin(["10-K", "10-K/A"])]
+    if as_of is not None:
+        facts = known_as_of(facts, as_of)
+    facts = latest_filings(facts[classify_durations(facts).isin(["instant", "annual"])])
+    pivot = facts.pivot_table(values="val", columns="fact", index="end", observed=True)
+    pivot.rename(columns=labels_from_json(company_facts), inplace=True)
     return pivot.T
 
 
-def quarterly_facts(ticker, headers=headers):
-    accession_nums = get_filtered_filings(
-        ticker, form_type="10-Q", just_accession_numbers=True
-    )
-    df, label_dict = get_facts_df(ticker, headers)
-    ten_q = df[df["accn"].isin(accession_nums)]
-    ten_q = ten_q[ten_q.index.isin(accession_nums.index)].reset_index(drop=False)
-    ten_q = ten_q.drop_duplicates(subset=["fact", "end"], keep="last")
-    pivot = ten_q.pivot_table(values="val", columns="fact", index="end")
-    pivot.rename(columns=label_dict, inplace=True)
+def quarterly_facts(ticker, headers=headers, as_of=None):
+    # Balance sheet values as reported, income and cash flow values as discrete quarters
+    # (year-to-date 10-Q values differenced, Q4 derived from the 10-K); as_of keeps only what was
+    # filed by that date
+    company_facts = get_facts(ticker, headers=headers)
+    facts = facts_frame_from_json(ticker.upper(), company_facts)
+    facts = facts[facts["form"].isin(["10-Q", "10-Q/A", "10-K", "10-K/A"])]
+    if as_of is not None:
+        facts = known_as_of(facts, as_of)
+    quarters = quarterly_frame(facts)
+    pivot = quarters.pivot_table(values="val", columns="fact", index="end", observed=True)
+    pivot.rename(columns=labels_from_json(company_facts), inplace=True)
     return pivot.T
 
 
@@ -162,13 +153,15 @@ def get_label_dictionary(ticker, headers):
     return labels_dict
 
 
-def rename_statement(statement, label_dictionary):
-    # Extract the part after the first "_" and then map it using the label dictionary
+def rename_statement(statement, label_dictionary=None):
+    # Drop the part up to the first "_" and label every concept at once with the label index
+    if label_dictionary is None:
+        label_dictionary = default_label_index()
+    elif not isinstance(label_dictionary, LabelIndex):
+        label_dictionary = LabelIndex(label_dictionary)
     try:
-        statement.index = statement.index.map(
-            lambda x: label_dictionary.get(x.split("_", 1)[-1], x)
-        )
-    except ValueError:
+        statement.index = label_dictionary.apply(statement.index)
+    except (ValueError, AttributeError):
         raise ValueError("It was not possible to rename the statement")
 
     return statement
@@ -491,8 +484,15 @@ def fetch_report_to_df(ticker: str, report_type: str) -> pd.DataFrame:
         print("stop program")
         raise ValueError(f"There was a problem getting filings for {ticker}")
 
-    label_dict = get_label_dictionary(ticker, headers)
-    statement_df = rename_statement(statement, label_dict)
+    # Label from the local index only; concepts it does not know keep their names
+    label_index = default_label_index()
+    missing = label_index.missing(statement.index[statement.notna().any(axis=1)])
+    if len(missing):
+        settings.logger.warning(
+            f"No label for {len(missing)} concepts of {ticker} (e.g. {missing[0]}); "
+            "build the label index with sec_processing.label_index.build_label_index()"
+        )
+    statement_df = rename_statement(statement, label_index)
     #settings.logger.debug("statement_df: {}".format(statement_df))
     return statement_df
 
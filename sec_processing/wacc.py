@@ -1,11 +1,19 @@
+import pandas as pd
 from sec_processing.equity_value import get_market_equity_value
-from sec_processing.tc_comparison import main as get_tc
-from sec_processing.debt_value import main as get_debt
+from sec_processing.cost_of_equity import get_cost_of_equity
+from sec_processing.facts_store import FactsStore
+from sec_processing.wacc_inputs import wacc_inputs_table, universe_wacc
 
-ticker = "GOOG"
+tickers = ["GOOG"]
 
-equity = get_market_equity_value(ticker)
-tc = get_tc([ticker])
-debt = get_debt([ticker])
+# Debt, interest and tax rate come from the local facts store; only market data is fetched per ticker
+store = FactsStore()
+missing = [ticker for ticker in tickers if ticker not in store.tickers()]
+if missing:
+    store.update(missing)
 
-print(f'equity: {equity}, tc: {tc}, debt: {debt}')
\ No newline at end of file
+inputs = wacc_inputs_table(store.load(tickers))
+equity = pd.Series({ticker: get_market_equity_value(ticker) for ticker in tickers}, dtype=float)
+cost_of_equity = pd.Series({ticker: get_cost_of_equity(ticker) for ticker in tickers}, dtype=float)
+
+print(universe_wacc(inputs, equity, cost_of_equity))
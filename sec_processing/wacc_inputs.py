@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+from sec_processing.concept_map import statement_table, DEBT_FIELDS
+
+WACC_INPUT_COLUMNS = ["total_debt", "average_debt", "interest_expense", "ebt", "taxes", "tax_rate",
+                      "cost_of_debt"]
+
+# Length of one period, how far back the previous balance sheet date lies, and how many periods make a year
+PERIOD_OFFSETS = {"annual": pd.DateOffset(years=1), "quarterly": pd.DateOffset(months=3)}
+PERIODS_PER_YEAR = {"annual": 1, "quarterly": 4}
+
+# Largest distance, in days, between the expected and the reported previous balance sheet date
+PREVIOUS_DATE_TOLERANCE = pd.Timedelta(days=15)
+
+
+def _previous_debt(table: pd.DataFrame, debt: pd.Series, period: str) -> pd.Series:
+    """
+    Total debt at the balance sheet date one period before every row of table, NaN if not reported.
+
+    Looked up among every reported balance sheet date, not only those with income statement data.
+    """
+    rows = table.index.to_frame(index=False)
+    rows["previous_end"] = rows["end"] - PERIOD_OFFSETS[period]
+    rows["ticker"] = rows["ticker"].astype(str)
+    rows["row"] = range(len(rows))
+
+    reported = debt.dropna().rename("previous_debt").reset_index().rename(columns={"end": "previous_end"})
+    reported["ticker"] = reported["ticker"].astype(str)
+
+    previous = pd.merge_asof(rows.sort_values("previous_end"), reported.sort_values("previous_end"),
+                             on="previous_end", by="ticker", direction="nearest",
+                             tolerance=PREVIOUS_DATE_TOLERANCE)
+    return pd.Series(previous.sort_values("row")["previous_debt"].to_numpy(), index=table.index)
+
+
+def wacc_inputs_table(facts: pd.DataFrame, period: str = "annual") -> pd.DataFrame:
+    """
+    Computes the SEC-based WACC inputs of every company and period in a facts frame at once.
+
+    - total_debt: short-term plus long-term debt at the period end.
+    - average_debt: mean of total debt at this and the previous period end of the same company
+      (total debt when no debt was reported at the previous period end).
+    - tax_rate: income tax expense over pre-tax income, floored at 0.
+    - cost_of_debt: interest expense over average debt, annualized (quarterly interest times 4), so
+      it can be combined with an annual cost of equity.
+
+    Args:
+        facts (pd.DataFrame): Facts frame, e.g. FactsStore().load().
+        period (str): 'annual' or 'quarterly' income statement durations.
+
+    Returns:
+        pd.DataFrame: Index ('ticker', 'end') with columns WACC_INPUT_COLUMNS, NaN where an input
+                      was not reported.
+    """
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Invalid period '{period}'. Choose from {', '.join(PERIOD_OFFSETS)}.")
+
+    table = statement_table(facts, ["interest_expenses", "ebt", "taxes", *DEBT_FIELDS], period=period)
+    table["total_debt"] = table[list(DEBT_FIELDS)].sum(axis=1, min_count=1)
+    debt = table["total_debt"]
+
+    # Keep period ends with income statement data
+    table = table[table[["interest_expenses", "ebt", "taxes"]].notna().any(axis=1)].sort_index()
+    previous_debt = _previous_debt(table, debt, period)
+    table["average_debt"] = table["total_debt"].where(previous_debt.isna(), (table["total_debt"] + previous_debt) / 2)
+
+    table["interest_expense"] = table["interest_expenses"]
+    table["tax_rate"] = (table["taxes"] / table["ebt"]).replace([np.inf, -np.inf], np.nan).clip(lower=0)
+    annual_interest = table["interest_expense"] * PERIODS_PER_YEAR[period]
+    table["cost_of_debt"] = (annual_interest / table["average_debt"]).replace([np.inf, -np.inf], np.nan)
+    return table[WACC_INPUT_COLUMNS].rename_axis(columns=None)
+
+
+def latest_wacc_inputs(inputs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keeps the most recent period of every company.
+
+    Returns:
+        pd.DataFrame: Indexed by ticker, with the period end in column 'end'.
+    """
+    latest = inputs.reset_index().sort_values("end").groupby("ticker", observed=True).tail(1)
+    return latest.set_index("ticker")
+
+
+def universe_wacc(inputs: pd.DataFrame, equity_values: pd.Series, costs_of_equity: pd.Series) -> pd.DataFrame:
+    """
+    Computes WACC for every company from its latest SEC inputs, as one DataFrame operation.
+
+    WACC = E / (D + E) * Re + D / (D + E) * Rd * (1 - Tc)
+
+    Args:
+        inputs (pd.DataFrame): Output of wacc_inputs_table.
+        equity_values (pd.Series): Market value of equity, indexed by ticker.
+        costs_of_equity (pd.Series): Cost of equity, indexed by ticker.
+
+    Returns:
+        pd.DataFrame: Indexed by ticker with the latest inputs, 'equity_value', 'cost_of_equity' and 'wacc'.
+    """
+    df = latest_wacc_inputs(inputs)
+    df["equity_value"] = equity_values.reindex(df.index)
+    df["cost_of_equity"] = costs_of_equity.reindex(df.index)
+
+    debt = df["total_debt"].fillna(0)
+    total_value = df["equity_value"] + debt
+    df["wacc"] = (
+            df["equity_value"] / total_value * df["cost_of_equity"]
+            + debt / total_value * df["cost_of_debt"].fillna(0) * (1 - df["tax_rate"].fillna(0))
+    )
+    return df
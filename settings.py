@@ -1,33 +1,74 @@
 import os
 import logging
-import logfire
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Logfire registers a pydantic plugin, which pydantic imports (all of logfire) with the first model.
+# Pydantic is not instrumented here, so skip it and keep logfire out of the import path.
+os.environ.setdefault("PYDANTIC_DISABLE_PLUGINS", "logfire-plugin")
+
 # Get environment variables
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
-# Configure Logfire: send only if token is present
-logfire.configure(send_to_logfire="if-token-present")
-logfire.instrument_system_metrics()
+_logging_configured = False
+
+
+def configure_logging():
+    """
+    Configure Logfire and the log handlers. Safe to call more than once.
+
+    Importing logfire and starting its system metrics is slow, so this runs on the first log
+    record rather than on import. Call it explicitly to configure logging up front.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+
+    import logfire
+
+    # Configure Logfire: send only if token is present
+    logfire.configure(send_to_logfire="if-token-present")
+    logfire.instrument_system_metrics()
+
+    # Rebind rather than mutate, since this can run while the root logger iterates its handlers
+    root = logging.getLogger()
+    root.handlers = [h for h in root.handlers if not isinstance(h, _ConfigureOnFirstRecord)]
 
-# Set up logging with dynamic level
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL, logging.INFO),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("financial_analyzer.log"),
-        logfire.LogfireLoggingHandler()
-    ]
-)
+    # Set up logging with dynamic level
+    logging.basicConfig(
+        level=getattr(logging, LOG_LEVEL, logging.INFO),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("financial_analyzer.log"),
+            logfire.LogfireLoggingHandler()
+        ]
+    )
+
+    logger.info(f"Logging initialized with level {LOG_LEVEL}")
+
+
+class _ConfigureOnFirstRecord(logging.Handler):
+    """Placeholder root handler that configures logging on the first record and then forwards it."""
+
+    def emit(self, record):
+        configure_logging()
+        for handler in logging.getLogger().handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+logging.getLogger().setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+logging.getLogger().addHandler(_ConfigureOnFirstRecord())
 
 logger = logging.getLogger(__name__)
-logger.info(f"Logging initialized with level {LOG_LEVEL}")
 
 # Read keys from settings
 FMP_API = os.getenv("FMP_API")
+# FMP subscription plan, used to rate limit requests (see data_fetchers.rate_limiter.FMP_PLAN_LIMITS)
+FMP_PLAN = os.getenv("FMP_PLAN", "starter")
 
 # Symbols to analyze
 symbols = ["GOOG", "MSFT", "AMZN", "AAPL", "TSLA", "META", "NFLX", "NVDA", "ADBE", "INTC"]
@@ -55,3 +96,6 @@ sp500_tickers = [
 ]
 
 email_address = os.getenv("EMAIL_ADDRESS")
+
+# Local directory for downloaded SEC data: the facts store and the us-gaap label index
+SEC_DATA_DIR = os.getenv("SEC_DATA_DIR", "sec_data")
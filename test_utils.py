@@ -0,0 +1,20 @@
+import numpy as np
+from models.discounted_cash_flow import CashFlowEntry
+from utils import forecast_fcf
+
+
+def entries(values, first_year=2020):
+    return [CashFlowEntry(year=first_year + i, free_cash_flow=v) for i, v in enumerate(values)]
+
+
+def test_forecast_compounds_the_average_growth():
+    forecast = forecast_fcf(entries([100.0, 110.0, 121.0]), forecast_years=2)
+
+    assert [f.year for f in forecast] == [2023, 2024]
+    np.testing.assert_allclose([f.free_cash_flow for f in forecast], [133.1, 146.41])
+
+
+def test_growth_from_a_zero_fcf_is_left_out():
+    forecast = forecast_fcf(entries([0.0, 100.0, 110.0]), forecast_years=2)
+
+    np.testing.assert_allclose([f.free_cash_flow for f in forecast], [121.0, 133.1])
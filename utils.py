@@ -1,13 +1,20 @@
 from models.discounted_cash_flow import CashFlowEntry
 from typing import List
+import sys, os
+import numpy as np
 import pandas as pd
-import settings
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "yfinance_processing"))
+
+from company_growth import fcf_growth
 
 
 def forecast_fcf(projections: List[CashFlowEntry], forecast_years: int = 5) -> List[CashFlowEntry]:
     """
     Forecast future free cash flows based on historical growth rate.
 
+    The growth rate is fcf_growth of yfinance_processing, so growth from a zero or missing FCF
+    is left out here as well.
+
     Args:
         projections (List[CashFlowEntry]): Historical FCF data.
         forecast_years (int): Number of future years to forecast.
@@ -15,48 +22,23 @@ def forecast_fcf(projections: List[CashFlowEntry], forecast_years: int = 5) -> L
     Returns:
         List[CashFlowEntry]: Historical + forecasted FCF projections.
     """
-    # Convert to DataFrame
-    df = pd.DataFrame([{"year": p.year, "fcf": p.free_cash_flow} for p in projections])
-    df = df.sort_values("year").reset_index(drop=True)
-
-    # Calculate year-over-year growth rate
-    df["growth"] = df["fcf"].pct_change()
-
-    # Calculate FCF in millions of USD
-    df["fcf_million_usd"] = df["fcf"] / 1_000_000
-
-    # Calculate average growth rate (excluding first NaN)
-    avg_growth = df["growth"][1:].mean()
-
-    # Prepare forecast starting from the last known year and FCF
-    last_year = df["year"].iloc[-1]
-    last_fcf = df["fcf"].iloc[-1]
-
-    # Forecast future years and append to DataFrame
-    forecast_rows = []
-    for i in range(1, forecast_years + 1):
-        next_year = last_year + i
-        next_fcf = last_fcf * (1 + avg_growth)
-        forecast_rows.append({
-            "year": next_year,
-            "fcf": next_fcf,
-            "growth": avg_growth,
-            "fcf_million_usd": next_fcf / 1_000_000
-        })
-        last_fcf = next_fcf  # update base for next iteration
-
-    # Append forecast rows to df
-    forecast_df = pd.DataFrame(forecast_rows)
-    df_final = pd.concat([df, forecast_df], ignore_index=True)
+    # Sort historical FCF chronologically
+    history = sorted(projections, key=lambda p: p.year)
+    fcf = np.array([p.free_cash_flow for p in history], dtype=float)
+
+    # Average year-over-year growth rate, with the same rule as the yfinance forecasts
+    avg_growth = fcf_growth(pd.DataFrame({"date": [p.year for p in history], "fcff": fcf}))
+
+    # Compound from the last known year and FCF
+    last_year = history[-1].year
+    forecast_fcfs = fcf[-1] * np.cumprod(np.full(forecast_years, 1 + avg_growth))
 
     # todo: Should we include the company name?
-    # Log the final DataFrame
-    # settings.logger.info("Forecast FCF DataFrame:\n%s", df_final.to_string(index=False))
 
-    # Convert forecast rows to CashFlowEntry objects
+    # Build forecast entries; values are already validated floats, so skip per-entry validation
     forecast = [
-        CashFlowEntry(year=row["year"], free_cash_flow=row["fcf"])
-        for row in forecast_rows
+        CashFlowEntry.model_construct(year=last_year + i, free_cash_flow=float(next_fcf))
+        for i, next_fcf in enumerate(forecast_fcfs, start=1)
     ]
 
     return forecast
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def pad_groups(codes: np.ndarray, values: np.ndarray, n_groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Packs a grouped 1-D array into a NaN-padded (groups x max group size) matrix.
+
+    Args:
+        codes (np.ndarray): Group code (0..n_groups-1) of every value.
+        values (np.ndarray): Values to pack, in group order.
+        n_groups (int): Number of groups.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The padded matrix and the number of values per group.
+    """
+    codes = np.asarray(codes)
+    counts = np.bincount(codes, minlength=n_groups)
+    order = np.argsort(codes, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    position = np.empty(len(codes), dtype=int)
+    position[order] = np.arange(len(codes)) - starts[codes[order]]
+
+    matrix = np.full((n_groups, max(counts.max(initial=0), 1)), np.nan)
+    matrix[codes, position] = values
+    return matrix, counts
+
+
+def bootstrap_bands(
+        matrix: np.ndarray,
+        counts: np.ndarray,
+        to_paths,
+        periods: int,
+        n_samples: int = 5000,
+        confidence: float = 0.9,
+        seed: int | None = None,
+        chunk_size: int = 100
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes bootstrap confidence bands for many groups at once.
+
+    For every group, n_samples x periods values are drawn with replacement from its row of the
+    padded matrix, turned into forecast paths by to_paths, and summarised by their quantiles.
+    Groups are processed in chunks to bound memory at chunk_size x n_samples x periods.
+
+    Args:
+        matrix (np.ndarray): Padded matrix of values to resample, as returned by pad_groups.
+        counts (np.ndarray): Number of valid values per row.
+        to_paths (callable): Maps (row indices, sampled values of shape (rows, n_samples, periods))
+                             to forecast paths of the same shape.
+        periods (int): Forecast horizon.
+        n_samples (int): Number of bootstrap paths per group.
+        confidence (float): Width of the band, e.g. 0.9 for the 5th-95th percentiles.
+        seed (int | None): Seed for the random generator.
+        chunk_size (int): Number of groups resampled at once.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Lower and upper bands, each of shape (groups, periods).
+                                       Groups with nothing to resample are NaN.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    rng = np.random.default_rng(seed)
+    tail = (1 - confidence) / 2
+    n_groups = matrix.shape[0]
+    lower = np.full((n_groups, periods), np.nan)
+    upper = np.full((n_groups, periods), np.nan)
+
+    for start in range(0, n_groups, chunk_size):
+        rows = np.arange(start, min(start + chunk_size, n_groups))
+        rows = rows[counts[rows] > 0]
+        if not len(rows):
+            continue
+
+        # Uniform draws scaled by each group's count index only its own valid values
+        idx = (rng.random((len(rows), n_samples, periods)) * counts[rows, None, None]).astype(int)
+        sampled = matrix[rows[:, None, None], idx]
+
+        paths = to_paths(rows, sampled)
+        lower[rows], upper[rows] = np.quantile(paths, [tail, 1 - tail], axis=1)
+
+    return lower, upper
@@ -1,11 +1,18 @@
+import numpy as np
 import pandas as pd
 from settings import logger
+from bootstrap import pad_groups, bootstrap_bands
+
+GROWTH_ESTIMATORS = ("mean", "median", "cagr")
 
 
 def fcf_growth(df_: pd.DataFrame) -> float:
     """
     Calculates the average annual growth rate of FCF.
 
+    Growth is measured between consecutive reported FCFs with the rule of _growth_rates: growth
+    into or out of a missing FCF, and growth from a zero FCF, is undefined and left out.
+
     Args:
         df_ (pd.DataFrame): DataFrame with columns 'date' and 'fcff'.
 
@@ -20,7 +27,7 @@ def fcf_growth(df_: pd.DataFrame) -> float:
 
     # Calculate period-over-period growth
     try:
-        df_["fcff_growth"] = df_["fcff"].pct_change()
+        df_["fcff_growth"] = _growth_rates(df_.assign(ticker=""))
     except KeyError:
         logger.error("No 'fcff' column found in DataFrame.")
 
@@ -32,7 +39,7 @@ def fcf_growth(df_: pd.DataFrame) -> float:
 
 def forecast_fcf_using_growth(df_: pd.DataFrame, periods: int = 5, freq: str = 'YE') -> pd.DataFrame:
     """
-    Forecasts FCF into the future using the historical average growth rate.
+    Forecasts FCF into the future using the historical average growth rate (see fcf_growth).
 
     Args:
         df_ (pd.DataFrame): DataFrame with columns 'date' and 'fcff'.
@@ -42,35 +49,141 @@ def forecast_fcf_using_growth(df_: pd.DataFrame, periods: int = 5, freq: str = '
     Returns:
         pd.DataFrame: DataFrame with forecasted 'date' and 'fcff' including historical + forecast.
     """
-    avg_growth = fcf_growth(df_)
-    df_ = df_.copy()
+    # Same computation as the panel forecaster, for a single series
+    return forecast_fcf_panel(df_.assign(ticker=""), periods, freq).drop(columns="ticker")
 
-    # Ensure dates are datetime
-    df_['date'] = pd.to_datetime(df_['date'])
 
-    last_date = df_['date'].max()
-    last_fcf = df_.loc[df_['date'] == last_date, 'fcff'].values[0]
+def future_dates(last_dates: pd.Series, periods: int, freq: str = 'YE') -> np.ndarray:
+    """
+    Builds the forecast dates following each last reported date, as forecast_fcf_using_growth does.
+
+    Args:
+        last_dates (pd.Series): Last reported date per series.
+        periods (int): Number of periods to forecast.
+        freq (str): Frequency string compatible with pandas date_range.
 
-    # Shift start date by 1 period to avoid duplicating last_date
-    forecast_dates = pd.date_range(start=last_date + pd.tseries.frequencies.to_offset(freq),
-                                   periods=periods,
-                                   freq=freq)
+    Returns:
+        np.ndarray: datetime64 array of shape (len(last_dates), periods).
+    """
+    # Future dates only depend on the last date, which most series share
+    offset = pd.tseries.frequencies.to_offset(freq)
+    unique_last = pd.Index(pd.unique(last_dates))
+    future_by_last = np.stack([
+        pd.date_range(start=d + offset, periods=periods, freq=freq).values for d in unique_last
+    ])
+    return future_by_last[unique_last.get_indexer(last_dates)]
 
-    forecast_fcfs = []
-    current_fcf = last_fcf
-    for _ in range(periods):
-        current_fcf = current_fcf * (1 + avg_growth)
-        forecast_fcfs.append(current_fcf)
+
+def _growth_rates(panel: pd.DataFrame) -> pd.Series:
+    """
+    Period-over-period FCF growth of every row in a panel sorted by ticker and date.
+
+    NaN where the current or previous FCF is missing (no padding over gaps) or the previous FCF is zero.
+    """
+    growth = panel["fcff"] / panel.groupby("ticker", sort=True)["fcff"].shift(1) - 1
+    return growth.replace([np.inf, -np.inf], np.nan)
+
+
+def fcf_growth_panel(panel: pd.DataFrame, estimator: str = "mean") -> pd.Series:
+    """
+    Calculates the annual growth rate of FCF for many tickers at once.
+
+    Args:
+        panel (pd.DataFrame): Long DataFrame with columns 'ticker', 'date' and 'fcff'.
+        estimator (str): How to summarise growth per ticker:
+            "mean" - average period-over-period growth, as fcf_growth.
+            "median" - median period-over-period growth, robust to one-off jumps.
+            "cagr" - compound annual growth between the first and last available FCF, over the
+                     years between their dates, so gaps in the series do not inflate it.
+
+    Returns:
+        pd.Series: Growth rate per ticker as a decimal, indexed by ticker.
+    """
+    if estimator not in GROWTH_ESTIMATORS:
+        raise ValueError(f"Invalid estimator '{estimator}'. Choose from {', '.join(GROWTH_ESTIMATORS)}.")
+
+    panel = panel.sort_values(["ticker", "date"])
+
+    if estimator == "cagr":
+        tickers = pd.Index(panel["ticker"].unique(), name="ticker").sort_values()
+        reported = panel.dropna(subset=["fcff"]).groupby("ticker", sort=True)
+        first = reported.first().reindex(tickers)
+        last = reported.last().reindex(tickers)
+        years = (pd.to_datetime(last["date"]) - pd.to_datetime(first["date"])).dt.days / 365.25
+        ratio = last["fcff"] / first["fcff"]
+        ratio = ratio.where((ratio > 0) & (years > 0))
+        return (ratio ** (1 / years) - 1).rename("fcff")
+
+    growth = _growth_rates(panel)
+    return growth.groupby(panel["ticker"], sort=True).agg(estimator)
+
+
+def forecast_fcf_panel(
+        panel: pd.DataFrame,
+        periods: int = 5,
+        freq: str = 'YE',
+        estimator: str = "mean",
+        confidence: float | None = None,
+        n_samples: int = 5000,
+        seed: int | None = None
+) -> pd.DataFrame:
+    """
+    Forecasts FCF for many tickers in one call using each ticker's historical growth rate.
+
+    All forecast horizons are produced with a single cumulative product over a
+    (tickers x periods) array instead of compounding one company at a time.
+
+    With confidence set, bands are added by resampling each ticker's historical growth rates:
+    every bootstrap path compounds the last FCF with growth rates drawn with replacement.
+
+    Args:
+        panel (pd.DataFrame): Long DataFrame with columns 'ticker', 'date' and 'fcff'.
+        periods (int): Number of periods to forecast.
+        freq (str): Frequency string compatible with pandas date_range (e.g., 'YE', 'QE').
+        estimator (str): Growth estimator, see fcf_growth_panel.
+        confidence (float | None): Band width (e.g. 0.9), or None for point forecasts only.
+        n_samples (int): Number of bootstrap paths per ticker.
+        seed (int | None): Seed for the bootstrap.
+
+    Returns:
+        pd.DataFrame: DataFrame with columns 'ticker', 'date' and 'fcff' including historical + forecast,
+                      plus 'fcff_lower' and 'fcff_upper' on forecast rows when confidence is set.
+    """
+    panel = panel[["ticker", "date", "fcff"]].copy()
+    panel["date"] = pd.to_datetime(panel["date"])
+    panel = panel.sort_values(["ticker", "date"]).reset_index(drop=True)
+
+    growth = fcf_growth_panel(panel, estimator)
+    last_rows = panel.groupby("ticker", sort=True).tail(1).set_index("ticker").loc[growth.index]
+
+    growth_factors = np.repeat((1 + growth.to_numpy())[:, None], periods, axis=1)
+    forecast_fcfs = last_rows["fcff"].to_numpy()[:, None] * np.cumprod(growth_factors, axis=1)
+
+    forecast_dates = future_dates(last_rows["date"], periods, freq)
 
     forecast_df = pd.DataFrame({
-        'date': forecast_dates,
-        'fcff': forecast_fcfs
+        "ticker": np.repeat(growth.index.to_numpy(), periods),
+        "date": forecast_dates.ravel(),
+        "fcff": forecast_fcfs.ravel()
     })
 
-    # Combine historical and forecast data
-    combined_df = pd.concat([df_[['date', 'fcff']], forecast_df], ignore_index=True)
+    if confidence is not None:
+        growth_rates = _growth_rates(panel)
+        valid = growth_rates.notna().to_numpy()
+        codes = pd.Index(growth.index).get_indexer(panel["ticker"])
+        matrix, counts = pad_groups(codes[valid], growth_rates.to_numpy()[valid], len(growth))
+        last_fcfs = last_rows["fcff"].to_numpy()
+
+        def to_paths(rows, sampled):
+            return last_fcfs[rows, None, None] * np.cumprod(1 + sampled, axis=2)
 
-    return combined_df
+        lower, upper = bootstrap_bands(matrix, counts, to_paths, periods, n_samples, confidence, seed)
+        forecast_df["fcff_lower"] = lower.ravel()
+        forecast_df["fcff_upper"] = upper.ravel()
+
+    # Combine historical and forecast data
+    combined_df = pd.concat([panel, forecast_df], ignore_index=True)
+    return combined_df.sort_values(["ticker", "date"], kind="stable").reset_index(drop=True)
 
 
 if __name__ == '__main__':
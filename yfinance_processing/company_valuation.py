@@ -1,9 +1,20 @@
+import time
+import numpy as np
 import pandas as pd
+import wacc as wacc_inputs
 from wacc import calculate_wacc
 from fetch_fcf import fetch_fcf
+from market_cap import market_cap_from_info
+from task_graph import TaskGraph
+from valuation_store import ValuationStore, valuation_input_hash
+from ticker_executor import TickerExecutor, dedupe_tickers
 from fcf_forecast import forecast_fcf_interface
-from discount_fcf import discount_fcfs, calculate_npv_from_discounted
-from terminal_value import calculate_present_terminal_value
+from discount_fcf import discount_fcfs, calculate_npv_from_discounted, calculate_npv_grid
+from terminal_value import calculate_present_terminal_value, calculate_present_terminal_value_grid
+
+# Nodes of add_valuation_nodes hashed, with the FCF history, to recognize unchanged inputs: the WACC
+# parameters and the share count. The equity value is left out, since it moves with the share price.
+HASHED_INPUTS = ("debt_value", "cost_of_equity", "cost_of_debt", "tax_rate", "shares_outstanding")
 
 
 def company_valuation(
@@ -25,47 +36,255 @@ def company_valuation(
     wacc = calculate_wacc(ticker)
     fcf_df = fetch_fcf(ticker)
     df_forecasted = forecast_fcf_interface(fcf_df, method=forecast_method, periods=5, freq="YE")
+    total_value = valuation_from_forecast(df_forecasted, wacc, perpetual_growth_rate)
+    return total_value
+
+
+def valuation_from_forecast(df_forecasted: pd.DataFrame, wacc: float, perpetual_growth_rate: float) -> float:
+    """
+    Calculate the total valuation (NPV + Terminal Value) of an already forecasted FCF DataFrame.
+
+    Args:
+        df_forecasted (pd.DataFrame): DataFrame with 'date' and 'fcff' columns.
+        wacc (float): Weighted Average Cost of Capital as a decimal.
+        perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+
+    Returns:
+        float: Total company valuation (NPV + Terminal Value).
+    """
     df_discounted = discount_fcfs(df_forecasted, wacc)
     npv = calculate_npv_from_discounted(df_discounted)
     present_terminal_value = calculate_present_terminal_value(df_forecasted, wacc, perpetual_growth_rate)
-    total_value = npv + present_terminal_value
-    return total_value
+    return npv + present_terminal_value
+
+
+def add_valuation_nodes(
+        graph: TaskGraph,
+        ticker: str,
+        forecast_method: str = 'growth',
+        perpetual_growth_rate: float = 0.02,
+        fcf_fetcher=fetch_fcf
+) -> str:
+    """
+    Add the steps of company_valuation for one ticker to a task graph.
+
+    Each yfinance download is its own node, so the risk-free rate and market return are shared
+    by every ticker in the graph and a ticker's info and statements are fetched once
+    for all the WACC components and the market cap.
+
+    Args:
+        graph (TaskGraph): Graph to add the nodes to.
+        ticker (str): Stock ticker.
+        forecast_method (str): Forecasting method to use.
+        perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+        fcf_fetcher (callable): Called as fcf_fetcher(ticker=...) and returns the FCF history as
+                                ['date', 'fcff'] (default: fetch_fcf from yfinance; use
+                                sec_processing.fcf_facts.FactsFcfFetcher for local SEC facts).
+
+    Returns:
+        str: Key of the node computing the total company valuation.
+    """
+    rf = graph.add("risk_free_rate", wacc_inputs.get_risk_free_rate)
+    rm = graph.add("market_return", wacc_inputs.get_market_return)
+    info = graph.add(f"info:{ticker}", wacc_inputs.get_info, ticker=ticker)
+    financials = graph.add(f"financials:{ticker}", wacc_inputs.get_financials, ticker=ticker)
+    balance = graph.add(f"balance_sheet:{ticker}", wacc_inputs.get_balance_sheet, ticker=ticker)
+
+    equity = graph.add(f"equity_value:{ticker}", wacc_inputs.market_value_equity_from_info, info)
+    graph.add(f"shares_outstanding:{ticker}", wacc_inputs.shares_outstanding_from_info, info)
+    debt = graph.add(f"debt_value:{ticker}", wacc_inputs.total_debt_from_balance_sheet, balance)
+    cost_of_equity = graph.add(f"cost_of_equity:{ticker}",
+                               lambda info_, rf_, rm_: wacc_inputs.cost_of_equity_from_beta(info_.get('beta'), rf_, rm_),
+                               info, rf, rm)
+    cost_of_debt = graph.add(f"cost_of_debt:{ticker}", wacc_inputs.cost_of_debt_from_statements, financials, balance)
+    tax_rate = graph.add(f"tax_rate:{ticker}", wacc_inputs.tax_rate_from_income_statement, financials)
+    wacc = graph.add(f"wacc:{ticker}", wacc_inputs.wacc_from_components,
+                     equity, debt, cost_of_equity, cost_of_debt, tax_rate)
+
+    fcf = graph.add(f"fcf:{ticker}", fcf_fetcher, ticker=ticker)
+    forecast = graph.add(f"forecast:{ticker}:{forecast_method}", forecast_fcf_interface, fcf,
+                         method=forecast_method, periods=5, freq="YE")
+    graph.add(f"market_cap:{ticker}", market_cap_from_info, info)
+
+    return graph.add(f"valuation:{ticker}:{forecast_method}:{perpetual_growth_rate}", valuation_from_forecast,
+                     forecast, wacc, perpetual_growth_rate=perpetual_growth_rate)
+
+
+def sensitivity_surface(
+        ticker: str,
+        wacc_grid,
+        g_grid,
+        forecast_method: str = 'growth'
+) -> pd.DataFrame:
+    """
+    Calculate intrinsic valuation for a single ticker over a grid of WACC and perpetual growth rates.
+
+    FCF is fetched and forecasted once; the discounting and terminal value are then evaluated
+    for the whole grid at once, so a large grid costs about the same as a single valuation.
+
+    Args:
+        ticker (str): Stock ticker.
+        wacc_grid (array-like): WACC values as decimals.
+        g_grid (array-like): Perpetual growth rates as decimals.
+        forecast_method (str): Forecasting method to use.
+
+    Returns:
+        pd.DataFrame: Total company valuation (NPV + Terminal Value) indexed by 'wacc',
+                      with one column per perpetual growth rate. Pairs where WACC <= g are NaN.
+    """
+    wacc_grid = np.asarray(wacc_grid, dtype=float)
+    g_grid = np.asarray(g_grid, dtype=float)
+
+    fcf_df = fetch_fcf(ticker)
+    df_forecasted = forecast_fcf_interface(fcf_df, method=forecast_method, periods=5, freq="YE")
+
+    npv = calculate_npv_grid(df_forecasted, wacc_grid)
+    present_terminal_value = calculate_present_terminal_value_grid(df_forecasted, wacc_grid, g_grid)
+    total_value = npv[:, None] + present_terminal_value
+
+    return pd.DataFrame(
+        total_value,
+        index=pd.Index(wacc_grid, name="wacc"),
+        columns=pd.Index(g_grid, name="perpetual_growth_rate")
+    )
+
+
+def run_valuations(
+        tickers: list[str],
+        forecast_method: str = 'growth',
+        perpetual_growth_rate: float = 0.02,
+        store: ValuationStore | None = None,
+        extra_targets: tuple[str, ...] = (),
+        executor: TickerExecutor | None = None,
+        fcf_fetcher=fetch_fcf
+) -> tuple[pd.DataFrame, dict, dict]:
+    """
+    Value many tickers through a task graph, reusing stored valuations whose inputs did not change.
+
+    The inputs of every ticker (FCF history, WACC parameters and share count, see HASHED_INPUTS)
+    are fetched first and hashed.
+    Tickers whose hash is already in the store are read from it; only the others are forecasted
+    and valued, and their results are recorded with the run's metadata and timings.
+
+    Args:
+        tickers (list[str]): List of ticker strings.
+        forecast_method (str): Forecasting method to use.
+        perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+        store (ValuationStore | None): Results store, or None to always recompute.
+        extra_targets (tuple[str, ...]): Other nodes of the graph to compute along with the inputs,
+                                         e.g. "market_cap:<ticker>".
+        executor (TickerExecutor | None): Bounds the number of concurrent steps and collects
+                                          per-ticker errors. The graph runs steps in threads, so
+                                          only the 'thread' and 'serial' kinds are accepted.
+        fcf_fetcher (callable): Source of the FCF histories, see add_valuation_nodes.
+
+    Returns:
+        tuple[pd.DataFrame, dict, dict]:
+            DataFrame with columns ['ticker', 'total_value', 'from_store', 'seconds'],
+            and the results and exceptions of the graph nodes, keyed by node key.
+
+    Raises:
+        ValueError: If executor is of the 'process' kind.
+    """
+    executor = executor or TickerExecutor()
+    if executor.kind == "process":
+        raise ValueError("run_valuations runs its steps in threads; use a 'thread' or 'serial' executor.")
+
+    start = time.perf_counter()
+    run_id = store.start_run() if store is not None else None
+    graph = TaskGraph()
+
+    valuation_keys = {
+        ticker: add_valuation_nodes(graph, ticker, forecast_method, perpetual_growth_rate, fcf_fetcher)
+        for ticker in dedupe_tickers(tickers)
+    }
+    input_keys = {
+        ticker: [f"fcf:{ticker}"] + [f"{name}:{ticker}" for name in HASHED_INPUTS]
+        for ticker in valuation_keys
+    }
+    values, errors = graph.run([key for keys in input_keys.values() for key in keys] + list(extra_targets),
+                               max_workers=executor.max_workers)
+
+    rows = {}
+    input_hashes = {}
+    for ticker, keys in input_keys.items():
+        if any(key in errors for key in keys):
+            continue
+        input_hashes[ticker] = valuation_input_hash(
+            values[f"fcf:{ticker}"],
+            {name: values[f"{name}:{ticker}"] for name in HASHED_INPUTS},
+            forecast_method,
+            perpetual_growth_rate
+        )
+        stored = store.get(ticker, input_hashes[ticker]) if store is not None else None
+        if stored is not None:
+            rows[ticker] = {"ticker": ticker, "total_value": stored["total_value"], "from_store": True,
+                            "seconds": 0.0}
+
+    # Only tickers without a stored valuation for their current inputs are forecasted and valued
+    pending = [ticker for ticker in input_hashes if ticker not in rows]
+    values, computed_errors = graph.run([valuation_keys[ticker] for ticker in pending],
+                                        max_workers=executor.max_workers, results=values)
+    errors.update(computed_errors)
+
+    for ticker in pending:
+        key = valuation_keys[ticker]
+        if key in errors:
+            continue
+        seconds = graph.timings.get(key, 0.0) + graph.timings.get(f"forecast:{ticker}:{forecast_method}", 0.0)
+        rows[ticker] = {"ticker": ticker, "total_value": values[key], "from_store": False, "seconds": seconds}
+        if store is not None:
+            store.put(ticker, input_hashes[ticker], forecast_method, perpetual_growth_rate, values[key], seconds,
+                      run_id)
+
+    for ticker, key in valuation_keys.items():
+        if ticker not in rows:
+            failed = [k for k in input_keys[ticker] + [key] if k in errors]
+            executor.record_error(ticker, errors[failed[0]], stage=failed[0].split(":")[0])
+
+    if store is not None:
+        n_from_store = sum(row["from_store"] for row in rows.values())
+        store.finish_run(run_id, time.perf_counter() - start, len(valuation_keys), len(rows) - n_from_store,
+                         n_from_store, len(valuation_keys) - len(rows))
+
+    df = pd.DataFrame([rows[ticker] for ticker in valuation_keys if ticker in rows],
+                      columns=["ticker", "total_value", "from_store", "seconds"])
+    return df, values, errors
 
 
 def main(
         tickers: list[str],
         forecast_method: str = 'growth',
-        perpetual_growth_rate: float = 0.02
+        perpetual_growth_rate: float = 0.02,
+        store: ValuationStore | None = None,
+        executor: TickerExecutor | None = None,
+        fcf_fetcher=fetch_fcf
 ) -> pd.DataFrame:
     """
     Process multiple tickers to calculate valuation metrics.
+    Failed tickers are left out of the result and recorded in executor.errors.
 
     Args:
         tickers (list[str]): List of ticker strings.
         forecast_method (str): Forecasting method to use.
         perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+        store (ValuationStore | None): Results store; tickers whose inputs did not change are read from it.
+        executor (TickerExecutor | None): Concurrency bound and error collector.
+        fcf_fetcher (callable): Source of the FCF histories, see add_valuation_nodes.
 
     Returns:
         pd.DataFrame: DataFrame with columns:
-                      ['ticker', 'total_value']
+                      ['ticker', 'total_value', 'from_store', 'seconds']
     """
-    results = []
-
-    for ticker in tickers:
-        try:
-            total_value = company_valuation(ticker, forecast_method, perpetual_growth_rate)
-            results.append({
-                "ticker": ticker,
-                "total_value": total_value
-            })
-        except Exception as e:
-            print(f"Error processing {ticker}: {e}")
-
-    return pd.DataFrame(results)
+    df, _, _ = run_valuations(tickers, forecast_method, perpetual_growth_rate, store, executor=executor,
+                              fcf_fetcher=fcf_fetcher)
+    return df
 
 
 if __name__ == "__main__":
     from settings import sp500_tickers
 
-    df_valuation = main(sp500_tickers, forecast_method='growth', perpetual_growth_rate=0.02)
+    valuation_store = ValuationStore()
+    df_valuation = main(sp500_tickers, forecast_method='growth', perpetual_growth_rate=0.02, store=valuation_store)
     print(df_valuation)
+    print(valuation_store.runs().head())
@@ -2,28 +2,50 @@ import pandas as pd
 from settings import sp500_tickers
 from fetch_fcf import fetch_fcf
 from fcf_forecast import forecast_fcf_interface
+from prophet_forecast import forecast_fcff_many
+from ticker_executor import TickerExecutor
 
 
-def compare_forecast_methods(tickers: list[str], periods: int = 5, freq: str = "YE") -> pd.DataFrame:
+def compare_forecast_methods(
+        tickers: list[str],
+        periods: int = 5,
+        freq: str = "YE",
+        executor: TickerExecutor | None = None,
+        prophet_executor: TickerExecutor | None = None
+) -> pd.DataFrame:
     """
     For each ticker, forecast FCFF using linear, growth, and prophet methods,
     and return a combined DataFrame for comparison.
+    FCF is fetched concurrently; Prophet fits run in prophet_executor across tickers and are cached on disk.
+    Failed tickers are left out of the result and recorded in executor.errors.
 
     :param tickers: List of ticker symbols.
     :param periods: Number of forecast periods.
     :param freq: Frequency string (e.g. 'Y' for yearly).
+    :param executor: Executor used to fetch FCF and collect errors (default: thread pool).
+    :param prophet_executor: Executor used to fit Prophet, the slowest method (default: a process pool
+                             of executor.max_workers); its errors are added to executor.errors.
     :return: pd.DataFrame with ['ticker', 'date', 'fcff_linear', 'fcff_growth', 'fcff_prophet']
     """
     results = []
+    executor = executor or TickerExecutor()
 
-    for ticker in tickers:
-        try:
-            df = fetch_fcf(ticker)
+    fcf_dfs = executor.map(fetch_fcf, tickers, stage="fetch_fcf")
+
+    # Prophet is by far the slowest method, so fit every ticker in parallel up front
+    prophet_executor = prophet_executor or TickerExecutor("process", max_workers=executor.max_workers)
+    prophet_forecasts = forecast_fcff_many(fcf_dfs, periods=periods, freq=freq, executor=prophet_executor)
+    if prophet_executor is not executor:
+        executor.errors.extend(prophet_executor.errors)
 
+    for ticker, df in fcf_dfs.items():
+        if ticker not in prophet_forecasts:
+            continue
+        try:
             # Forecast using each method
             df_linear = forecast_fcf_interface(df, method="linear", periods=periods, freq=freq)
             df_growth = forecast_fcf_interface(df, method="growth", periods=periods, freq=freq)
-            df_prophet = forecast_fcf_interface(df, method="prophet", periods=periods, freq=freq)
+            df_prophet = prophet_forecasts[ticker]
 
             # Rename fcff columns to reflect approach
             df_linear = df_linear.rename(columns={'fcff': 'fcff_linear'})
@@ -43,7 +65,7 @@ def compare_forecast_methods(tickers: list[str], periods: int = 5, freq: str = "
             results.append(df_merged)
 
         except Exception as e:
-            print(f"Error processing {ticker}: {e}")
+            executor.record_error(ticker, e, stage="forecast")
 
     # Combine all tickers into a single DataFrame
     combined_df = pd.concat(results, ignore_index=True)
@@ -1,54 +1,79 @@
 import pandas as pd
-from company_valuation import company_valuation
-from market_cap import get_market_cap
+from fetch_fcf import fetch_fcf
+from company_valuation import run_valuations
+from valuation_store import ValuationStore
+from ticker_executor import TickerExecutor, dedupe_tickers
 from settings import sp500_tickers
 
 
 def compare_valuations(
         tickers: list[str],
         forecast_method: str = 'growth',
-        perpetual_growth_rate: float = 0.02
+        perpetual_growth_rate: float = 0.02,
+        store: ValuationStore | None = None,
+        executor: TickerExecutor | None = None,
+        fcf_fetcher=fetch_fcf
 ) -> pd.DataFrame:
     """
     Compare intrinsic valuation vs market cap for a list of tickers.
+    Failed tickers are left out of the result and recorded in executor.errors.
+
+    Only the FCF histories come from fcf_fetcher. The WACC components (beta, debt, interest
+    expense, tax rate, risk-free rate, market return) and the market cap are still downloaded
+    from yfinance, also when the FCF is read from local SEC facts.
 
     Args:
         tickers (list[str]): List of ticker strings.
         forecast_method (str): Forecasting method to use.
         perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+        store (ValuationStore | None): Results store; tickers whose inputs did not change are read from it.
+        executor (TickerExecutor | None): Concurrency bound and error collector.
+        fcf_fetcher (callable): Source of the FCF histories, see add_valuation_nodes
+                                (e.g. sec_processing.fcf_facts.FactsFcfFetcher for local SEC facts).
 
     Returns:
         pd.DataFrame: DataFrame with columns:
             ['ticker', 'company_value', 'company_market_cap', 'valuation_status', 'percent_diff']
     """
     results = []
+    executor = executor or TickerExecutor()
+
+    # Every step runs once per run: shared inputs such as the market return are computed a single time
+    market_cap_keys = tuple(f"market_cap:{ticker}" for ticker in dedupe_tickers(tickers))
+    df_values, values, errors = run_valuations(tickers, forecast_method, perpetual_growth_rate, store,
+                                               extra_targets=market_cap_keys, executor=executor,
+                                               fcf_fetcher=fcf_fetcher)
+
+    for ticker, company_value in zip(df_values["ticker"], df_values["total_value"]):
+        market_cap_key = f"market_cap:{ticker}"
+        if market_cap_key in errors:
+            executor.record_error(ticker, errors[market_cap_key], stage="market_cap")
+            continue
+
+        company_market_cap = values[market_cap_key]
+        if company_market_cap is None:
+            executor.record_error(ticker, ValueError("Market cap not available"), stage="market_cap")
+            continue
+
+        if company_market_cap > company_value:
+            valuation_status = "Overrated"
+            percent_diff = ((company_market_cap - company_value) / company_value) * 100
+        else:
+            valuation_status = "Underrated"
+            percent_diff = ((company_value - company_market_cap) / company_value) * 100
 
-    for ticker in tickers:
-        try:
-            company_value = company_valuation(ticker, forecast_method, perpetual_growth_rate)
-            company_market_cap = get_market_cap(ticker)
-
-            if company_market_cap > company_value:
-                valuation_status = "Overrated"
-                percent_diff = ((company_market_cap - company_value) / company_value) * 100
-            else:
-                valuation_status = "Underrated"
-                percent_diff = ((company_value - company_market_cap) / company_value) * 100
-
-            results.append({
-                "ticker": ticker,
-                "company_value": company_value,
-                "company_market_cap": company_market_cap,
-                "valuation_status": valuation_status,
-                "percent_diff": percent_diff
-            })
-
-        except Exception as e:
-            print(f"Error processing {ticker}: {e}")
+        results.append({
+            "ticker": ticker,
+            "company_value": company_value,
+            "company_market_cap": company_market_cap,
+            "valuation_status": valuation_status,
+            "percent_diff": percent_diff
+        })
 
     return pd.DataFrame(results)
 
 
 if __name__ == "__main__":
-    df_comparison = compare_valuations(sp500_tickers, forecast_method='growth', perpetual_growth_rate=0.02)
+    df_comparison = compare_valuations(sp500_tickers, forecast_method='growth', perpetual_growth_rate=0.02,
+                                       store=ValuationStore())
     print(df_comparison)
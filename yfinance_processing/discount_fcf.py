@@ -1,5 +1,20 @@
+import numpy as np
 import pandas as pd
 
+
+def discount_periods(df_forecasted: pd.DataFrame) -> pd.Series:
+    """
+    Returns the discounting period t of each row, counted in years from the first date.
+
+    Args:
+        df_forecasted (pd.DataFrame): DataFrame with a datetime 'date' column.
+
+    Returns:
+        pd.Series: Period t for each row, starting at 1.
+    """
+    return (df_forecasted['date'].dt.year - df_forecasted['date'].dt.year.min()) + 1
+
+
 def discount_fcfs(df_forecasted: pd.DataFrame, wacc: float) -> pd.DataFrame:
     """
     Discounts forecasted FCFFs using the provided WACC.
@@ -15,7 +30,7 @@ def discount_fcfs(df_forecasted: pd.DataFrame, wacc: float) -> pd.DataFrame:
     df = df.sort_values("date").reset_index(drop=True)
 
     # Calculate t = year difference from the first date
-    df['t'] = (df['date'].dt.year - df['date'].dt.year.min()) + 1
+    df['t'] = discount_periods(df)
 
     # Calculate discounted FCF
     df['discounted_fcf'] = df['fcff'] / ((1 + wacc) ** df['t'])
@@ -38,3 +53,26 @@ def calculate_npv_from_discounted(df: pd.DataFrame) -> float:
     npv = df['discounted_fcf'].sum()
     return npv
 
+
+def calculate_npv_grid(df_forecasted: pd.DataFrame, waccs) -> np.ndarray:
+    """
+    Calculates the NPV of the forecasted FCFFs for many WACC values at once.
+
+    Equivalent to calling discount_fcfs and calculate_npv_from_discounted once per WACC,
+    but the discount factors for every WACC are computed in a single broadcast.
+
+    Args:
+        df_forecasted (pd.DataFrame): DataFrame with 'date' and 'fcff' columns.
+        waccs (array-like): WACC values as decimals.
+
+    Returns:
+        np.ndarray: NPV for each WACC, with the same length as waccs.
+    """
+    df = df_forecasted.sort_values("date")
+    t = discount_periods(df).to_numpy(dtype=float)
+    fcff = df['fcff'].to_numpy(dtype=float)
+    waccs = np.asarray(waccs, dtype=float)
+
+    # (n_wacc, n_periods) discount factors, summed over periods
+    discount_factors = (1 + waccs[:, None]) ** -t[None, :]
+    return discount_factors @ fcff
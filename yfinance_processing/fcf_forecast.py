@@ -1,30 +1,64 @@
 # this function will accept a df and return the forecast based on the forecasting approach
 
 import pandas as pd
-from prophet_forecast import forecast_fcff
-from company_growth import forecast_fcf_using_growth
-from linear_forecast import linear_forecast_fcff
+from company_growth import forecast_fcf_panel
+from linear_forecast import linear_forecast_fcff, linear_forecast_panel
+from holt_forecast import holt_forecast_panel
 
+FORECAST_METHODS = ("growth", "linear", "linear_batch", "holt", "prophet")
+# Methods that can return bootstrap confidence bands
+INTERVAL_METHODS = ("growth", "linear", "linear_batch")
 
-def forecast_fcf_interface(df: pd.DataFrame, method: str = "growth", periods: int = 5, freq: str = "Y") -> pd.DataFrame:
+
+def _forecast_panel(panel_forecast, df: pd.DataFrame, *args, **kwargs) -> pd.DataFrame:
+    """Runs a panel forecaster on a long ['ticker', 'date', 'fcff'] DataFrame or on a single series."""
+    if 'ticker' in df.columns:
+        return panel_forecast(df, *args, **kwargs)
+    return panel_forecast(df.assign(ticker=""), *args, **kwargs).drop(columns='ticker')
+
+
+def forecast_fcf_interface(
+        df: pd.DataFrame,
+        method: str = "growth",
+        periods: int = 5,
+        freq: str = "Y",
+        confidence: float | None = None,
+        n_samples: int = 5000
+) -> pd.DataFrame:
     """
     Forecasts Free Cash Flow using the specified method.
 
-    :param df: DataFrame with columns ['date', 'fcf']
-    :param method: Forecasting method. Options: "growth", "linear", "prophet"
+    :param df: DataFrame with columns ['date', 'fcf']. The "growth", "linear_batch" and "holt" methods, and
+               any method with confidence set, also accept a long DataFrame with columns ['ticker', 'date', 'fcff']
+               and forecast every ticker at once.
+    :param method: Forecasting method. Options: "growth", "linear", "linear_batch", "holt", "prophet"
     :param periods: Number of future periods to forecast
     :param freq: Frequency of future periods. Default is yearly ('Y')
+    :param confidence: Band width (e.g. 0.9) for bootstrap confidence bands, only for "growth", "linear"
+                       and "linear_batch". Bands are returned as 'fcff_lower' and 'fcff_upper' columns.
+    :param n_samples: Number of bootstrap paths per series when confidence is set
     :return: DataFrame with columns ['date', 'fcf'] including forecasted values
     """
+    if confidence is not None and method not in INTERVAL_METHODS:
+        raise ValueError(f"Confidence bands are only available for {', '.join(map(repr, INTERVAL_METHODS))}.")
 
     if method == "growth":
-        forecast_df = forecast_fcf_using_growth(df, periods, freq)
-    elif method == "linear":
+        # One code path for the point forecast; confidence only adds the band columns
+        forecast_df = _forecast_panel(forecast_fcf_panel, df, periods, freq,
+                                      confidence=confidence, n_samples=n_samples)
+    elif method == "linear" and confidence is None:
         forecast_df = linear_forecast_fcff(df, periods, freq)
+    elif method in ("linear", "linear_batch"):
+        forecast_df = _forecast_panel(linear_forecast_panel, df, periods, freq,
+                                      confidence=confidence, n_samples=n_samples)
+    elif method == "holt":
+        forecast_df = _forecast_panel(holt_forecast_panel, df, periods, freq)
     elif method == "prophet":
+        # Prophet pulls in cmdstanpy, so only import it when it is actually requested
+        from prophet_forecast import forecast_fcff
         forecast_df = forecast_fcff(df, periods, freq)
     else:
-        raise ValueError(f"Invalid method '{method}'. Choose from 'growth', 'linear', 'prophet'.")
+        raise ValueError(f"Invalid method '{method}'. Choose from {', '.join(map(repr, FORECAST_METHODS))}.")
 
     return forecast_df
 
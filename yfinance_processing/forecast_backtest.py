@@ -0,0 +1,182 @@
+import os
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from fetch_fcf import fetch_fcf
+from fcf_forecast import forecast_fcf_interface, FORECAST_METHODS
+from ticker_executor import TickerExecutor
+
+
+def _fit_forecast(train: pd.DataFrame, method: str, periods: int, freq: str) -> pd.DataFrame:
+    """Forecasts with one method, fitting Prophet without its disk cache so every fit is timed for real."""
+    if method == "prophet":
+        from prophet_forecast import forecast_fcff
+        return forecast_fcff(train, periods, freq, cache_dir=None)
+    return forecast_fcf_interface(train, method=method, periods=periods, freq=freq)
+
+
+def walk_forward(
+        df: pd.DataFrame,
+        method: str,
+        periods: int = 5,
+        freq: str = "YE",
+        min_train: int = 3
+) -> list[dict]:
+    """
+    Runs one forecasting method walk-forward over a single FCF history.
+
+    For every cutoff the method is fit on the observations up to the cutoff and its forecasts
+    are matched, step by step, with the observations that followed. The method is fit once on
+    the first training window before timing starts, so one-off costs such as lazy imports do not
+    count towards the first fit.
+
+    Args:
+        df (pd.DataFrame): DataFrame with columns 'date' and 'fcff'.
+        method (str): Method name accepted by forecast_fcf_interface.
+        periods (int): Maximum forecast horizon.
+        freq (str): Frequency string compatible with pandas date_range.
+        min_train (int): Number of observations in the first training window.
+
+    Returns:
+        list[dict]: One record per forecasted observation with the actual and forecasted FCFF,
+                    the horizon, and the wall time and peak Python memory of the fit.
+    """
+    df = df.dropna(subset=['fcff']).sort_values('date').reset_index(drop=True)
+    records = []
+
+    if len(df) > min_train:
+        _fit_forecast(df.iloc[:min_train], method, 1, freq)
+
+    for cutoff in range(min_train, len(df)):
+        train = df.iloc[:cutoff]
+        actual = df.iloc[cutoff:cutoff + periods]
+        horizon = len(actual)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        forecast_df = _fit_forecast(train, method, horizon, freq)
+        fit_seconds = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Forecast rows follow the history, so they line up with the actuals by position
+        forecast = forecast_df['fcff'].to_numpy()[-horizon:]
+        for h in range(horizon):
+            records.append({
+                "method": method,
+                "cutoff_date": train['date'].iloc[-1],
+                "horizon": h + 1,
+                "actual": actual['fcff'].iloc[h],
+                "forecast": forecast[h],
+                "fit_seconds": fit_seconds,
+                "peak_memory_bytes": peak_memory
+            })
+
+    return records
+
+
+def _walk_forward_pair(pair: tuple[pd.DataFrame, str], periods: int, freq: str, min_train: int) -> list[dict]:
+    """Runs walk_forward for one (FCF history, method) pair, so pairs can go through a TickerExecutor."""
+    df, method = pair
+    return walk_forward(df, method, periods, freq, min_train)
+
+
+def summarize_backtest(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregates walk-forward records into error and cost metrics per method.
+
+    Args:
+        results (pd.DataFrame): Records as returned by backtest_forecast_methods.
+
+    Returns:
+        pd.DataFrame: One row per method with columns
+            ['method', 'mae', 'rmse', 'mape', 'n_forecasts', 'mean_fit_seconds', 'mean_peak_memory_mb'],
+            sorted by MAE.
+    """
+    df = results.copy()
+    df["error"] = df["forecast"] - df["actual"]
+    df["abs_pct_error"] = (df["error"] / df["actual"]).abs().replace(np.inf, np.nan)
+
+    # Cost is per fit, and every fit produces several horizons
+    fits = df.drop_duplicates(subset=["ticker", "method", "cutoff_date"])
+    cost = fits.groupby("method").agg(
+        mean_fit_seconds=("fit_seconds", "mean"),
+        mean_peak_memory_mb=("peak_memory_bytes", lambda x: x.mean() / 1_000_000)
+    )
+
+    accuracy = df.groupby("method").agg(
+        mae=("error", lambda x: x.abs().mean()),
+        rmse=("error", lambda x: np.sqrt((x ** 2).mean())),
+        mape=("abs_pct_error", "mean"),
+        n_forecasts=("error", "size")
+    )
+
+    summary = accuracy.join(cost).reset_index()
+    return summary.sort_values("mae").reset_index(drop=True)
+
+
+def backtest_forecast_methods(
+        tickers: list[str],
+        methods: tuple[str, ...] = FORECAST_METHODS,
+        periods: int = 5,
+        freq: str = "YE",
+        min_train: int = 3,
+        max_workers: int | None = None,
+        executor: TickerExecutor | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Backtests forecasting methods walk-forward over the FCF history of every ticker.
+    Every (ticker, method) pair is one task of executor, in worker processes by default, so a
+    slow method such as Prophet does not hold back the other methods.
+
+    Prophet is fit without its disk cache, so its timings measure fits on every run.
+
+    Failed (ticker, method) pairs are left out of the records and recorded in executor.errors,
+    with the stage 'walk_forward:<method>'; failed FCF fetches with the stage 'fetch_fcf'.
+
+    Args:
+        tickers (list[str]): List of ticker strings.
+        methods (tuple[str, ...]): Methods accepted by forecast_fcf_interface.
+        periods (int): Maximum forecast horizon.
+        freq (str): Frequency string compatible with pandas date_range.
+        min_train (int): Number of observations in the first training window.
+        max_workers (int | None): Maximum number of worker processes of the default executor
+                                  (default: number of CPUs).
+        executor (TickerExecutor | None): Executor to backtest with and error collector
+                                          (default: a process pool of max_workers).
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Per-forecast records and the per-method summary
+                                           from summarize_backtest.
+    """
+    executor = executor or TickerExecutor("process", max_workers=max_workers or os.cpu_count())
+
+    fetch_executor = TickerExecutor(max_workers=executor.max_workers)
+    fcf_dfs = fetch_executor.map(fetch_fcf, tickers, stage="fetch_fcf")
+    executor.errors.extend(fetch_executor.errors)
+
+    pairs = {(ticker, method): (df, method) for method in methods for ticker, df in fcf_dfs.items()}
+    first_error = len(executor.errors)
+    records = []
+    for (ticker, method), pair_records in executor.imap(_walk_forward_pair, pairs, periods, freq, min_train):
+        for record in pair_records:
+            record["ticker"] = ticker
+        records.extend(pair_records)
+
+    # Errors are recorded under the (ticker, method) key of their pair
+    for error in executor.errors[first_error:]:
+        ticker, method = error["ticker"]
+        error.update(ticker=ticker, stage=f"walk_forward:{method}")
+
+    columns = ["ticker", "method", "cutoff_date", "horizon", "actual", "forecast",
+               "fit_seconds", "peak_memory_bytes"]
+    results = pd.DataFrame(records, columns=columns)
+    return results, summarize_backtest(results)
+
+
+if __name__ == "__main__":
+    from settings import sp500_tickers
+
+    df_results, df_summary = backtest_forecast_methods(sp500_tickers, periods=2, freq="YE", min_train=2)
+    print(df_summary)
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+from company_growth import future_dates
+
+# Parameter grid searched for every series: level smoothing, trend smoothing and trend damping
+ALPHA_GRID = np.linspace(0.05, 0.95, 10)
+BETA_GRID = np.linspace(0.05, 0.95, 10)
+PHI_GRID = np.array([0.8, 0.85, 0.9, 0.95, 0.98, 1.0])
+
+
+def _parameter_grid() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the flattened (alpha, beta, phi) combinations, each of shape (n_params,)."""
+    alpha, beta, phi = np.meshgrid(ALPHA_GRID, BETA_GRID, PHI_GRID, indexing="ij")
+    return alpha.ravel(), beta.ravel(), phi.ravel()
+
+
+def fit_damped_holt(y: np.ndarray) -> dict:
+    """
+    Fits Holt's damped-trend exponential smoothing to many series at once.
+
+    Every series is run through the recursions for every parameter combination in a single
+    (series x parameters) array per time step, and the combination with the lowest sum of squared
+    one-step-ahead errors is kept. The level starts at the first observation and the trend at
+    the first difference.
+
+    Args:
+        y (np.ndarray): Array of shape (n_series, n_periods), left-padded with NaN for shorter series.
+
+    Returns:
+        dict: Arrays of shape (n_series,): 'level', 'trend', 'alpha', 'beta', 'phi' and 'sse'.
+    """
+    y = np.asarray(y, dtype=float)
+    alpha, beta, phi = _parameter_grid()
+    n_series = y.shape[0]
+    shape = (n_series, len(alpha))
+
+    level = np.full(shape, np.nan)
+    trend = np.full(shape, np.nan)
+    sse = np.zeros(shape)
+
+    for t in range(y.shape[1]):
+        y_t = np.broadcast_to(y[:, t][:, None], shape)
+        observed = ~np.isnan(y_t)
+        has_level = ~np.isnan(level)
+        has_trend = ~np.isnan(trend)
+
+        # Regular update for series with both level and trend initialised
+        update = observed & has_trend
+        forecast = level + phi * trend
+        error = np.where(update, y_t - forecast, 0.0)
+        sse += error ** 2
+        new_level = alpha * y_t + (1 - alpha) * forecast
+        new_trend = beta * (new_level - level) + (1 - beta) * phi * trend
+
+        # Second observation initialises the trend, first observation the level
+        init_trend = observed & has_level & ~has_trend
+        init_level = observed & ~has_level
+
+        trend = np.where(update, new_trend, np.where(init_trend, y_t - level, trend))
+        level = np.where(update, new_level, np.where(init_trend | init_level, y_t, level))
+
+    # Series with a single observation have no trend; forecast them flat
+    trend = np.nan_to_num(trend, nan=0.0)
+
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(n_series)
+    return {
+        "level": level[rows, best],
+        "trend": trend[rows, best],
+        "alpha": alpha[best],
+        "beta": beta[best],
+        "phi": phi[best],
+        "sse": sse[rows, best]
+    }
+
+
+def predict_damped_holt(params: dict, periods: int) -> np.ndarray:
+    """
+    Forecasts every series from fitted damped-Holt parameters.
+
+    Args:
+        params (dict): Parameters as returned by fit_damped_holt.
+        periods (int): Number of future periods to forecast.
+
+    Returns:
+        np.ndarray: Forecasts of shape (n_series, periods).
+    """
+    steps = np.arange(1, periods + 1)
+    # Damped trend: h-step forecast adds phi + phi^2 + ... + phi^h times the trend
+    damping = np.cumsum(params["phi"][:, None] ** steps[None, :], axis=1)
+    return params["level"][:, None] + damping * params["trend"][:, None]
+
+
+def holt_forecast_panel(panel: pd.DataFrame, periods: int = 5, freq: str = "YE") -> pd.DataFrame:
+    """
+    Forecasts FCFF for many tickers at once with damped-trend exponential smoothing.
+
+    Args:
+        panel (pd.DataFrame): Long DataFrame with columns 'ticker', 'date' and 'fcff'.
+        periods (int): Number of future periods to forecast.
+        freq (str): Frequency string compatible with pandas date_range (e.g., 'YE', 'QE').
+
+    Returns:
+        pd.DataFrame: DataFrame with columns 'ticker', 'date' and 'fcff' including historical + forecast.
+    """
+    panel = panel[["ticker", "date", "fcff"]].dropna(subset=["fcff"]).copy()
+    panel["date"] = pd.to_datetime(panel["date"])
+    panel = panel.sort_values(["ticker", "date"]).reset_index(drop=True)
+
+    # Right-align every series in a NaN-padded (tickers x periods) array
+    codes, tickers = pd.factorize(panel["ticker"], sort=True)
+    counts = np.bincount(codes, minlength=len(tickers))
+    position = panel.groupby(codes).cumcount().to_numpy() + (counts.max() - counts)[codes]
+    y = np.full((len(tickers), counts.max()), np.nan)
+    y[codes, position] = panel["fcff"].to_numpy(dtype=float)
+
+    fcff_forecast = predict_damped_holt(fit_damped_holt(y), periods)
+    forecast_dates = future_dates(panel.groupby(codes)["date"].max(), periods, freq)
+
+    forecast_df = pd.DataFrame({
+        "ticker": np.repeat(tickers, periods),
+        "date": forecast_dates.ravel(),
+        "fcff": fcff_forecast.ravel()
+    })
+
+    # Combine historical and forecast data
+    combined_df = pd.concat([panel, forecast_df], ignore_index=True)
+    return combined_df.sort_values(["ticker", "date"], kind="stable").reset_index(drop=True)
+
+
+def holt_forecast_fcff(df: pd.DataFrame, periods: int = 5, freq: str = "YE") -> pd.DataFrame:
+    """
+    Forecasts FCFF for a single company with damped-trend exponential smoothing.
+
+    Args:
+        df (pd.DataFrame): DataFrame with columns 'date' and 'fcff'.
+        periods (int): Number of future periods to forecast.
+        freq (str): Frequency string compatible with pandas date_range.
+
+    Returns:
+        pd.DataFrame: DataFrame with columns 'date' and 'fcff' including historical + forecast.
+    """
+    return holt_forecast_panel(df.assign(ticker=""), periods, freq).drop(columns="ticker")
+
+
+if __name__ == "__main__":
+    from fetch_fcf import fetch_fcf
+
+    df = fetch_fcf("MSFT", period="annual")
+    print(holt_forecast_fcff(df, periods=5, freq="YE"))
@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
+from bootstrap import pad_groups, bootstrap_bands
+
+# Ordinal (as in pd.Timestamp.toordinal) of the Unix epoch, to convert datetime64 days to ordinals
+EPOCH_ORDINAL = 719163
 
 
 def linear_forecast_fcff(fcff_df: pd.DataFrame, periods: int, freq: str = "Q"):
@@ -16,6 +18,8 @@ def linear_forecast_fcff(fcff_df: pd.DataFrame, periods: int, freq: str = "Q"):
     Returns:
         pd.DataFrame: DataFrame with columns 'date' and 'fcff_forecast' including historical data + forecast.
     """
+    from sklearn.linear_model import LinearRegression
+
     # Make a copy to avoid mutating original df
     fcff_df = fcff_df.copy()
 
@@ -59,9 +63,105 @@ def linear_forecast_fcff(fcff_df: pd.DataFrame, periods: int, freq: str = "Q"):
     return result_df
 
 
+def to_ordinal(dates) -> np.ndarray:
+    """
+    Converts dates to proleptic Gregorian ordinals without a Python-level map.
+
+    Args:
+        dates: Datetime-like Series, Index or array.
+
+    Returns:
+        np.ndarray: Ordinals, equal to pd.Timestamp.toordinal of each date.
+    """
+    days = np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+    return days + EPOCH_ORDINAL
+
+
+def linear_forecast_panel(
+        panel: pd.DataFrame,
+        periods: int,
+        freq: str = "YE",
+        confidence: float | None = None,
+        n_samples: int = 5000,
+        seed: int | None = None
+) -> pd.DataFrame:
+    """
+    Performs a simple linear projection of FCFF for many tickers at once.
+
+    Every ticker gets its own least-squares line of fcff against the date ordinal, the same
+    model as linear_forecast_fcff, but all lines are solved together from grouped sums
+    in NumPy instead of one scikit-learn fit per ticker.
+
+    With confidence set, bands are added by resampling each ticker's residuals around its line
+    and adding them to the point forecast of every horizon.
+
+    Args:
+        panel (pd.DataFrame): Long DataFrame with columns 'ticker', 'date' and 'fcff'.
+        periods (int): Number of future periods to forecast.
+        freq (str): Frequency of the forecast (e.g. 'QE' for quarterly, 'YE' for annual).
+        confidence (float | None): Band width (e.g. 0.9), or None for point forecasts only.
+        n_samples (int): Number of bootstrap paths per ticker.
+        seed (int | None): Seed for the bootstrap.
+
+    Returns:
+        pd.DataFrame: DataFrame with columns 'ticker', 'date' and 'fcff' including historical data + forecast,
+                      plus 'fcff_lower' and 'fcff_upper' on forecast rows when confidence is set.
+    """
+    panel = panel[['ticker', 'date', 'fcff']].dropna(subset=['fcff']).copy()
+    panel['date'] = pd.to_datetime(panel['date'])
+    panel = panel.sort_values(['ticker', 'date']).reset_index(drop=True)
+
+    codes, tickers = pd.factorize(panel['ticker'], sort=True)
+    n_tickers = len(tickers)
+
+    # Closed-form least squares per ticker, with x centred per group for numerical stability
+    x = to_ordinal(panel['date']).astype(float)
+    y = panel['fcff'].to_numpy(dtype=float)
+    counts = np.bincount(codes, minlength=n_tickers)
+    x_mean = np.bincount(codes, weights=x, minlength=n_tickers) / counts
+    y_mean = np.bincount(codes, weights=y, minlength=n_tickers) / counts
+    dx = x - x_mean[codes]
+    sxx = np.bincount(codes, weights=dx * dx, minlength=n_tickers)
+    sxy = np.bincount(codes, weights=dx * (y - y_mean[codes]), minlength=n_tickers)
+    # A single observation gives a flat line through it
+    slope = np.divide(sxy, sxx, out=np.zeros(n_tickers), where=sxx > 0)
+
+    # Future dates only depend on the last date, which most tickers share
+    last_dates = panel.groupby(codes)['date'].max()
+    unique_last = pd.Index(last_dates.unique())
+    future_by_last = np.stack([
+        pd.date_range(start=d, periods=periods + 1, freq=freq)[1:].values for d in unique_last
+    ])
+    future_dates = future_by_last[unique_last.get_indexer(last_dates)]
+
+    fcff_forecast = y_mean[:, None] + slope[:, None] * (to_ordinal(future_dates) - x_mean[:, None])
+
+    forecast_df = pd.DataFrame({
+        'ticker': np.repeat(tickers, periods),
+        'date': future_dates.ravel(),
+        'fcff': fcff_forecast.ravel()
+    })
+
+    if confidence is not None:
+        residuals = y - (y_mean[codes] + slope[codes] * dx)
+        matrix, counts = pad_groups(codes, residuals, n_tickers)
+
+        def to_paths(rows, sampled):
+            return fcff_forecast[rows, None, :] + sampled
+
+        lower, upper = bootstrap_bands(matrix, counts, to_paths, periods, n_samples, confidence, seed)
+        forecast_df['fcff_lower'] = lower.ravel()
+        forecast_df['fcff_upper'] = upper.ravel()
+
+    # Combine historical + forecast
+    result_df = pd.concat([panel, forecast_df], ignore_index=True)
+    return result_df.sort_values(['ticker', 'date'], kind="stable").reset_index(drop=True)
+
+
 if __name__ == '__main__':
     # Example usage:
     # fcff_df = pd.DataFrame({'date': [...], 'fcff': [...]})
+    import matplotlib.pyplot as plt
     from fetch_fcf import fetch_fcf
 
     df = fetch_fcf(ticker='AAPL')
@@ -12,11 +12,25 @@ def get_market_cap(ticker: str) -> float:
     """
     stock = yf.Ticker(ticker)
     info = stock.info
-    market_cap = info.get("marketCap", None)
+    market_cap = market_cap_from_info(info)
     return market_cap
 
+
+def market_cap_from_info(info: dict) -> float:
+    """
+    Reads the market capitalization from an already fetched yfinance info dict.
+
+    Args:
+        info (dict): yfinance Ticker.info.
+
+    Returns:
+        float: Market capitalization in dollars.
+    """
+    return info.get("marketCap", None)
+
 if __name__ == "__main__":
     from settings import sp500_tickers
-    for ticker in sp500_tickers:
-        market_cap = get_market_cap(ticker)
+    from ticker_executor import TickerExecutor
+
+    for ticker, market_cap in TickerExecutor().imap(get_market_cap, sp500_tickers, stage="market_cap"):
         print(f'{ticker} s market_cap: {market_cap}')
\ No newline at end of file
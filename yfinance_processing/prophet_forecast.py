@@ -1,23 +1,141 @@
+import os
+import pickle
+import hashlib
+import numpy as np
 import pandas as pd
-from prophet import Prophet
+from ticker_executor import TickerExecutor
 
-def forecast_fcff(df: pd.DataFrame, periods: int = 5, freq: str = "Y") -> pd.DataFrame:
+# Fitted models and forecasts are cached here, keyed by a hash of their inputs
+CACHE_DIR = "prophet_cache"
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Renames and casts a ['date', 'fcff'] DataFrame into the ['ds', 'y'] shape Prophet expects."""
+    df_prophet = df.rename(columns={"date": "ds", "fcff": "y"})
+    df_prophet['ds'] = pd.to_datetime(df_prophet['ds'])
+    df_prophet['y'] = df_prophet['y'].astype(float)
+    return df_prophet.sort_values('ds').reset_index(drop=True)
+
+
+def _model_key(df_prophet: pd.DataFrame) -> str:
+    """Hash of the training series; Prophet is always fit with its default parameters."""
+    h = hashlib.sha256(b"prophet-default")
+    h.update(pd.util.hash_pandas_object(df_prophet[['ds', 'y']], index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def _forecast_key(df_prophet: pd.DataFrame, periods: int, freq: str) -> str:
+    """Hash of the training series and the forecast horizon."""
+    return hashlib.sha256(f"{_model_key(df_prophet)}|{periods}|{freq}".encode()).hexdigest()
+
+
+def _atomic_write(path: str, data: bytes):
+    """Writes to a temporary file first so concurrent readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def warm_start_params(m) -> dict:
+    """
+    Extracts the fitted parameters of a Prophet model to initialise the next fit.
+
+    :param m: fitted Prophet model
+    :return: dict of Stan initial values
+    """
+    res = {}
+    for pname in ['k', 'm', 'sigma_obs']:
+        if m.mcmc_samples == 0:
+            res[pname] = m.params[pname][0][0]
+        else:
+            res[pname] = np.mean(m.params[pname])
+    for pname in ['delta', 'beta']:
+        if m.mcmc_samples == 0:
+            res[pname] = m.params[pname][0]
+        else:
+            res[pname] = np.mean(m.params[pname], axis=0)
+    return res
+
+
+def load_cached_forecast(df: pd.DataFrame, periods: int = 5, freq: str = "Y", cache_dir: str = CACHE_DIR):
+    """
+    Returns the cached forecast for this series and horizon, or None if it was never computed.
+
+    :param df: pandas DataFrame with columns ['date', 'fcff']
+    :param periods: number of future periods to forecast
+    :param freq: frequency for future periods
+    :param cache_dir: cache directory
+    :return: forecast DataFrame with columns ['date', 'fcff'] or None
+    """
+    path = os.path.join(cache_dir, f"{_forecast_key(_prepare(df), periods, freq)}.pkl")
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _fit(df_prophet: pd.DataFrame, cache_dir: str | None):
+    """
+    Returns a fitted model for the series, loading it from the cache when possible.
+    A series that extends a cached one by a single observation is warm-started from that model.
+    """
+    # Prophet pulls in cmdstanpy; import it only when a model actually has to be fit or loaded
+    from prophet import Prophet
+    from prophet.serialize import model_to_json, model_from_json
+
+    if cache_dir is None:
+        m = Prophet()
+        m.fit(df_prophet)
+        return m
+
+    model_path = os.path.join(cache_dir, f"{_model_key(df_prophet)}.json")
+    if os.path.exists(model_path):
+        with open(model_path, "r") as f:
+            return model_from_json(f.read())
+
+    init = None
+    previous_path = os.path.join(cache_dir, f"{_model_key(df_prophet.iloc[:-1])}.json")
+    if len(df_prophet) > 1 and os.path.exists(previous_path):
+        with open(previous_path, "r") as f:
+            init = warm_start_params(model_from_json(f.read()))
+
+    m = Prophet()
+    if init is None:
+        m.fit(df_prophet)
+    else:
+        # Prophet falls back to its default init for any parameter whose shape changed,
+        # e.g. when the new observation adds a changepoint
+        m.fit(df_prophet, init=init)
+
+    _atomic_write(model_path, model_to_json(m).encode())
+    return m
+
+
+def forecast_fcff(df: pd.DataFrame, periods: int = 5, freq: str = "Y", cache_dir: str | None = CACHE_DIR) -> pd.DataFrame:
     """
     Forecast future Free Cash Flow to Firm (FCFF) using Facebook Prophet.
 
+    Fitted models and forecasts are cached on disk keyed by a hash of the series and parameters,
+    so a forecast whose inputs have not changed is never refit.
+
     :param df: pandas DataFrame with columns ['date', 'fcff']
     :param periods: number of future periods to forecast
     :param freq: frequency for future periods (e.g., 'Y' for yearly, 'Q' for quarterly)
+    :param cache_dir: cache directory, or None to disable caching
     :return: forecast DataFrame with columns ['date', 'fcff']
     """
     # Prepare data for Prophet
-    df_prophet = df.rename(columns={"date": "ds", "fcff": "y"})
-    df_prophet['ds'] = pd.to_datetime(df_prophet['ds'])
-    df_prophet['y'] = df_prophet['y'].astype(float)
+    df_prophet = _prepare(df)
 
-    # Initialize and fit Prophet model
-    m = Prophet()
-    m.fit(df_prophet)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        cached = load_cached_forecast(df, periods, freq, cache_dir)
+        if cached is not None:
+            return cached
+
+    # Fit (or load) the Prophet model
+    m = _fit(df_prophet, cache_dir)
 
     # Make future dataframe
     future = m.make_future_dataframe(periods=periods, freq=freq)
@@ -28,8 +146,51 @@ def forecast_fcff(df: pd.DataFrame, periods: int = 5, freq: str = "Y") -> pd.Dat
     # Return with original naming convention
     forecast_df = forecast[['ds', 'yhat']].rename(columns={'ds': 'date', 'yhat': 'fcff'})
 
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"{_forecast_key(df_prophet, periods, freq)}.pkl")
+        _atomic_write(path, pickle.dumps(forecast_df))
+
     return forecast_df
 
+
+def forecast_fcff_many(
+        dfs: dict[str, pd.DataFrame],
+        periods: int = 5,
+        freq: str = "Y",
+        max_workers: int | None = None,
+        cache_dir: str | None = CACHE_DIR,
+        executor: TickerExecutor | None = None
+) -> dict[str, pd.DataFrame]:
+    """
+    Forecast FCFF with Prophet for many tickers, fitting in a process pool.
+    Forecasts already in the cache are returned directly without being submitted to the pool.
+
+    :param dfs: dict mapping ticker to a DataFrame with columns ['date', 'fcff']
+    :param periods: number of future periods to forecast
+    :param freq: frequency for future periods
+    :param max_workers: maximum number of worker processes (default: number of CPUs)
+    :param cache_dir: cache directory, or None to disable caching
+    :param executor: executor to fit with (default: a process pool of max_workers); failed tickers
+                     are left out of the result and recorded in executor.errors
+    :return: dict mapping ticker to forecast DataFrame with columns ['date', 'fcff']
+    """
+    executor = executor or TickerExecutor("process", max_workers=max_workers or os.cpu_count())
+    results = {}
+    pending = {}
+
+    for ticker, df in dfs.items():
+        cached = load_cached_forecast(df, periods, freq, cache_dir) if cache_dir is not None else None
+        if cached is not None:
+            results[ticker] = cached
+        else:
+            pending[ticker] = df
+
+    for ticker, forecast_df in executor.imap(forecast_fcff, pending, periods, freq, cache_dir, stage="prophet"):
+        results[ticker] = forecast_df
+
+    return results
+
+
 if __name__ == "__main__":
     from fetch_fcf import fetch_fcf
 
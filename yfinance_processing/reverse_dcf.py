@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+from wacc import calculate_wacc
+from fetch_fcf import fetch_fcf
+from market_cap import get_market_cap
+from company_growth import fcf_growth
+from discount_fcf import discount_periods
+from ticker_executor import TickerExecutor, dedupe_tickers
+
+
+def _reverse_dcf_row(ticker: str, periods: int, freq: str) -> dict:
+    """Fetches the FCF history, WACC and market cap of one ticker for build_reverse_dcf_inputs."""
+    fcf_df = fetch_fcf(ticker)
+    fcf_df['date'] = pd.to_datetime(fcf_df['date'])
+    fcf_df = fcf_df.sort_values("date").reset_index(drop=True)
+
+    last_date = fcf_df['date'].max()
+    forecast_dates = pd.date_range(start=last_date + pd.tseries.frequencies.to_offset(freq),
+                                   periods=periods,
+                                   freq=freq)
+    first_year = fcf_df['date'].dt.year.min()
+
+    return {
+        "ticker": ticker,
+        "hist_fcff": fcf_df['fcff'].fillna(0).to_numpy(dtype=float),
+        "hist_t": discount_periods(fcf_df).to_numpy(dtype=float),
+        "last_fcf": fcf_df.loc[fcf_df['date'] == last_date, 'fcff'].values[0],
+        "forecast_t": (forecast_dates.year - first_year + 1).to_numpy(dtype=float),
+        "n_rows": len(fcf_df) + periods,
+        "wacc": calculate_wacc(ticker),
+        "growth": fcf_growth(fcf_df),
+        "market_cap": get_market_cap(ticker)
+    }
+
+
+def build_reverse_dcf_inputs(
+        tickers: list[str],
+        periods: int = 5,
+        freq: str = "YE",
+        executor: TickerExecutor | None = None
+) -> dict:
+    """
+    Fetches FCF history, WACC and market cap for every ticker and packs them into padded NumPy arrays.
+
+    The arrays mirror what company_valuation does with the 'growth' forecast method: historical
+    rows are discounted from the first reported year, forecasted rows follow the last reported date,
+    and the terminal value is discounted over the total number of rows.
+
+    Tickers are fetched through executor; failed tickers are left out and recorded in
+    executor.errors with the stage 'reverse_dcf_inputs'.
+
+    Args:
+        tickers (list[str]): List of ticker strings.
+        periods (int): Number of forecast periods.
+        freq (str): Frequency string compatible with pandas date_range.
+        executor (TickerExecutor | None): Executor to fetch with and error collector (default: a thread pool).
+
+    Returns:
+        dict: Arrays keyed by name, one row per ticker that could be fetched, in the order of tickers:
+              'ticker', 'hist_fcff', 'hist_t', 'last_fcf', 'forecast_t', 'n_rows',
+              'wacc', 'growth', 'market_cap'.
+    """
+    executor = executor or TickerExecutor()
+    fetched = executor.map(_reverse_dcf_row, tickers, periods, freq, stage="reverse_dcf_inputs")
+    rows = [fetched[ticker] for ticker in dedupe_tickers(tickers) if ticker in fetched]
+
+    # Pad the historical series to a common length; zero cash flows add nothing to the NPV
+    max_len = max((len(r["hist_fcff"]) for r in rows), default=0)
+    hist_fcff = np.zeros((len(rows), max_len))
+    hist_t = np.zeros((len(rows), max_len))
+    for i, r in enumerate(rows):
+        hist_fcff[i, :len(r["hist_fcff"])] = r["hist_fcff"]
+        hist_t[i, :len(r["hist_t"])] = r["hist_t"]
+
+    return {
+        "ticker": np.array([r["ticker"] for r in rows], dtype=object),
+        "hist_fcff": hist_fcff,
+        "hist_t": hist_t,
+        "last_fcf": np.array([r["last_fcf"] for r in rows], dtype=float),
+        "forecast_t": np.array([r["forecast_t"] for r in rows], dtype=float).reshape(len(rows), periods),
+        "n_rows": np.array([r["n_rows"] for r in rows], dtype=float),
+        "wacc": np.array([r["wacc"] for r in rows], dtype=float),
+        "growth": np.array([r["growth"] for r in rows], dtype=float),
+        "market_cap": np.array([r["market_cap"] for r in rows], dtype=float)
+    }
+
+
+def dcf_value_batch(inputs: dict, growth: np.ndarray, wacc: np.ndarray, perpetual_growth_rate: float = 0.02) -> np.ndarray:
+    """
+    Calculates the DCF value (NPV + present terminal value) of every ticker at once.
+
+    Args:
+        inputs (dict): Arrays as returned by build_reverse_dcf_inputs.
+        growth (np.ndarray): FCF growth rate per ticker as decimals.
+        wacc (np.ndarray): WACC per ticker as decimals.
+        perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+
+    Returns:
+        np.ndarray: DCF value per ticker.
+    """
+    wacc = np.asarray(wacc, dtype=float)
+    growth = np.asarray(growth, dtype=float)
+    periods = inputs["forecast_t"].shape[1]
+    k = np.arange(1, periods + 1)
+
+    npv_hist = (inputs["hist_fcff"] * (1 + wacc[:, None]) ** -inputs["hist_t"]).sum(axis=1)
+
+    forecast = inputs["last_fcf"][:, None] * (1 + growth[:, None]) ** k
+    npv_forecast = (forecast * (1 + wacc[:, None]) ** -inputs["forecast_t"]).sum(axis=1)
+
+    tv = forecast[:, -1] * (1 + perpetual_growth_rate) / (wacc - perpetual_growth_rate)
+    present_tv = tv / ((1 + wacc) ** inputs["n_rows"])
+
+    return npv_hist + npv_forecast + present_tv
+
+
+def bisect_batch(f, lo: np.ndarray, hi: np.ndarray, tol: float = 1e-8, max_iter: int = 200) -> np.ndarray:
+    """
+    Finds a root of f for every element at once using vectorized bisection.
+
+    Args:
+        f (callable): Function mapping an array of candidates to an array of residuals.
+        lo (np.ndarray): Lower bracket per element.
+        hi (np.ndarray): Upper bracket per element.
+        tol (float): Bracket width at which to stop.
+        max_iter (int): Maximum number of halvings.
+
+    Returns:
+        np.ndarray: Root per element, NaN where [lo, hi] does not bracket a sign change.
+    """
+    lo = np.array(lo, dtype=float)
+    hi = np.array(hi, dtype=float)
+    f_lo = f(lo)
+    f_hi = f(hi)
+    bracketed = np.sign(f_lo) * np.sign(f_hi) <= 0
+
+    for _ in range(max_iter):
+        mid = (lo + hi) / 2
+        f_mid = f(mid)
+        go_right = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(go_right, mid, lo)
+        f_lo = np.where(go_right, f_mid, f_lo)
+        hi = np.where(go_right, hi, mid)
+        if np.nanmax(hi - lo, initial=0) < tol:
+            break
+
+    return np.where(bracketed, (lo + hi) / 2, np.nan)
+
+
+def solve_reverse_dcf(
+        inputs: dict,
+        solve_for: str = "growth",
+        perpetual_growth_rate: float = 0.02,
+        bounds: tuple[float, float] | None = None
+) -> np.ndarray:
+    """
+    Solves, for every ticker at once, the rate that makes the DCF value equal to the market cap.
+
+    Args:
+        inputs (dict): Arrays as returned by build_reverse_dcf_inputs.
+        solve_for (str): "growth" to solve for the FCF growth rate holding WACC fixed,
+                         or "wacc" to solve for WACC holding the historical growth rate fixed.
+        perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+        bounds (tuple[float, float] | None): Search interval. Defaults to (-0.99, 2.0) for growth
+                                             and (perpetual_growth_rate, 1.0) for WACC.
+
+    Returns:
+        np.ndarray: Implied rate per ticker, NaN where no solution lies within the bounds.
+    """
+    n = len(inputs["ticker"])
+    market_cap = inputs["market_cap"]
+
+    if solve_for == "growth":
+        lo, hi = bounds or (-0.99, 2.0)
+
+        def residual(x):
+            return dcf_value_batch(inputs, x, inputs["wacc"], perpetual_growth_rate) - market_cap
+    elif solve_for == "wacc":
+        lo, hi = bounds or (perpetual_growth_rate, 1.0)
+        # WACC must stay strictly above g for the terminal value to be finite
+        lo = max(lo, perpetual_growth_rate + 1e-6)
+
+        def residual(x):
+            return dcf_value_batch(inputs, inputs["growth"], x, perpetual_growth_rate) - market_cap
+    else:
+        raise ValueError(f"Invalid solve_for '{solve_for}'. Choose from 'growth', 'wacc'.")
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        return bisect_batch(residual, np.full(n, lo), np.full(n, hi))
+
+
+def implied_growth_table(
+        tickers: list[str],
+        solve_for: str = "growth",
+        perpetual_growth_rate: float = 0.02,
+        executor: TickerExecutor | None = None
+) -> pd.DataFrame:
+    """
+    Builds a ranked table of the rate implied by the market cap of every ticker.
+
+    Args:
+        tickers (list[str]): List of ticker strings.
+        solve_for (str): "growth" or "wacc", see solve_reverse_dcf.
+        perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+        executor (TickerExecutor | None): Executor to fetch the inputs with and error collector,
+                                          see build_reverse_dcf_inputs.
+
+    Returns:
+        pd.DataFrame: DataFrame with columns
+            ['ticker', 'company_market_cap', 'wacc', 'historical_growth', 'implied_<solve_for>'],
+            sorted by the implied rate in descending order.
+    """
+    inputs = build_reverse_dcf_inputs(tickers, executor=executor)
+    implied = solve_reverse_dcf(inputs, solve_for, perpetual_growth_rate)
+
+    implied_column = f"implied_{solve_for}"
+    df = pd.DataFrame({
+        "ticker": inputs["ticker"],
+        "company_market_cap": inputs["market_cap"],
+        "wacc": inputs["wacc"],
+        "historical_growth": inputs["growth"],
+        implied_column: implied
+    })
+
+    return df.sort_values(implied_column, ascending=False, na_position="last").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from settings import sp500_tickers
+
+    df_implied = implied_growth_table(sp500_tickers, solve_for="growth", perpetual_growth_rate=0.02)
+    print(df_implied)
@@ -0,0 +1,123 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class TaskGraph:
+    """
+    Small DAG executor: every step is a node with a key, a function and the keys of its inputs.
+
+    Nodes are memoized by key, so a step that several others depend on (e.g. the market return
+    shared by every ticker's WACC) is added once and computed exactly once per run.
+    Nodes whose inputs are ready run concurrently in a thread pool.
+    The wall time of every node that ran is kept in timings.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.timings = {}
+
+    def add(self, key: str, func, *inputs: str, **kwargs) -> str:
+        """
+        Adds a node unless a node with the same key already exists.
+
+        Args:
+            key (str): Unique key of the step, e.g. "wacc:MSFT".
+            func (callable): Called with the results of the inputs, in order, plus kwargs.
+            *inputs (str): Keys of the nodes whose results are passed to func.
+            **kwargs: Constant keyword arguments for func.
+
+        Returns:
+            str: The node key, to be used as an input of other nodes.
+        """
+        if key not in self.nodes:
+            self.nodes[key] = (func, inputs, kwargs)
+        return key
+
+    def _required(self, targets, known) -> set:
+        """Keys of the targets and everything they transitively depend on, stopping at known results."""
+        required = set()
+        stack = list(targets)
+        while stack:
+            key = stack.pop()
+            if key in required or key in known:
+                continue
+            if key not in self.nodes:
+                raise KeyError(f"Unknown node '{key}'")
+            required.add(key)
+            stack.extend(self.nodes[key][1])
+        return required
+
+    def _timed(self, key, func, *args, **kwargs):
+        """Runs a node function and records its wall time."""
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.timings[key] = time.perf_counter() - start
+
+    def run(self, targets=None, max_workers: int = 8, results: dict | None = None) -> tuple[dict, dict]:
+        """
+        Computes the targets and their inputs, each node once.
+
+        A node whose input failed is not run; it fails with the same exception.
+
+        Args:
+            targets (iterable[str] | None): Keys to compute (default: every node).
+            max_workers (int): Maximum number of nodes running at the same time.
+            results (dict | None): Results already computed, e.g. by a previous run of this graph.
+                                   These nodes are not run again.
+
+        Returns:
+            tuple[dict, dict]: Results (including the given ones) and exceptions, each keyed by node key.
+        """
+        results = dict(results or {})
+        errors = {}
+        required = self._required(self.nodes if targets is None else targets, results)
+        waiting_on = {key: set(self.nodes[key][1]) - results.keys() for key in required}
+        dependents = {key: [] for key in required}
+        for key in required:
+            for input_key in self.nodes[key][1]:
+                if input_key in dependents:
+                    dependents[input_key].append(key)
+
+        def settle(key):
+            """Releases the dependents of a finished node and returns those that became ready."""
+            ready = []
+            for dependent in dependents[key]:
+                waiting_on[dependent].discard(key)
+                if not waiting_on[dependent]:
+                    ready.append(dependent)
+            return ready
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            ready = [key for key, inputs in waiting_on.items() if not inputs]
+
+            while ready or running:
+                for key in ready:
+                    func, inputs, kwargs = self.nodes[key]
+                    failed = [input_key for input_key in inputs if input_key in errors]
+                    if failed:
+                        errors[key] = errors[failed[0]]
+                        ready.extend(settle(key))
+                        continue
+                    args = [results[input_key] for input_key in inputs]
+                    running[executor.submit(self._timed, key, func, *args, **kwargs)] = key
+                ready = []
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        errors[key] = e
+                    ready.extend(settle(key))
+
+        unfinished = required - results.keys() - errors.keys()
+        if unfinished:
+            raise ValueError(f"Cycle detected between nodes: {sorted(unfinished)}")
+
+        return results, errors
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -30,32 +31,61 @@ def calculate_present_terminal_value(df: pd.DataFrame, wacc: float, perpetual_gr
     return discounted_tv
 
 
+def calculate_present_terminal_value_grid(df: pd.DataFrame, waccs, perpetual_growth_rates) -> np.ndarray:
+    """
+    Calculates the present terminal value for every (WACC, perpetual growth) pair at once.
+    Same Gordon Growth Model as calculate_present_terminal_value, broadcast over both grids.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing a 'fcff' column with forecasted free cash flows.
+        waccs (array-like): WACC values as decimals.
+        perpetual_growth_rates (array-like): Perpetual growth rates as decimals.
+
+    Returns:
+        np.ndarray: Array of shape (len(waccs), len(perpetual_growth_rates)).
+                    Pairs where WACC <= growth rate have no finite terminal value and are NaN.
+    """
+    if 'fcff' not in df.columns:
+        raise ValueError("DataFrame must contain a 'fcff' column.")
+
+    last_fcf = df['fcff'].iloc[-1]
+    wacc = np.asarray(waccs, dtype=float)[:, None]
+    g = np.asarray(perpetual_growth_rates, dtype=float)[None, :]
+
+    spread = wacc - g
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tv = np.where(spread > 0, last_fcf * (1 + g) / spread, np.nan)
+
+    periods = len(df)
+    return tv / ((1 + wacc) ** periods)
+
+
 if __name__ == "__main__":
     from fetch_fcf import fetch_fcf
     from fcf_forecast import forecast_fcf_interface
     from wacc import calculate_wacc
     from settings import sp500_tickers
+    from ticker_executor import TickerExecutor
 
     # Example perpetual growth assumption (e.g. 2%)
     g = 0.02
 
+    def present_terminal_value(ticker):
+        df = fetch_fcf(ticker)
+        df_forecasted = forecast_fcf_interface(df, method="growth", periods=5, freq="YE")
+        wacc = calculate_wacc(ticker)
+        return calculate_present_terminal_value(df_forecasted, wacc, g)
+
     results = []
+    executor = TickerExecutor()
+
+    for ticker, terminal_value in executor.imap(present_terminal_value, sp500_tickers, stage="terminal_value"):
+        results.append({
+            "ticker": ticker,
+            "terminal_value": terminal_value
+        })
 
-    for ticker in sp500_tickers:
-        try:
-            df = fetch_fcf(ticker)
-            df_forecasted = forecast_fcf_interface(df, method="growth", periods=5, freq="YE")
-            wacc = calculate_wacc(ticker)
-            terminal_value = calculate_present_terminal_value(df_forecasted, wacc, g)
-
-            results.append({
-                "ticker": ticker,
-                "terminal_value": terminal_value
-            })
-
-            print(f"{ticker} - Terminal Value (discounted to present): {terminal_value:,.2f}")
-        except:
-            print(f"{ticker} - Terminal Value not found")
+        print(f"{ticker} - Terminal Value (discounted to present): {terminal_value:,.2f}")
     # Convert results to DataFrame
     terminal_value_df = pd.DataFrame(results)
     print("\n=== Terminal Value DataFrame ===")
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+import company_valuation
+from company_valuation import run_valuations
+from fcf_forecast import forecast_fcf_interface
+from ticker_executor import TickerExecutor
+
+
+def fcf_fetcher(ticker):
+    dates = pd.date_range("2019-12-31", periods=5, freq="YE")
+    return pd.DataFrame({"date": dates, "fcff": 100 * 1.05 ** np.arange(5)})
+
+
+def test_run_valuations_rejects_a_process_executor():
+    with pytest.raises(ValueError):
+        run_valuations(["AAA"], executor=TickerExecutor("process"), fcf_fetcher=fcf_fetcher)
+
+
+def test_sensitivity_surface_matches_single_valuations(monkeypatch):
+    monkeypatch.setattr(company_valuation, "fetch_fcf", fcf_fetcher)
+    wacc_grid, g_grid = [0.02, 0.08, 0.1], [0.01, 0.03]
+
+    surface = company_valuation.sensitivity_surface("AAA", wacc_grid, g_grid)
+
+    forecast = forecast_fcf_interface(fcf_fetcher("AAA"), method="growth", periods=5, freq="YE")
+    for wacc in (0.08, 0.1):
+        for g in g_grid:
+            assert surface.loc[wacc, g] == pytest.approx(company_valuation.valuation_from_forecast(forecast, wacc, g))
+    assert np.isnan(surface.loc[0.02, 0.03])
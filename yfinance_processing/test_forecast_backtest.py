@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import forecast_backtest
+from ticker_executor import TickerExecutor
+
+
+def fake_fetch_fcf(ticker):
+    if ticker == "FAIL":
+        raise ValueError("no cash flow statement")
+    dates = pd.date_range("2015-12-31", periods=8, freq="YE")
+    return pd.DataFrame({"date": dates, "fcff": 100 * 1.1 ** np.arange(8)})
+
+
+def test_walk_forward_matches_forecasts_with_later_actuals():
+    records = forecast_backtest.walk_forward(fake_fetch_fcf("A"), "growth", periods=2, min_train=3)
+
+    # Cutoffs at 3..7 observations: two horizons each, except the last one
+    assert len(records) == 9
+    assert [r["horizon"] for r in records[:2]] == [1, 2]
+    assert records[0]["actual"] == 100 * 1.1 ** 3
+
+
+def test_backtest_runs_every_ticker_method_pair(monkeypatch):
+    monkeypatch.setattr(forecast_backtest, "fetch_fcf", fake_fetch_fcf)
+    executor = TickerExecutor("serial")
+
+    results, summary = forecast_backtest.backtest_forecast_methods(
+        ["A", "B", "FAIL"], methods=("growth", "bogus"), periods=2, executor=executor
+    )
+
+    assert set(results["ticker"]) == {"A", "B"}
+    assert summary["method"].tolist() == ["growth"]
+    errors = executor.errors_df()
+    assert set(zip(errors["ticker"], errors["stage"])) == {
+        ("FAIL", "fetch_fcf"), ("A", "walk_forward:bogus"), ("B", "walk_forward:bogus")
+    }
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from linear_forecast import linear_forecast_fcff, linear_forecast_panel, to_ordinal
+
+
+def panel():
+    dates = pd.date_range("2017-12-31", periods=6, freq="YE")
+    rng = np.random.default_rng(0)
+    return pd.concat([
+        pd.DataFrame({"ticker": "AAA", "date": dates, "fcff": 100 + 10 * np.arange(6) + rng.normal(0, 3, 6)}),
+        pd.DataFrame({"ticker": "BBB", "date": dates[2:], "fcff": [50.0, np.nan, 40.0, 35.0]}),
+        pd.DataFrame({"ticker": "CCC", "date": dates[-1:], "fcff": [7.0]}),
+    ], ignore_index=True)
+
+
+def test_to_ordinal_matches_timestamp_toordinal():
+    dates = pd.to_datetime(["1970-01-01", "2000-02-29", "2024-12-31"])
+
+    assert to_ordinal(dates).tolist() == [d.toordinal() for d in dates]
+
+
+@pytest.mark.parametrize("ticker", ["AAA", "BBB"])
+def test_panel_matches_the_per_ticker_regression(ticker):
+    pytest.importorskip("sklearn")
+    history = panel()
+    history = history[history["ticker"] == ticker]
+
+    batch = linear_forecast_panel(history, periods=3)
+    single = linear_forecast_fcff(history[["date", "fcff"]], periods=3, freq="YE")
+
+    np.testing.assert_allclose(batch["fcff"].to_numpy(), single["fcff"].to_numpy())
+    assert batch["date"].tolist() == single["date"].tolist()
+
+
+def test_single_observation_gives_a_flat_line():
+    result = linear_forecast_panel(panel(), periods=2)
+
+    assert result.loc[result["ticker"] == "CCC", "fcff"].tolist() == [7.0, 7.0, 7.0]
+
+
+def test_bands_contain_the_point_forecast():
+    result = linear_forecast_panel(panel(), periods=2, confidence=0.9, n_samples=500, seed=0)
+    forecast = result.dropna(subset=["fcff_lower"])
+
+    assert len(forecast) == 6
+    assert (forecast["fcff_lower"] <= forecast["fcff"]).all() and (forecast["fcff"] <= forecast["fcff_upper"]).all()
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import reverse_dcf
+from ticker_executor import TickerExecutor
+
+
+def fake_fetch_fcf(ticker):
+    if ticker == "FAIL":
+        raise ValueError("no cash flow statement")
+    dates = pd.date_range("2019-12-31", periods=5, freq="YE")
+    return pd.DataFrame({"date": dates, "fcff": 100 * 1.05 ** np.arange(5)})
+
+
+def patch_sources(monkeypatch):
+    monkeypatch.setattr(reverse_dcf, "fetch_fcf", fake_fetch_fcf)
+    monkeypatch.setattr(reverse_dcf, "calculate_wacc", lambda ticker: 0.08)
+    monkeypatch.setattr(reverse_dcf, "get_market_cap", lambda ticker: 1.0)
+
+
+def test_build_inputs_keeps_ticker_order_and_records_errors(monkeypatch):
+    patch_sources(monkeypatch)
+    executor = TickerExecutor("thread", max_workers=2)
+
+    inputs = reverse_dcf.build_reverse_dcf_inputs(["B", "FAIL", "A", "B"], periods=3, executor=executor)
+
+    assert inputs["ticker"].tolist() == ["B", "A"]
+    assert inputs["forecast_t"].shape == (2, 3)
+    assert executor.errors_df()[["ticker", "stage"]].values.tolist() == [["FAIL", "reverse_dcf_inputs"]]
+
+
+def test_solve_recovers_the_growth_priced_in(monkeypatch):
+    patch_sources(monkeypatch)
+    inputs = reverse_dcf.build_reverse_dcf_inputs(["A", "B"], executor=TickerExecutor("serial"))
+    growth = np.array([0.03, 0.12])
+    inputs["market_cap"] = reverse_dcf.dcf_value_batch(inputs, growth, inputs["wacc"])
+
+    implied = reverse_dcf.solve_reverse_dcf(inputs, "growth")
+
+    np.testing.assert_allclose(implied, growth, atol=1e-6)
@@ -0,0 +1,64 @@
+import threading
+import pytest
+from task_graph import TaskGraph
+
+
+def test_shared_nodes_run_once():
+    calls = []
+    lock = threading.Lock()
+
+    def market_return():
+        with lock:
+            calls.append("market_return")
+        return 0.09
+
+    graph = TaskGraph()
+    rm = graph.add("market_return", market_return)
+    for ticker, beta in (("AAA", 1.0), ("BBB", 2.0)):
+        graph.add(f"cost_of_equity:{ticker}", lambda rm_, beta: 0.04 + beta * (rm_ - 0.04), rm, beta=beta)
+    # Adding an existing key keeps the first node
+    graph.add("market_return", lambda: 1.0)
+
+    results, errors = graph.run()
+
+    assert calls == ["market_return"]
+    assert results["cost_of_equity:BBB"] == pytest.approx(0.14)
+    assert not errors
+    assert set(graph.timings) == set(results)
+
+
+def test_failures_propagate_to_dependents_only():
+    graph = TaskGraph()
+    bad = graph.add("bad", lambda: 1 / 0)
+    good = graph.add("good", lambda: 2)
+    graph.add("uses_bad", lambda x: x + 1, bad)
+    graph.add("uses_good", lambda x: x + 1, good)
+
+    results, errors = graph.run()
+
+    assert results == {"good": 2, "uses_good": 3}
+    assert isinstance(errors["uses_bad"], ZeroDivisionError) and errors["uses_bad"] is errors["bad"]
+
+
+def test_targets_and_known_results_limit_what_runs():
+    graph = TaskGraph()
+    graph.add("a", lambda: pytest.fail("a is known and must not run"))
+    graph.add("b", lambda a: a * 2, "a")
+    graph.add("unused", lambda: pytest.fail("unused is not a target"))
+
+    results, _ = graph.run(["b"], results={"a": 5})
+
+    assert results == {"a": 5, "b": 10}
+
+
+def test_unknown_input_and_cycle_are_reported():
+    graph = TaskGraph()
+    graph.add("missing_input", lambda x: x, "nowhere")
+    with pytest.raises(KeyError):
+        graph.run(["missing_input"])
+
+    graph = TaskGraph()
+    graph.add("x", lambda y: y, "y")
+    graph.add("y", lambda x: x, "x")
+    with pytest.raises(ValueError):
+        graph.run()
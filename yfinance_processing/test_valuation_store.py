@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+import company_valuation
+from company_valuation import run_valuations
+from valuation_store import ValuationStore
+from ticker_executor import TickerExecutor
+
+
+def fcf_fetcher(ticker):
+    dates = pd.date_range("2019-12-31", periods=5, freq="YE")
+    return pd.DataFrame({"date": dates, "fcff": 100 * 1.05 ** np.arange(5)})
+
+
+@pytest.fixture
+def info(monkeypatch):
+    info = {"sharesOutstanding": 1_000, "currentPrice": 10.0, "beta": 1.0, "marketCap": 10_000}
+    wacc_inputs = company_valuation.wacc_inputs
+    monkeypatch.setattr(wacc_inputs, "get_risk_free_rate", lambda: 0.04)
+    monkeypatch.setattr(wacc_inputs, "get_market_return", lambda: 0.09)
+    monkeypatch.setattr(wacc_inputs, "get_info", lambda ticker: dict(info))
+    monkeypatch.setattr(wacc_inputs, "get_financials", lambda ticker: None)
+    monkeypatch.setattr(wacc_inputs, "get_balance_sheet", lambda ticker: None)
+    monkeypatch.setattr(wacc_inputs, "total_debt_from_balance_sheet", lambda balance: 2_000.0)
+    monkeypatch.setattr(wacc_inputs, "cost_of_debt_from_statements", lambda income, balance: 0.05)
+    monkeypatch.setattr(wacc_inputs, "tax_rate_from_income_statement", lambda income: 0.21)
+    return info
+
+
+def run(store):
+    df, _, _ = run_valuations(["AAA"], store=store, executor=TickerExecutor("serial"), fcf_fetcher=fcf_fetcher)
+    return df.iloc[0]
+
+
+def test_price_move_reuses_the_stored_valuation(info, tmp_path):
+    store = ValuationStore(str(tmp_path / "valuations.db"))
+    first = run(store)
+
+    info["currentPrice"] = 12.0
+    second = run(store)
+
+    assert not first["from_store"] and second["from_store"]
+    assert second["total_value"] == first["total_value"]
+
+
+def test_share_count_change_recomputes(info, tmp_path):
+    store = ValuationStore(str(tmp_path / "valuations.db"))
+    run(store)
+
+    info["sharesOutstanding"] = 2_000
+
+    assert not run(store)["from_store"]
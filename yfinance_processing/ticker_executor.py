@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+import pandas as pd
+from settings import logger
+
+EXECUTOR_KINDS = ("serial", "thread", "process")
+
+
+def dedupe_tickers(tickers) -> list:
+    """
+    Removes repeated tickers, keeping the first occurrence of each.
+
+    Args:
+        tickers (iterable[str]): Ticker symbols, possibly with duplicates.
+
+    Returns:
+        list: Unique tickers in their original order.
+    """
+    return list(dict.fromkeys(tickers))
+
+
+class TickerExecutor:
+    """
+    Runs a per-ticker function over many tickers serially, in a thread pool or in a process pool.
+
+    Tickers are deduplicated, at most max_workers tickers are processed at a time, results are
+    yielded as they finish and failures are collected as structured records in errors
+    instead of stopping the run.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 8):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Invalid executor kind '{kind}'. Choose from {', '.join(EXECUTOR_KINDS)}.")
+        self.kind = kind
+        self.max_workers = 1 if kind == "serial" else max_workers
+        self.errors = []
+
+    def record_error(self, ticker: str, error: Exception, stage: str | None = None):
+        """
+        Records a failed ticker.
+
+        Args:
+            ticker (str): Ticker that failed.
+            error (Exception): The exception raised.
+            stage (str | None): Step that failed, if known.
+        """
+        self.errors.append({
+            "ticker": ticker,
+            "stage": stage,
+            "error_type": type(error).__name__,
+            "message": str(error)
+        })
+        logger.error(f"Error processing {ticker}: {error}")
+
+    def errors_df(self) -> pd.DataFrame:
+        """
+        Returns the collected errors as a DataFrame with columns ['ticker', 'stage', 'error_type', 'message'].
+        """
+        return pd.DataFrame(self.errors, columns=["ticker", "stage", "error_type", "message"])
+
+    def imap(self, func, tickers, *args, stage: str | None = None, **kwargs):
+        """
+        Calls func once per unique ticker and yields (ticker, result) pairs as they finish.
+
+        With the process kind, func must be a module-level function so it can be pickled.
+
+        Args:
+            func (callable): Called as func(ticker, *args, **kwargs). If tickers is a dict,
+                             it is called with the dict value in place of the ticker.
+            tickers (iterable[str] | dict): Tickers, or a dict mapping ticker to its first argument.
+            *args: Extra positional arguments for func.
+            stage (str | None): Name recorded with errors from this call.
+            **kwargs: Extra keyword arguments for func.
+
+        Yields:
+            tuple[str, object]: Ticker and result, in completion order. Failed tickers are skipped
+                                and recorded in errors.
+        """
+        first_args = tickers if isinstance(tickers, dict) else {ticker: ticker for ticker in dedupe_tickers(tickers)}
+
+        if self.kind == "serial":
+            for ticker, first_arg in first_args.items():
+                try:
+                    result = func(first_arg, *args, **kwargs)
+                except Exception as e:
+                    self.record_error(ticker, e, stage)
+                    continue
+                yield ticker, result
+            return
+
+        pool_class = ThreadPoolExecutor if self.kind == "thread" else ProcessPoolExecutor
+        pool = pool_class(max_workers=self.max_workers)
+        try:
+            # Only keep a bounded number of tickers in flight, so huge universes are not queued up front
+            remaining = iter(first_args.items())
+            running = {}
+
+            def submit_next():
+                for ticker, first_arg in remaining:
+                    running[pool.submit(func, first_arg, *args, **kwargs)] = ticker
+                    return
+
+            for _ in range(self.max_workers * 2):
+                submit_next()
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ticker = running.pop(future)
+                    submit_next()
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.record_error(ticker, e, stage)
+                        continue
+                    yield ticker, result
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def map(self, func, tickers, *args, stage: str | None = None, **kwargs) -> dict:
+        """
+        Like imap, but waits for every ticker and returns a dict of results keyed by ticker.
+        """
+        return dict(self.imap(func, tickers, *args, stage=stage, **kwargs))
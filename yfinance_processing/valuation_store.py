@@ -0,0 +1,145 @@
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+import pandas as pd
+
+# Local SQLite file holding every valuation and run
+STORE_PATH = "valuations.db"
+
+
+def valuation_input_hash(
+        fcf_df: pd.DataFrame,
+        wacc_inputs: dict,
+        forecast_method: str,
+        perpetual_growth_rate: float
+) -> str:
+    """
+    Hashes everything a valuation depends on.
+
+    Args:
+        fcf_df (pd.DataFrame): Historical FCF with columns 'date' and 'fcff'.
+        wacc_inputs (dict): WACC parameters and share count by name (debt value, costs, tax rate,
+                            shares outstanding). The share price is not an input, so a stored
+                            valuation is reused while only the price moves.
+        forecast_method (str): Forecasting method.
+        perpetual_growth_rate (float): Perpetual growth rate for terminal value.
+
+    Returns:
+        str: Hex digest identifying the inputs.
+    """
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(fcf_df[['date', 'fcff']], index=False).values.tobytes())
+    h.update(json.dumps(
+        {
+            "wacc_inputs": {name: float(value) for name, value in sorted(wacc_inputs.items())},
+            "forecast_method": forecast_method,
+            "perpetual_growth_rate": float(perpetual_growth_rate)
+        },
+        sort_keys=True
+    ).encode())
+    return h.hexdigest()
+
+
+class ValuationStore:
+    """
+    Local SQLite store of valuations keyed by ticker and input hash, plus metadata of every run.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        # Only run_valuations reads and writes the store, always from the calling thread
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL,
+                finished_at TEXT,
+                seconds REAL,
+                n_tickers INTEGER,
+                n_computed INTEGER,
+                n_from_store INTEGER,
+                n_errors INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS valuations (
+                ticker TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                forecast_method TEXT NOT NULL,
+                perpetual_growth_rate REAL NOT NULL,
+                total_value REAL NOT NULL,
+                seconds REAL,
+                computed_at TEXT NOT NULL,
+                run_id INTEGER REFERENCES runs(run_id),
+                PRIMARY KEY (ticker, input_hash)
+            );
+        """)
+        self.conn.commit()
+
+    def get(self, ticker: str, input_hash: str) -> dict | None:
+        """
+        Returns the stored valuation for these inputs, or None if they were never valued.
+        """
+        cursor = self.conn.execute(
+            "SELECT ticker, input_hash, forecast_method, perpetual_growth_rate, total_value, seconds, "
+            "computed_at, run_id FROM valuations WHERE ticker = ? AND input_hash = ?",
+            (ticker, input_hash)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([c[0] for c in cursor.description], row))
+
+    def put(
+            self,
+            ticker: str,
+            input_hash: str,
+            forecast_method: str,
+            perpetual_growth_rate: float,
+            total_value: float,
+            seconds: float,
+            run_id: int
+    ):
+        """
+        Records a computed valuation.
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO valuations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (ticker, input_hash, forecast_method, perpetual_growth_rate, float(total_value), seconds,
+             datetime.now().isoformat(), run_id)
+        )
+        self.conn.commit()
+
+    def start_run(self) -> int:
+        """
+        Opens a run and returns its id.
+        """
+        cursor = self.conn.execute("INSERT INTO runs (started_at) VALUES (?)", (datetime.now().isoformat(),))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int, seconds: float, n_tickers: int, n_computed: int, n_from_store: int,
+                   n_errors: int):
+        """
+        Closes a run with its timing and counts.
+        """
+        self.conn.execute(
+            "UPDATE runs SET finished_at = ?, seconds = ?, n_tickers = ?, n_computed = ?, n_from_store = ?, "
+            "n_errors = ? WHERE run_id = ?",
+            (datetime.now().isoformat(), seconds, n_tickers, n_computed, n_from_store, n_errors, run_id)
+        )
+        self.conn.commit()
+
+    def runs(self) -> pd.DataFrame:
+        """
+        Returns the metadata of every run, most recent first.
+        """
+        return pd.read_sql_query("SELECT * FROM runs ORDER BY run_id DESC", self.conn)
+
+    def valuations(self) -> pd.DataFrame:
+        """
+        Returns every stored valuation.
+        """
+        return pd.read_sql_query("SELECT * FROM valuations ORDER BY ticker, computed_at", self.conn)
+
+    def close(self):
+        self.conn.close()
@@ -1,6 +1,18 @@
 import yfinance as yf
 
 
+def get_info(ticker):
+    return yf.Ticker(ticker).info
+
+
+def get_financials(ticker):
+    return yf.Ticker(ticker).financials
+
+
+def get_balance_sheet(ticker):
+    return yf.Ticker(ticker).balance_sheet
+
+
 def get_risk_free_rate():
     # Por simplicidad usamos el bono 10 años de USA, ticker ^TNX, en porcentaje
     tnx = yf.Ticker("^TNX")
@@ -16,6 +28,13 @@ def get_market_return():
     return hist["returns"].mean() * 12  # anualizado
 
 
+def cost_of_equity_from_beta(beta, rf, rm):
+    # CAPM
+    if beta is None:
+        raise ValueError("No se encontró beta para este ticker.")
+    return rf + beta * (rm - rf)
+
+
 def get_cost_of_equity(ticker):
     stock = yf.Ticker(ticker)
     beta = stock.info.get('beta', None)
@@ -23,21 +42,12 @@ def get_cost_of_equity(ticker):
         raise ValueError("No se encontró beta para este ticker.")
     rf = get_risk_free_rate()
     rm = get_market_return()
-    cost_equity = rf + beta * (rm - rf)
+    cost_equity = cost_of_equity_from_beta(beta, rf, rm)
     return cost_equity
 
 
-def get_cost_of_debt(ticker):
-    stock = yf.Ticker(ticker)
-    fin = stock.financials
-    income_stmt = fin.copy()
-    # Intentamos obtener el gasto de intereses
-    try:
-        interest_expense = abs(income_stmt.loc['Interest Expense'].iloc[0])
-    except KeyError:
-        interest_expense = None
-
-    balance = stock.balance_sheet
+def total_debt_from_balance_sheet(balance):
+    # Aquí aproximamos la deuda total del balance (puede no ser valor de mercado exacto)
     try:
         short_term_debt = balance.loc['Short Long Term Debt'].iloc[0]
     except KeyError:
@@ -46,18 +56,33 @@ def get_cost_of_debt(ticker):
         long_term_debt = balance.loc['Long Term Debt'].iloc[0]
     except KeyError:
         long_term_debt = 0
+    return short_term_debt + long_term_debt
+
+
+def cost_of_debt_from_statements(income_stmt, balance):
+    # Intentamos obtener el gasto de intereses
+    try:
+        interest_expense = abs(income_stmt.loc['Interest Expense'].iloc[0])
+    except KeyError:
+        interest_expense = None
 
-    total_debt = short_term_debt + long_term_debt
+    total_debt = total_debt_from_balance_sheet(balance)
     if total_debt == 0 or interest_expense is None:
         raise ValueError("No se pudo obtener gasto de intereses o deuda total.")
 
-    cost_debt = interest_expense / total_debt
-    return cost_debt
+    return interest_expense / total_debt
 
 
-def get_tax_rate(ticker):
+def get_cost_of_debt(ticker):
     stock = yf.Ticker(ticker)
-    income_stmt = stock.financials
+    fin = stock.financials
+    income_stmt = fin.copy()
+    balance = stock.balance_sheet
+    cost_debt = cost_of_debt_from_statements(income_stmt, balance)
+    return cost_debt
+
+
+def tax_rate_from_income_statement(income_stmt):
     try:
         income_tax_expense = abs(income_stmt.loc['Income Tax Expense'].iloc[0])
         pretax_income = income_stmt.loc['Income Before Tax'].iloc[0]
@@ -67,45 +92,58 @@ def get_tax_rate(ticker):
     return tax_rate
 
 
-def get_market_value_equity(ticker):
+def get_tax_rate(ticker):
     stock = yf.Ticker(ticker)
-    shares_outstanding = stock.info.get('sharesOutstanding', None)
-    current_price = stock.info.get('currentPrice', None)
+    income_stmt = stock.financials
+    return tax_rate_from_income_statement(income_stmt)
+
+
+def market_value_equity_from_info(info):
+    shares_outstanding = info.get('sharesOutstanding', None)
+    current_price = info.get('currentPrice', None)
     if shares_outstanding is None or current_price is None:
         raise ValueError("No se pudo obtener datos de mercado de acciones")
     return shares_outstanding * current_price
 
 
+def shares_outstanding_from_info(info):
+    shares_outstanding = info.get('sharesOutstanding', None)
+    if shares_outstanding is None:
+        raise ValueError("No se pudo obtener el número de acciones")
+    return shares_outstanding
+
+
+def get_market_value_equity(ticker):
+    stock = yf.Ticker(ticker)
+    return market_value_equity_from_info(stock.info)
+
+
 def get_market_value_debt(ticker):
-    # Aquí aproximamos la deuda total del balance (puede no ser valor de mercado exacto)
     stock = yf.Ticker(ticker)
     balance = stock.balance_sheet
-    try:
-        short_term_debt = balance.loc['Short Long Term Debt'].iloc[0]
-    except KeyError:
-        short_term_debt = 0
-    try:
-        long_term_debt = balance.loc['Long Term Debt'].iloc[0]
-    except KeyError:
-        long_term_debt = 0
-    return short_term_debt + long_term_debt
+    return total_debt_from_balance_sheet(balance)
+
+
+def wacc_from_components(E, D, Re, Rd, Tc):
+    V = E + D
+    return (E / V) * Re + (D / V) * Rd * (1 - Tc)
 
 
 def calculate_wacc(ticker):
     E = get_market_value_equity(ticker)
     D = get_market_value_debt(ticker)
-    V = E + D
     Re = get_cost_of_equity(ticker)
     Rd = get_cost_of_debt(ticker)
     Tc = get_tax_rate(ticker)
 
-    wacc = (E / V) * Re + (D / V) * Rd * (1 - Tc)
+    wacc = wacc_from_components(E, D, Re, Rd, Tc)
     return wacc
 
 
 if __name__ == "__main__":
+    from ticker_executor import TickerExecutor
+
     tickers = ["MSFT", "JNJ", "HD", "GOOGL", "TSLA", "HD", "JNJ"]
-    for ticker in tickers:
-        print(ticker)
-        wacc = calculate_wacc(ticker)
+    # Los tickers repetidos se calculan una sola vez
+    for ticker, wacc in TickerExecutor().imap(calculate_wacc, tickers, stage="wacc"):
         print(f"WACC para {ticker}: {wacc:.2%}")